@@ -0,0 +1,240 @@
+"""
+================================================================================
+ACESSO AOS DADOS - CAMADA CENTRAL COM CACHE
+Leitura única de dados/*.csv + dtypes compactos + invalidação por mtime/hash
+================================================================================
+
+Todos os scripts e o dashboard leem as séries históricas daqui, em vez de
+redigitar os arrays. Cada CSV é lido uma vez por processo; a próxima leitura
+só acontece se o arquivo mudar (mtime/tamanho ou, opcionalmente, hash).
+
+Séries trimestrais/mensais (quando geradas em dados/) saem no mesmo
+formato, indexadas por período: painel('trimestral'), series(..., frequencia=).
+
+Uso:
+    from acesso_dados import painel_anual, series
+    anos, p50, desemprego = series('ano', 'p50', 'desemprego')
+================================================================================
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from frequencias import agregar, desagregar, indice_periodos, tempo_continuo
+
+DIRETORIO_DADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dados')
+
+# Cache do processo: caminho → (assinatura, DataFrame)
+_CACHE = {}
+
+# ============================================================================
+# LEITURA COM CACHE
+# ============================================================================
+
+def _assinatura(caminho, verificar_hash):
+    estado = os.stat(caminho)
+    assinatura = (estado.st_mtime_ns, estado.st_size)
+    if verificar_hash:
+        with open(caminho, 'rb') as f:
+            assinatura += (hashlib.sha256(f.read()).hexdigest(),)
+    return assinatura
+
+
+def _compactar(df):
+    # Inteiros no menor tipo que cabe; texto como categoria. Floats ficam em
+    # float64 para não alterar nenhum resultado numérico.
+    for coluna in df.columns:
+        serie = df[coluna]
+        if pd.api.types.is_integer_dtype(serie):
+            df[coluna] = pd.to_numeric(serie, downcast='integer')
+        elif pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie):
+            df[coluna] = serie.astype('category')
+    return df
+
+
+def carregar_csv(nome, copiar=True, verificar_hash=False):
+    """
+    Lê dados/<nome>.csv uma única vez por processo (memoizado)
+
+    Parâmetros:
+    -----------
+    nome : str - Nome do arquivo, com ou sem '.csv'
+    copiar : bool - Devolve uma cópia (seguro para modificar); False devolve
+             o DataFrame do cache, que não deve ser alterado
+    verificar_hash : bool - Também invalida se o conteúdo (SHA-256) mudar,
+                     útil quando o mtime não é confiável
+
+    Retorna:
+    --------
+    DataFrame - Com dtypes compactos
+    """
+    if not nome.endswith('.csv'):
+        nome += '.csv'
+    caminho = os.path.normpath(os.path.join(DIRETORIO_DADOS, nome))
+    assinatura = _assinatura(caminho, verificar_hash)
+
+    em_cache = _CACHE.get(caminho)
+    if em_cache is None or em_cache[0] != assinatura:
+        em_cache = (assinatura, _compactar(pd.read_csv(caminho)))
+        _CACHE[caminho] = em_cache
+
+    return em_cache[1].copy() if copiar else em_cache[1]
+
+
+def limpar_cache():
+    """Descarta todos os DataFrames em cache"""
+    _CACHE.clear()
+
+# ============================================================================
+# PAINEL ANUAL CONSOLIDADO (2012-2024)
+# ============================================================================
+
+_ARQUIVOS_PAINEL = ['percentis_rendimento', 'desemprego_salario', 'participacao_pib',
+                    'indicadores_anuais', 'massa_salarial_validacao',
+                    'brasil_anual_CORRIGIDO_FINAL']
+
+
+def painel_anual(copiar=True):
+    """
+    Painel anual com todas as séries históricas usadas nas análises
+
+    Colunas: ano, p10, p50, p90, desemprego, part_trabalho, part_capital, gini,
+    pib_real_indice, massa_salarial, massa_indice, rendimento_real,
+    horas_semanais, rendimento_hora.
+
+    Memoizado junto com os CSVs de origem: é remontado só se algum deles mudar.
+    """
+    chave = '__painel_anual__'
+    assinatura = tuple(_assinatura(os.path.normpath(os.path.join(DIRETORIO_DADOS, f'{a}.csv')), False)
+                       for a in _ARQUIVOS_PAINEL)
+    em_cache = _CACHE.get(chave)
+    if em_cache is not None and em_cache[0] == assinatura:
+        return em_cache[1].copy() if copiar else em_cache[1]
+
+    percentis = carregar_csv('percentis_rendimento', copiar=False)
+    desemprego = carregar_csv('desemprego_salario', copiar=False)[['ano', 'desemprego']]
+    participacao = carregar_csv('participacao_pib', copiar=False).rename(columns={
+        'participacao_trabalho': 'part_trabalho', 'participacao_capital': 'part_capital'})
+    indicadores = carregar_csv('indicadores_anuais', copiar=False)
+    massa = carregar_csv('massa_salarial_validacao', copiar=False)[['ano', 'massa_ibge_oficial']]
+    massa = massa.rename(columns={'massa_ibge_oficial': 'massa_salarial'})
+    horas = carregar_csv('brasil_anual_CORRIGIDO_FINAL', copiar=False)
+
+    painel = percentis
+    for tabela in (desemprego, participacao, indicadores, massa, horas):
+        painel = painel.merge(tabela, on='ano', how='left', validate='1:1')
+    painel['massa_indice'] = painel['massa_salarial'] / painel['massa_salarial'].iloc[0] * 100
+
+    colunas = ['ano', 'p10', 'p50', 'p90', 'desemprego', 'part_trabalho', 'part_capital',
+               'gini', 'pib_real_indice', 'massa_salarial', 'massa_indice',
+               'rendimento_real', 'horas_semanais', 'rendimento_hora']
+    painel = painel[colunas].reset_index(drop=True)
+
+    _CACHE[chave] = (assinatura, painel)
+    return painel.copy() if copiar else painel
+
+
+# ============================================================================
+# PAINÉIS POR FREQUÊNCIA (ANUAL / TRIMESTRAL / MENSAL)
+# ============================================================================
+
+# Fontes nativas de cada frequência: arquivo em dados/ e coluna do subperíodo.
+# O trimestral sai de ingestao_pnad.py; o mensal, de uma extração mensal
+# (trimestres móveis da PNAD ou CAGED) com colunas ano, mes e os indicadores.
+FONTES_PERIODICAS = {
+    'trimestral': ('pnad_indicadores_trimestrais', 'trimestre'),
+    'mensal': ('indicadores_mensais', 'mes'),
+}
+
+
+def _existe(nome):
+    return os.path.exists(os.path.join(DIRETORIO_DADOS, f'{nome}.csv'))
+
+
+def frequencias_disponiveis():
+    """Frequências em que painel() pode ser montado com os arquivos de dados/"""
+    mensal = _existe(FONTES_PERIODICAS['mensal'][0])
+    trimestral = mensal or _existe(FONTES_PERIODICAS['trimestral'][0])
+    return ['anual'] + ['trimestral'] * trimestral + ['mensal'] * mensal
+
+
+def _painel_nativo(frequencia):
+    # Indicadores lidos na própria frequência ou agregados da mensal
+    nome, subperiodo = FONTES_PERIODICAS[frequencia]
+    if _existe(nome):
+        tabela = carregar_csv(nome).sort_values(['ano', subperiodo])
+        periodos = indice_periodos(tabela['ano'], tabela[subperiodo], frequencia)
+        tabela = tabela.drop(columns=['ano', subperiodo]).select_dtypes('number')
+        return tabela.reset_index(drop=True), periodos
+    if frequencia == 'trimestral' and _existe(FONTES_PERIODICAS['mensal'][0]):
+        mensal, periodos = _painel_nativo('mensal')
+        valores, periodos = agregar(mensal.to_numpy(dtype=np.float64).T, periodos, frequencia)
+        return pd.DataFrame(valores.T, columns=mensal.columns), periodos
+    raise FileNotFoundError(
+        f"Sem dados na frequência '{frequencia}': gere dados/{nome}.csv (disponíveis: "
+        f"{frequencias_disponiveis()})")
+
+
+def painel(frequencia='anual', como_anuais='interpolar'):
+    """
+    Painel histórico indexado por período, na frequência pedida
+
+    Colunas: periodo (pd.Period), tempo (ano contínuo: 2012.0, 2012.25, ...),
+    ano e os indicadores. Em frequência trimestral/mensal, os indicadores
+    medidos na própria frequência vêm da fonte nativa (FONTES_PERIODICAS) e os
+    que só existem no painel anual (p.ex. PIB, participação do trabalho) são
+    desagregados de forma vetorizada.
+
+    Parâmetros:
+    -----------
+    frequencia : str - 'anual', 'trimestral' ou 'mensal'
+    como_anuais : str - Desagregação das séries só anuais ('interpolar',
+                  'repetir'); ver frequencias.desagregar
+
+    Retorna:
+    --------
+    DataFrame - Uma linha por período
+    """
+    anual = painel_anual(copiar=frequencia == 'anual')
+    periodos_anuais = indice_periodos(anual['ano'])
+    if frequencia == 'anual':
+        tabela, periodos = anual.drop(columns='ano'), periodos_anuais
+    else:
+        tabela, periodos = _painel_nativo(frequencia)
+        so_anuais = [c for c in anual.columns if c != 'ano' and c not in tabela.columns]
+        valores, periodos_desagregados = desagregar(
+            anual[so_anuais].to_numpy(dtype=np.float64).T, periodos_anuais, frequencia, como_anuais)
+        posicao = periodos_desagregados.get_indexer(periodos)
+        for coluna, serie in zip(so_anuais, valores):
+            tabela[coluna] = np.where(posicao >= 0, serie[posicao], np.nan)
+
+    tabela.insert(0, 'ano', np.asarray(periodos.year, dtype=np.int64))
+    tabela.insert(0, 'tempo', tempo_continuo(periodos))
+    tabela.insert(0, 'periodo', periodos)
+    return tabela
+
+
+def series(*colunas, frequencia='anual'):
+    """
+    Arrays NumPy (int64/float64) de colunas do painel, na ordem pedida
+
+    Em frequência trimestral/mensal (ver painel), 'periodo' devolve o
+    pd.PeriodIndex e 'tempo' o ano contínuo, usado como regressor.
+
+    Exemplo:
+        anos, p50 = series('ano', 'p50')
+        periodos, tempo, p50 = series('periodo', 'tempo', 'p50', frequencia='trimestral')
+    """
+    if frequencia == 'anual' and not {'periodo', 'tempo'} & set(colunas):
+        tabela = painel_anual(copiar=False)
+    else:
+        tabela = painel(frequencia)
+    # Inteiros compactos do cache voltam a int64 para não estourar em contas
+    arrays = tuple(pd.PeriodIndex(tabela[c]) if c == 'periodo' else
+                   tabela[c].to_numpy(dtype=np.int64 if pd.api.types.is_integer_dtype(tabela[c])
+                                      else np.float64, copy=True)
+                   for c in colunas)
+    return arrays[0] if len(arrays) == 1 else arrays
@@ -0,0 +1,355 @@
+"""
+================================================================================
+AGREGAÇÃO STREAMING - RESUMO DE MONTE CARLO EM MEMÓRIA CONSTANTE
+Esboço de quantis mesclável + Momentos correntes + Contadores de limiar
+================================================================================
+
+Todos os acumuladores são de uma passada e mescláveis: resultados parciais de
+blocos (ou processos) diferentes se combinam com `mesclar`, e a ordem fixa de
+mesclagem garante o mesmo resumo qualquer que seja o número de workers.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from modelo_salarial import SALARIO_BASE_2024
+
+# ============================================================================
+# ESBOÇO DE QUANTIS (ERRO RELATIVO LIMITADO, ESTILO DDSKETCH)
+# ============================================================================
+
+class _Contagens:
+    """Contagens por índice de bucket, armazenadas em array com deslocamento"""
+
+    def __init__(self):
+        self.inicio = 0
+        self.contagens = np.zeros(0, dtype=np.float64)
+
+    def _garantir(self, minimo, maximo):
+        if self.contagens.size == 0:
+            self.inicio = minimo
+            self.contagens = np.zeros(maximo - minimo + 1, dtype=np.float64)
+            return
+        fim = self.inicio + self.contagens.size - 1
+        novo_inicio, novo_fim = min(minimo, self.inicio), max(maximo, fim)
+        if novo_inicio == self.inicio and novo_fim == fim:
+            return
+        novas = np.zeros(novo_fim - novo_inicio + 1, dtype=np.float64)
+        novas[self.inicio - novo_inicio:self.inicio - novo_inicio + self.contagens.size] = self.contagens
+        self.inicio, self.contagens = novo_inicio, novas
+
+    def adicionar(self, indices, pesos):
+        if indices.size == 0:
+            return
+        minimo, maximo = int(indices.min()), int(indices.max())
+        self._garantir(minimo, maximo)
+        parcial = np.bincount(indices - minimo, weights=pesos, minlength=maximo - minimo + 1)
+        self.contagens[minimo - self.inicio:maximo - self.inicio + 1] += parcial
+
+    def mesclar(self, outro):
+        if outro.contagens.size == 0:
+            return
+        self._garantir(outro.inicio, outro.inicio + outro.contagens.size - 1)
+        deslocamento = outro.inicio - self.inicio
+        self.contagens[deslocamento:deslocamento + outro.contagens.size] += outro.contagens
+
+    def total(self):
+        return float(self.contagens.sum())
+
+
+class EsbocoQuantis:
+    """
+    Esboço de quantis mesclável com erro relativo limitado
+
+    Cada valor x cai no bucket ceil(log_gamma |x|), com
+    gamma = (1 + precisao) / (1 - precisao); o quantil devolvido fica a no
+    máximo `precisao` (relativo) do valor exato. A memória depende só da
+    amplitude log dos dados, não do número de observações.
+
+    Parâmetros:
+    -----------
+    precisao_relativa : float - Erro relativo máximo dos quantis (padrão 0.01%)
+    """
+
+    def __init__(self, precisao_relativa=1e-4):
+        if not 0 < precisao_relativa < 1:
+            raise ValueError("precisao_relativa deve estar em (0, 1)")
+        self.precisao_relativa = precisao_relativa
+        self.gamma = (1 + precisao_relativa) / (1 - precisao_relativa)
+        self._log_gamma = np.log(self.gamma)
+        self._positivos = _Contagens()
+        self._negativos = _Contagens()
+        self._zeros = 0.0
+
+    @property
+    def contagem(self):
+        return self._positivos.total() + self._negativos.total() + self._zeros
+
+    def adicionar(self, valores, pesos=None):
+        """Adiciona um bloco de valores (pesos opcionais, p.ex. pesos amostrais)"""
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        if pesos is None:
+            pesos = np.ones_like(valores)
+        else:
+            pesos = np.broadcast_to(np.asarray(pesos, dtype=np.float64), valores.shape).ravel()
+        if np.isnan(valores).any():
+            raise ValueError("EsbocoQuantis não aceita NaN")
+
+        positivos = valores > 0
+        negativos = valores < 0
+        self._zeros += float(pesos[~(positivos | negativos)].sum())
+        for mascara, armazem in ((positivos, self._positivos), (negativos, self._negativos)):
+            if mascara.any():
+                indices = np.ceil(np.log(np.abs(valores[mascara])) / self._log_gamma).astype(np.int64)
+                armazem.adicionar(indices, pesos[mascara])
+        return self
+
+    def mesclar(self, outro):
+        """Incorpora outro esboço com a mesma precisão"""
+        if outro.gamma != self.gamma:
+            raise ValueError("Só é possível mesclar esboços com a mesma precisao_relativa")
+        self._positivos.mesclar(outro._positivos)
+        self._negativos.mesclar(outro._negativos)
+        self._zeros += outro._zeros
+        return self
+
+    def _valor_bucket(self, inicio, n):
+        return 2 * self.gamma ** np.arange(inicio, inicio + n, dtype=np.float64) / (self.gamma + 1)
+
+    def quantil(self, q):
+        """
+        Quantil(is) aproximado(s)
+
+        Parâmetros:
+        -----------
+        q : float ou array - Quantil(is) em [0, 1]
+
+        Retorna:
+        --------
+        float ou ndarray - Valor(es) com erro relativo <= precisao_relativa
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if np.any((q < 0) | (q > 1)):
+            raise ValueError("q deve estar em [0, 1]")
+        total = self.contagem
+        if total == 0:
+            raise ValueError("Esboço vazio")
+
+        # Buckets em ordem crescente de valor: negativos (invertidos), zero, positivos
+        neg, pos = self._negativos, self._positivos
+        valores = np.concatenate([-self._valor_bucket(neg.inicio, neg.contagens.size)[::-1],
+                                  [0.0],
+                                  self._valor_bucket(pos.inicio, pos.contagens.size)])
+        contagens = np.concatenate([neg.contagens[::-1], [self._zeros], pos.contagens])
+        acumulado = np.cumsum(contagens)
+
+        posicao = q * (total - 1)
+        indices = np.searchsorted(acumulado, posicao, side='right')
+        resultado = valores[np.minimum(indices, valores.size - 1)]
+        return float(resultado) if resultado.ndim == 0 else resultado
+
+# ============================================================================
+# MOMENTOS CORRENTES (WELFORD / CHAN)
+# ============================================================================
+
+class MomentosCorrentes:
+    """Contagem, média, variância, mínimo e máximo em uma passada (mescláveis)"""
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def _combinar(self, n, media, m2, minimo, maximo):
+        if n == 0:
+            return self
+        total = self.n + n
+        delta = media - self.media
+        self.media += delta * n / total
+        self._m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+        self.minimo = min(self.minimo, minimo)
+        self.maximo = max(self.maximo, maximo)
+        return self
+
+    def adicionar(self, valores):
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        if valores.size == 0:
+            return self
+        media = float(valores.mean())
+        m2 = float(np.sum((valores - media) ** 2))
+        return self._combinar(valores.size, media, m2, float(valores.min()), float(valores.max()))
+
+    def mesclar(self, outro):
+        return self._combinar(outro.n, outro.media, outro._m2, outro.minimo, outro.maximo)
+
+    def variancia(self, ddof=0):
+        if self.n - ddof <= 0:
+            return np.nan
+        return self._m2 / (self.n - ddof)
+
+    def desvio_padrao(self, ddof=0):
+        return float(np.sqrt(self.variancia(ddof)))
+
+# ============================================================================
+# CONTADORES DE LIMIAR
+# ============================================================================
+
+class ContadorLimiares:
+    """
+    Conta quantas observações ficam abaixo/acima de limiares fixos
+
+    Parâmetros:
+    -----------
+    limiares : dict - nome → (operador, limiar), operador em {'<', '<=', '>', '>='}
+    """
+
+    _OPERADORES = {'<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal}
+
+    def __init__(self, limiares):
+        for nome, (operador, _) in limiares.items():
+            if operador not in self._OPERADORES:
+                raise ValueError(f"Operador inválido em '{nome}': {operador}")
+        self.limiares = dict(limiares)
+        self.n = 0
+        self.contagens = {nome: 0 for nome in self.limiares}
+
+    def adicionar(self, valores):
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        self.n += valores.size
+        for nome, (operador, limiar) in self.limiares.items():
+            self.contagens[nome] += int(np.count_nonzero(self._OPERADORES[operador](valores, limiar)))
+        return self
+
+    def mesclar(self, outro):
+        if outro.limiares != self.limiares:
+            raise ValueError("Só é possível mesclar contadores com os mesmos limiares")
+        self.n += outro.n
+        for nome in self.contagens:
+            self.contagens[nome] += outro.contagens[nome]
+        return self
+
+    def proporcao(self, nome):
+        return self.contagens[nome] / self.n if self.n else np.nan
+
+# ============================================================================
+# RESUMO MONTE CARLO (MESMO FORMATO DE monte_carlo_resumo.csv)
+# ============================================================================
+
+class ResumoMonteCarlo:
+    """
+    Resumo streaming dos salários simulados
+
+    Reproduz as estatísticas de monte_carlo_resumo.csv (média, mediana, desvio
+    padrão, P5, P95 e probabilidades de queda/ganho) sem guardar os draws.
+    Percentis e quedas extras entram no fim do resumo como 'P1', 'P99',
+    'Prob. Queda >10%' etc.
+
+    Parâmetros:
+    -----------
+    base : float - Salário base 2024 (referência das probabilidades)
+    precisao_relativa : float - Erro relativo máximo de mediana/P5/P95
+    percentis : list - Percentis extras em % (p.ex. [1, 99])
+    quedas : list - Quedas extras em % da base (p.ex. [10, 20]) → P(salário < base·(1 - q/100))
+    """
+
+    ESTATISTICAS = ['Média', 'Mediana', 'Desvio Padrão', 'P5', 'P95',
+                    'Prob. Queda', 'Prob. Ganho', 'Prob. Queda >5%']
+
+    def __init__(self, base=SALARIO_BASE_2024, precisao_relativa=1e-4, percentis=(), quedas=()):
+        self.base = base
+        self.quantis = EsbocoQuantis(precisao_relativa)
+        self.momentos = MomentosCorrentes()
+
+        # Estatística → probabilidade do quantil / chave do contador de limiar
+        self._quantis = {'Mediana': 0.50, 'P5': 0.05, 'P95': 0.95}
+        self._proporcoes = {'Prob. Queda': 'queda', 'Prob. Ganho': 'ganho',
+                            'Prob. Queda >5%': 'queda_forte'}
+        limiares = {'queda': ('<', base), 'ganho': ('>', base), 'queda_forte': ('<', base * 0.95)}
+        extras = []
+        for percentil in percentis:
+            if not 0 <= percentil <= 100:
+                raise ValueError(f"Percentil fora de [0, 100]: {percentil}")
+            nome = f'P{percentil:g}'
+            if nome not in self._quantis:
+                self._quantis[nome] = percentil / 100
+                extras.append(nome)
+        for queda in quedas:
+            nome = f'Prob. Queda >{queda:g}%'
+            if nome not in self._proporcoes:
+                self._proporcoes[nome] = f'queda_{queda:g}'
+                limiares[f'queda_{queda:g}'] = ('<', base * (1 - queda / 100))
+                extras.append(nome)
+        self.limiares = ContadorLimiares(limiares)
+        self.estatisticas = self.ESTATISTICAS + extras
+
+    @property
+    def n(self):
+        return self.momentos.n
+
+    def adicionar(self, salarios):
+        self.quantis.adicionar(salarios)
+        self.momentos.adicionar(salarios)
+        self.limiares.adicionar(salarios)
+        return self
+
+    def mesclar(self, outro):
+        if outro.estatisticas != self.estatisticas:
+            raise ValueError("Só é possível mesclar resumos com as mesmas estatísticas")
+        self.quantis.mesclar(outro.quantis)
+        self.momentos.mesclar(outro.momentos)
+        self.limiares.mesclar(outro.limiares)
+        return self
+
+    def resumo(self):
+        """Dict estatística → valor, na ordem de monte_carlo_resumo.csv (extras no fim)"""
+        valores = dict(zip(self._quantis, self.quantis.quantil(list(self._quantis.values()))))
+        valores['Média'] = self.momentos.media
+        valores['Desvio Padrão'] = self.momentos.desvio_padrao()
+        for nome, chave in self._proporcoes.items():
+            valores[nome] = self.limiares.proporcao(chave) * 100
+        return {nome: float(valores[nome]) for nome in self.estatisticas}
+
+    def meias_larguras(self, nivel_confianca=0.95):
+        """
+        Meia-largura do intervalo de confiança de cada estatística do resumo
+
+        - Média: z·s/√n
+        - Mediana e percentis: intervalo de ordem (livre de distribuição),
+          com as posições q ± z·√(q(1-q)/n) lidas no esboço de quantis
+        - Probabilidades: intervalo de Wilson, em pontos percentuais
+          (z/(1 + z²/n)·√(p(1-p)/n + z²/(4n²)); não zera com p = 0 ou 1,
+          o caso das caudas raras)
+        - Desvio padrão: z·s/√(2(n-1)) (aproximação normal)
+
+        Supõe draws independentes; com amostradores QMC o intervalo é
+        conservador (o erro real é menor).
+
+        Retorna:
+        --------
+        dict - Mesmas chaves de resumo() → meia-largura (mesma unidade)
+        """
+        n = self.n
+        if n < 2:
+            return {nome: np.inf for nome in self.estatisticas}
+        z = norm.ppf((1 + nivel_confianca) / 2)
+        s = self.momentos.desvio_padrao()
+
+        larguras = {'Média': z * s / np.sqrt(n)}
+        for nome, q in self._quantis.items():
+            delta = z * np.sqrt(q * (1 - q) / n)
+            inferior, superior = self.quantis.quantil([max(q - delta, 0.0), min(q + delta, 1.0)])
+            larguras[nome] = (superior - inferior) / 2
+        larguras['Desvio Padrão'] = z * s / np.sqrt(2 * (n - 1))
+        for nome, chave in self._proporcoes.items():
+            p = self.limiares.proporcao(chave)
+            larguras[nome] = z / (1 + z**2 / n) * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) * 100
+
+        return {nome: float(larguras[nome]) for nome in self.estatisticas}
+
+    def para_dataframe(self):
+        resumo = self.resumo()
+        return pd.DataFrame({'estatistica': list(resumo), 'valor': list(resumo.values())})
@@ -9,13 +9,22 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy import stats
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score, mean_squared_error
+from acesso_dados import series
+from frequencias import PERIODOS_POR_ANO
+from janelas_moveis import estatisticas_expansivas, estatisticas_moveis
+from quebras_estruturais import bai_perron, busca_quebra_unica, teste_chow
+from reamostragem import (N_MINIMO_REAMOSTRAGEM, bootstrap_estatistica, bootstrap_regressao,
+                          metodos_aplicaveis)
+from regressao_linear import ajustar_mqo, intervalo_coeficientes
 import warnings
 warnings.filterwarnings('ignore')
 
 # Configuração
+FREQUENCIA = 'anual'      # 'anual', 'trimestral' ou 'mensal' (ver acesso_dados.painel)
+SEMENTE = 42
+N_REAMOSTRAS = 10000
+JANELA_VOLATILIDADE = 5   # anos de variações por janela móvel
+JANELA_REGRESSAO = 6      # anos por janela da regressão salário ~ desemprego
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
@@ -23,20 +32,12 @@ sns.set_palette("husl")
 # DADOS
 # ============================================================================
 
-anos = np.array([2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019, 
-                 2020, 2021, 2022, 2023, 2024])
-
-p50_real = np.array([805, 829, 865, 834, 836, 851, 863, 852, 
-                     880, 810, 831, 872, 930])
-
-desemprego = np.array([7.4, 7.3, 7.0, 8.9, 11.6, 12.6, 12.1, 11.8, 
-                       13.7, 14.0, 9.6, 7.7, 6.6])
-
-part_trabalho = np.array([68.1, 67.8, 65.9, 70.2, 71.6, 71.6, 71.4, 74.2, 
-                          67.1, 66.6, 69.4, 70.4, 73.7])
-
-pib_real_indice = np.array([100, 103.0, 103.5, 99.8, 96.5, 97.7, 99.5, 100.7, 
-                            96.8, 101.7, 104.8, 107.8, 111.2])
+# Séries históricas 2012-2024 (dados/*.csv via acesso_dados), indexadas por
+# período; tempo = ano contínuo (2012.0, 2012.25, ...) para tendências em R$/ano
+periodos, tempo, anos, p50_real, desemprego, part_trabalho, pib_real_indice = series(
+    'periodo', 'tempo', 'ano', 'p50', 'desemprego', 'part_trabalho', 'pib_real_indice',
+    frequencia=FREQUENCIA)
+periodos_por_ano = PERIODOS_POR_ANO[FREQUENCIA]
 
 # ============================================================================
 # 1. REGRESSÃO LINEAR: DESEMPREGO vs SALÁRIO
@@ -46,36 +47,16 @@ print("="*80)
 print("1. REGRESSÃO: DESEMPREGO → SALÁRIO")
 print("="*80)
 
-# Preparar dados
-X = desemprego.reshape(-1, 1)
-y = p50_real
-
-# Ajustar modelo
-model_desemp = LinearRegression()
-model_desemp.fit(X, y)
-
-# Predições
-y_pred = model_desemp.predict(X)
+# Ajustar modelo (coeficientes, erros padrão e p-valores em uma chamada)
+ajuste_desemp = ajustar_mqo(desemprego, p50_real)
+intercept, coef = ajuste_desemp['coeficientes']
 
 # Métricas
-r2 = r2_score(y, y_pred)
-rmse = np.sqrt(mean_squared_error(y, y_pred))
-
-# Coeficientes
-coef = model_desemp.coef_[0]
-intercept = model_desemp.intercept_
-
-# Intervalo de confiança (95%)
-n = len(y)
-residuos = y - y_pred
-std_residuos = np.std(residuos)
-t_crit = stats.t.ppf(0.975, n-2)  # 95% confiança, n-2 graus liberdade
+r2 = ajuste_desemp['r2']
+rmse = ajuste_desemp['rmse']
 
-# IC para coeficiente
-x_mean = np.mean(X)
-x_var = np.sum((X - x_mean)**2)
-se_coef = std_residuos / np.sqrt(x_var)
-ic_coef = (coef - t_crit*se_coef, coef + t_crit*se_coef)
+# Intervalo de confiança (95%, t com n-2 graus de liberdade)
+ic_coef = tuple(intervalo_coeficientes(ajuste_desemp)[:, 1])
 
 print(f"\nModelo: Salário = {intercept:.2f} + {coef:.2f} × Desemprego")
 print(f"\nR² = {r2:.3f}")
@@ -87,52 +68,99 @@ print(f"  Cada 1pp de AUMENTO no desemprego → R${abs(coef):.2f} de QUEDA no sa
 print(f"  Com 95% de confiança, o impacto está entre R${abs(ic_coef[1]):.2f} e R${abs(ic_coef[0]):.2f}")
 
 # Teste de significância (p-valor)
-t_stat = coef / se_coef
-p_valor = 2 * (1 - stats.t.cdf(abs(t_stat), n-2))
+p_valor = ajuste_desemp['p_valor'][1]
 print(f"\np-valor: {p_valor:.4f}")
 if p_valor < 0.05:
     print(f"  → ESTATISTICAMENTE SIGNIFICATIVO (p < 0.05)")
 else:
     print(f"  → NÃO significativo (p >= 0.05)")
 
+# Bootstrap (13 pontos: o IC analítico depende de normalidade dos resíduos)
+intervalos_bootstrap = []
+print(f"\nIC 95% bootstrap do coeficiente ({N_REAMOSTRAS} reamostras):")
+for metodo in ['pares', 'residuos', 'bloco']:
+    boot = bootstrap_regressao(desemprego, p50_real, metodo, N_REAMOSTRAS, SEMENTE)
+    intervalos_bootstrap.append({'estatistica': 'coef_desemprego', 'metodo': metodo,
+                                 'estimativa': coef, 'ic_inf': boot['ic'][0, 1],
+                                 'ic_sup': boot['ic'][1, 1], 'n': len(desemprego),
+                                 'n_validas': boot['n_validas']})
+    print(f"  {metodo:<9} [{boot['ic'][0, 1]:.2f}, {boot['ic'][1, 1]:.2f}]")
+
 # ============================================================================
-# 2. QUEBRA ESTRUTURAL: ANTES vs DEPOIS DE 2021
+# 2. QUEBRA ESTRUTURAL: BUSCA DA DATA (sup-F) + MÚLTIPLAS QUEBRAS
 # ============================================================================
 
 print("\n" + "="*80)
-print("2. TESTE DE QUEBRA ESTRUTURAL (2012-2021 vs 2022-2024)")
+print("2. QUEBRA ESTRUTURAL: BUSCA EM TODAS AS DATAS CANDIDATAS")
 print("="*80)
 
-# Dividir períodos
-periodo1_anos = anos[anos <= 2021]
-periodo1_salario = p50_real[anos <= 2021]
-
-periodo2_anos = anos[anos >= 2022]
-periodo2_salario = p50_real[anos >= 2022]
-
-# Regressão período 1
-X1 = periodo1_anos.reshape(-1, 1)
-y1 = periodo1_salario
-model1 = LinearRegression().fit(X1, y1)
-tendencia1 = model1.coef_[0]
-
-# Regressão período 2
-X2 = periodo2_anos.reshape(-1, 1)
-y2 = periodo2_salario
-model2 = LinearRegression().fit(X2, y2)
-tendencia2 = model2.coef_[0]
-
-print(f"\nPeríodo 2012-2021:")
+# sup-F: Chow em cada período candidato (regimes de ao menos 15% da amostra)
+busca = busca_quebra_unica(tempo, p50_real, n_simulacoes=N_REAMOSTRAS, semente=SEMENTE)
+quebra = int(busca['quebra'])
+# Perfil completo em séries curtas; em séries longas, só os 10 maiores F
+mostrar = np.arange(len(busca['candidatos']))
+if mostrar.size > 15:
+    mostrar = np.sort(np.argsort(busca['f'])[-10:])
+print(f"\nF de Chow por início do novo regime:")
+for candidato, f in zip(busca['candidatos'][mostrar], busca['f'][mostrar]):
+    print(f"  {periodos[candidato]}: F = {f:6.2f}{'  ← máximo' if candidato == quebra else ''}")
+print(f"\nQuebra estimada: novo regime a partir de {periodos[quebra]}")
+print(f"sup-F = {busca['sup_f']:.2f} | p-valor (nula simulada, {N_REAMOSTRAS} réplicas): "
+      f"{busca['p_valor']:.4f}")
+chow_2022 = teste_chow(tempo, p50_real, int(np.argmax(anos >= 2022)))
+print(f"Divisão fixa anterior (2022): F = {chow_2022['f']:.2f}, p-valor = {chow_2022['p_valor']:.4f}")
+
+# Bai-Perron: até 2 quebras, número escolhido pelo BIC
+multiplas = bai_perron(tempo, p50_real, max_quebras=2)
+print(f"\nBai-Perron (até 2 quebras, BIC):")
+for m, datas in enumerate(multiplas['datas']):
+    inicios = ', '.join(str(periodos[k]) for k in datas) or '-'
+    escolha = '  ← escolhido' if m == multiplas['n_quebras'] else ''
+    print(f"  {m} quebra(s): início(s) {inicios:<12} BIC = {multiplas['bic'][m]:.2f}{escolha}")
+
+# Dividir períodos na quebra estimada
+periodo1 = np.arange(len(periodos)) < quebra
+periodo2 = ~periodo1
+rotulo1 = f"{periodos[0]}-{periodos[quebra - 1]}"
+rotulo2 = f"{periodos[quebra]}-{periodos[-1]}"
+
+periodo1_tempo, periodo1_salario = tempo[periodo1], p50_real[periodo1]
+periodo2_tempo, periodo2_salario = tempo[periodo2], p50_real[periodo2]
+
+# Regressões dos dois períodos em um único ajuste (um subconjunto de anos por linha)
+ajuste_periodos = ajustar_mqo(tempo, p50_real, mascara=[periodo1, periodo2])
+tendencia1, tendencia2 = ajuste_periodos['coeficientes'][:, 1]
+
+print(f"\nPeríodo {rotulo1}:")
 print(f"  Tendência: R${tendencia1:+.2f}/ano")
 print(f"  Crescimento total: {((periodo1_salario[-1]/periodo1_salario[0])-1)*100:.1f}%")
 
-print(f"\nPeríodo 2022-2024:")
+print(f"\nPeríodo {rotulo2}:")
 print(f"  Tendência: R${tendencia2:+.2f}/ano")
 print(f"  Crescimento total: {((periodo2_salario[-1]/periodo2_salario[0])-1)*100:.1f}%")
 
 print(f"\nDiferença de tendência: R${abs(tendencia2 - tendencia1):.2f}/ano")
 print(f"Aceleração: {(tendencia2/tendencia1):.1f}x mais rápida no período recente")
 
+# Bootstrap das tendências (o período recente tem poucos pontos: ICs largos;
+# com menos de N_MINIMO_REAMOSTRAGEM pontos, pares e blocos são pulados)
+print(f"\nIC 95% bootstrap das tendências ({N_REAMOSTRAS} reamostras):")
+regimes = [(rotulo1, periodo1_tempo, periodo1_salario, tendencia1, SEMENTE),
+           (rotulo2, periodo2_tempo, periodo2_salario, tendencia2, SEMENTE + 1)]
+for metodo in ['pares', 'residuos', 'bloco']:
+    colunas = []
+    for rotulo, tempo_regime, salario_regime, estimativa, semente in regimes:
+        if metodo not in metodos_aplicaveis(len(tempo_regime)):
+            colunas.append(f"{rotulo}: - (n={len(tempo_regime)} < {N_MINIMO_REAMOSTRAGEM})")
+            continue
+        boot = bootstrap_regressao(tempo_regime, salario_regime, metodo, N_REAMOSTRAS, semente)
+        intervalos_bootstrap.append({'estatistica': f"tendencia_{rotulo.replace('-', '_')}",
+                                     'metodo': metodo, 'estimativa': estimativa,
+                                     'ic_inf': boot['ic'][0, 1], 'ic_sup': boot['ic'][1, 1],
+                                     'n': len(tempo_regime), 'n_validas': boot['n_validas']})
+        colunas.append(f"{rotulo}: [{boot['ic'][0, 1]:+.2f}, {boot['ic'][1, 1]:+.2f}]")
+    print(f"  {metodo:<9} " + ' | '.join(colunas))
+
 # ============================================================================
 # 3. FEATURE ENGINEERING: VOLATILIDADE
 # ============================================================================
@@ -141,15 +169,17 @@ print("\n" + "="*80)
 print("3. FEATURE ENGINEERING: VOLATILIDADE SALARIAL")
 print("="*80)
 
-# Variação ano a ano
-variacao_anual = np.diff(p50_real) / p50_real[:-1] * 100
+# Variação ano a ano (contra o mesmo período do ano anterior)
+variacao_anual = (p50_real[periodos_por_ano:] - p50_real[:-periodos_por_ano]) / p50_real[:-periodos_por_ano] * 100
+anos_variacao = anos[periodos_por_ano:]
 
 # Volatilidade (desvio padrão das variações)
 volatilidade_total = np.std(variacao_anual)
 
 # Volatilidade por período
-vol_2012_2019 = np.std(variacao_anual[:7])
-vol_2020_2024 = np.std(variacao_anual[7:])
+ate_2019 = anos_variacao <= 2019
+vol_2012_2019 = np.std(variacao_anual[ate_2019])
+vol_2020_2024 = np.std(variacao_anual[~ate_2019])
 
 print(f"\nVolatilidade geral: {volatilidade_total:.2f}%")
 print(f"\nPor período:")
@@ -157,6 +187,47 @@ print(f"  2012-2019: {vol_2012_2019:.2f}%")
 print(f"  2020-2024: {vol_2020_2024:.2f}%")
 print(f"  Aumento: {((vol_2020_2024/vol_2012_2019)-1)*100:+.1f}%")
 
+# Bootstrap da razão de volatilidades (cada período reamostrado à parte)
+def razao_volatilidade(antes, depois):
+    return np.std(depois, axis=-1) / np.std(antes, axis=-1)
+
+# Sem alternativa de resíduos para a razão: mantida, mas sinalizada se a
+# menor amostra tiver menos de N_MINIMO_REAMOSTRAGEM variações
+n_menor = int(min(ate_2019.sum(), (~ate_2019).sum()))
+aviso = f"  (amostra pequena: n={n_menor})" if n_menor < N_MINIMO_REAMOSTRAGEM else ''
+print(f"\nIC 95% bootstrap da razão 2020-2024 / 2012-2019 ({vol_2020_2024/vol_2012_2019:.2f}x):")
+for metodo in ['pares', 'bloco']:
+    boot = bootstrap_estatistica([variacao_anual[ate_2019], variacao_anual[~ate_2019]], razao_volatilidade,
+                                 metodo, N_REAMOSTRAS, SEMENTE)
+    intervalos_bootstrap.append({'estatistica': 'razao_volatilidade', 'metodo': metodo,
+                                 'estimativa': boot['estimativa'], 'ic_inf': boot['ic'][0],
+                                 'ic_sup': boot['ic'][1], 'n': n_menor,
+                                 'n_validas': boot['reamostras'].size})
+    print(f"  {metodo:<9} [{boot['ic'][0]:.2f}, {boot['ic'][1]:.2f}]{aviso}")
+
+# Janelas móveis e expansivas (somas incrementais, sem recalcular cada janela)
+vol_movel = estatisticas_moveis(variacao_anual, JANELA_VOLATILIDADE * periodos_por_ano)
+vol_expansiva = estatisticas_expansivas(variacao_anual)
+regressao_movel = estatisticas_moveis(p50_real, JANELA_REGRESSAO * periodos_por_ano, x=desemprego)
+
+print(f"\nJanelas móveis (volatilidade: {JANELA_VOLATILIDADE} anos de variações; "
+      f"salário ~ desemprego: {JANELA_REGRESSAO} anos):")
+def formatar(valor, sufixo=''):
+    return '-' if np.isnan(valor) else f"{valor:.2f}{sufixo}"
+
+# Uma linha por ano (último período de cada ano)
+fim_de_ano = np.append(anos[1:] != anos[:-1], True)
+print(f"  {'Ano':<6}{'Vol. móvel':>12}{'Vol. expansiva':>16}{'R$/pp desemp.':>15}")
+for i in np.flatnonzero(fim_de_ano[periodos_por_ano:]) + periodos_por_ano:
+    # Volatilidades indexadas pelas variações (período i ↔ variação i - periodos_por_ano)
+    j = i - periodos_por_ano
+    linha = (vol_movel['volatilidade'][j], vol_expansiva['volatilidade'][j],
+             regressao_movel['inclinacao'][i])
+    if np.all(np.isnan(linha)):
+        continue
+    print(f"  {anos[i]:<6}{formatar(linha[0], '%'):>12}{formatar(linha[1], '%'):>16}"
+          f"{formatar(linha[2]):>15}")
+
 print(f"\nInterpretação:")
 if vol_2020_2024 > vol_2012_2019:
     print(f"  Mercado de trabalho ficou MAIS INSTÁVEL pós-COVID")
@@ -168,8 +239,8 @@ idx_maior_queda = np.argmin(variacao_anual)
 idx_maior_crescimento = np.argmax(variacao_anual)
 
 print(f"\nExtremos:")
-print(f"  Maior queda: {anos[idx_maior_queda]+1} ({variacao_anual[idx_maior_queda]:.1f}%)")
-print(f"  Maior crescimento: {anos[idx_maior_crescimento]+1} ({variacao_anual[idx_maior_crescimento]:.1f}%)")
+print(f"  Maior queda: {periodos[idx_maior_queda + periodos_por_ano]} ({variacao_anual[idx_maior_queda]:.1f}%)")
+print(f"  Maior crescimento: {periodos[idx_maior_crescimento + periodos_por_ano]} ({variacao_anual[idx_maior_crescimento]:.1f}%)")
 
 # ============================================================================
 # 4. CORRELAÇÃO MULTIVARIADA
@@ -217,8 +288,12 @@ resultados = {
         'ic_95': ic_coef
     },
     'quebra_estrutural': {
-        'tendencia_2012_2021': tendencia1,
-        'tendencia_2022_2024': tendencia2,
+        'inicio_novo_regime': periodos[quebra],
+        'sup_f': busca['sup_f'],
+        'p_valor': busca['p_valor'],
+        'quebras_bai_perron': periodos[multiplas['quebras'][multiplas['quebras'] >= 0]],
+        f"tendencia_{rotulo1.replace('-', '_')}": tendencia1,
+        f"tendencia_{rotulo2.replace('-', '_')}": tendencia2,
         'aceleracao': tendencia2/tendencia1
     },
     'volatilidade': {
@@ -229,18 +304,27 @@ resultados = {
 }
 
 # DataFrame para exportar
+sem_variacao = np.full(periodos_por_ano, np.nan)  # primeiro ano não tem variação
 df_export = pd.DataFrame({
     'ano': anos,
     'p50_real': p50_real,
     'desemprego': desemprego,
-    'variacao_anual_%': np.concatenate([[np.nan], variacao_anual])
+    'variacao_anual_%': np.concatenate([sem_variacao, variacao_anual]),
+    f'volatilidade_movel_{JANELA_VOLATILIDADE}a_%': np.concatenate([sem_variacao, vol_movel['volatilidade']]),
+    'volatilidade_expansiva_%': np.concatenate([sem_variacao, vol_expansiva['volatilidade']]),
+    f'inclinacao_desemprego_movel_{JANELA_REGRESSAO}a': regressao_movel['inclinacao']
 })
+if FREQUENCIA != 'anual':
+    df_export.insert(0, 'periodo', periodos.astype(str))
 
 df_export.to_csv('../dados/analise_estatistica_avancada.csv', index=False)
 
+# Intervalos bootstrap (coeficiente, tendências e razão de volatilidades)
+pd.DataFrame(intervalos_bootstrap).to_csv('../dados/intervalos_bootstrap.csv', index=False)
+
 print("\n" + "="*80)
 print("✅ ANÁLISE COMPLETA!")
 print("="*80)
-print("\nArquivo gerado: analise_estatistica_avancada.csv")
+print("\nArquivos gerados: analise_estatistica_avancada.csv, intervalos_bootstrap.csv")
 print("\nPróximo passo: Previsão 2026-2030")
 
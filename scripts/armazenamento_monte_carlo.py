@@ -0,0 +1,181 @@
+"""
+================================================================================
+ARMAZENAMENTO MONTE CARLO - ESCRITA EM BLOCOS E LEITURA ZERO-CÓPIA
+CSV (legado) | NPY memory-mapped (uma coluna por arquivo) | Parquet comprimido
+================================================================================
+
+Formatos:
+- 'csv'     → <destino>.csv, compatível com monte_carlo_10k.csv
+- 'npy'     → diretório <destino>/ com <coluna>.npy + metadados.json;
+              leitura via np.load(mmap_mode='r'), sem cópia nem parse
+- 'parquet' → <destino>.parquet (zstd), um row group por bloco;
+              requer pyarrow (opcional)
+"""
+
+import json
+import os
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from agregacao_streaming import ResumoMonteCarlo
+from modelo_salarial import DRIVERS
+from monte_carlo import (SEMENTE_PADRAO, TAMANHO_BLOCO_PADRAO, mapear_blocos,
+                         simular_bloco)
+
+COLUNAS = DRIVERS + ['salario_2026']
+FORMATOS = ('csv', 'npy', 'parquet')
+
+
+def _importar_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as erro:
+        raise ImportError("O formato 'parquet' requer pyarrow: pip install pyarrow") from erro
+    return pa, pq
+
+
+def caminho_saida(destino, formato):
+    """Caminho efetivo (arquivo ou diretório) de `destino` no `formato`"""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: {formato} (use {FORMATOS})")
+    return destino if formato == 'npy' else f'{destino}.{formato}'
+
+# ============================================================================
+# ESCRITA EM BLOCOS
+# ============================================================================
+
+class EscritorMonteCarlo:
+    """
+    Grava draws de Monte Carlo bloco a bloco, sem montar tudo em memória
+
+    Uso:
+        with EscritorMonteCarlo('../dados/monte_carlo', n, formato='npy') as escritor:
+            for bloco in blocos:
+                escritor.escrever(bloco)
+
+    Parâmetros:
+    -----------
+    destino : str - Caminho base, sem extensão
+    n_simulacoes : int - Total de linhas (pré-aloca os .npy)
+    formato : str - 'csv', 'npy' ou 'parquet'
+    colunas : list - Colunas gravadas (padrão: drivers + salario_2026)
+    """
+
+    def __init__(self, destino, n_simulacoes, formato='npy', colunas=COLUNAS):
+        self.caminho = caminho_saida(destino, formato)
+        self.formato = formato
+        self.n_simulacoes = n_simulacoes
+        self.colunas = list(colunas)
+        self.escritas = 0
+        self._arquivos = {}
+        self._parquet = None
+
+        if formato == 'npy':
+            os.makedirs(self.caminho, exist_ok=True)
+            self._arquivos = {
+                c: np.lib.format.open_memmap(os.path.join(self.caminho, f'{c}.npy'), mode='w+',
+                                             dtype=np.float64, shape=(n_simulacoes,))
+                for c in self.colunas
+            }
+        elif formato == 'parquet':
+            pa, pq = _importar_pyarrow()
+            esquema = pa.schema([(c, pa.float64()) for c in self.colunas])
+            self._parquet = pq.ParquetWriter(self.caminho, esquema, compression='zstd')
+
+    def escrever(self, bloco):
+        """Acrescenta um bloco (dict coluna → array ou DataFrame)"""
+        tamanho = len(bloco[self.colunas[0]])
+        if self.escritas + tamanho > self.n_simulacoes:
+            raise ValueError("Mais linhas escritas do que n_simulacoes")
+
+        if self.formato == 'npy':
+            for c in self.colunas:
+                self._arquivos[c][self.escritas:self.escritas + tamanho] = bloco[c]
+        elif self.formato == 'parquet':
+            pa, _ = _importar_pyarrow()
+            self._parquet.write_table(pa.table({c: np.asarray(bloco[c]) for c in self.colunas}))
+        else:
+            pd.DataFrame({c: np.asarray(bloco[c]) for c in self.colunas}).to_csv(
+                self.caminho, mode='w' if self.escritas == 0 else 'a',
+                header=self.escritas == 0, index=False)
+
+        self.escritas += tamanho
+
+    def fechar(self):
+        if self.formato == 'npy':
+            for arquivo in self._arquivos.values():
+                arquivo.flush()
+            self._arquivos = {}
+            with open(os.path.join(self.caminho, 'metadados.json'), 'w', encoding='utf-8') as f:
+                json.dump({'n_simulacoes': self.escritas, 'colunas': self.colunas}, f)
+        elif self.formato == 'parquet' and self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+        if self.escritas != self.n_simulacoes:
+            raise ValueError(f"Esperadas {self.n_simulacoes} linhas, escritas {self.escritas}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        if tipo is None:
+            self.fechar()
+        elif self._parquet is not None:
+            self._parquet.close()
+
+
+def gravar_monte_carlo(destino, n_simulacoes, formato='npy', semente=SEMENTE_PADRAO,
+                       tamanho_bloco=TAMANHO_BLOCO_PADRAO, n_workers=1, amostrador='normal'):
+    """
+    Simula e grava os draws em streaming, bloco a bloco
+
+    Usa os mesmos blocos e sementes de monte_carlo.executar_monte_carlo (os
+    draws gravados são idênticos) e acumula o resumo na mesma passada.
+    `amostrador` como em executar_monte_carlo ('normal', 'sobol', 'halton', 'lhs').
+
+    Retorna:
+    --------
+    ResumoMonteCarlo - Resumo estatístico de todos os draws gravados
+    """
+    resumo = ResumoMonteCarlo()
+    with EscritorMonteCarlo(destino, n_simulacoes, formato) as escritor:
+        for bloco in mapear_blocos(partial(simular_bloco, amostrador=amostrador), n_simulacoes,
+                                   semente, tamanho_bloco, n_workers):
+            escritor.escrever(bloco)
+            resumo.adicionar(bloco['salario_2026'])
+    return resumo
+
+# ============================================================================
+# LEITURA
+# ============================================================================
+
+def carregar_monte_carlo(destino, formato='npy', colunas=None):
+    """
+    Lê draws gravados por EscritorMonteCarlo
+
+    Para 'npy' devolve dict coluna → np.memmap somente leitura (zero-cópia:
+    as páginas são lidas do disco sob demanda e compartilhadas entre processos).
+    Para 'parquet' e 'csv' devolve um DataFrame (descompressão/parse inevitável).
+
+    Parâmetros:
+    -----------
+    destino : str - Caminho base usado na gravação
+    formato : str - 'csv', 'npy' ou 'parquet'
+    colunas : list opcional - Subconjunto de colunas
+    """
+    caminho = caminho_saida(destino, formato)
+
+    if formato == 'npy':
+        with open(os.path.join(caminho, 'metadados.json'), encoding='utf-8') as f:
+            metadados = json.load(f)
+        return {c: np.load(os.path.join(caminho, f'{c}.npy'), mmap_mode='r')
+                for c in (colunas or metadados['colunas'])}
+
+    if formato == 'parquet':
+        _, pq = _importar_pyarrow()
+        return pq.read_table(caminho, columns=colunas, memory_map=True).to_pandas()
+
+    return pd.read_csv(caminho, usecols=colunas)
@@ -0,0 +1,177 @@
+"""
+================================================================================
+BACKTESTING - AVALIAÇÃO COM ORIGEM MÓVEL DOS MODELOS DE PREVISÃO
+Reajuste em cada origem → Erros 1 a H passos → MAE, MAPE, cobertura
+================================================================================
+
+Para cada origem t (de origem_minima até n-1), cada modelo é reajustado só
+com as observações anteriores a t e prevê t, t+1, ..., t+H-1. Os erros são
+agregados por série, modelo e horizonte:
+- MAE: erro absoluto médio
+- MAPE: erro percentual absoluto médio (%)
+- cobertura: fração dos valores observados dentro do intervalo de previsão
+  (deve ficar perto do nível nominal, p.ex. 95%)
+
+Modelos: as duas tendências de previsao_2026_2030 (linear_total e
+linear_recente) e os candidatos da seleção automática (previsao_modelos).
+Cada tarefa (modelo × origem × fatia de séries) roda no pool de processos do
+projeto, então centenas de séries (UFs, percentis, setores) são avaliadas
+em um único lote. Com drivers, a regressão usa os drivers observados no
+período previsto (previsão condicional aos drivers).
+
+Uso:
+    from backtesting import backtest
+    resultado = backtest(np.stack([p10, p50, p90]), tempo, nomes=['p10', 'p50', 'p90'])
+    resultado['ranking']
+================================================================================
+"""
+
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from previsao_modelos import CANDIDATOS, mapear_tarefas
+from regressao_linear import ajustar_mqo, prever_mqo
+
+HORIZONTE_PADRAO = 6
+ORIGEM_MINIMA_PADRAO = 6  # observações do menor ajuste (ARIMA e ETS amortecido)
+JANELA_RECENTE_PADRAO = 3
+
+# ============================================================================
+# MODELOS
+# ============================================================================
+# Mesma assinatura dos candidatos de previsao_modelos:
+# (y (m, n), tempo, drivers, tempo_futuro, drivers_futuros, nivel) → dict
+# com 'previsao', 'inferior', 'superior' (m, h)
+
+def ajustar_tendencia_recente(y, tempo, drivers, tempo_futuro, drivers_futuros, nivel,
+                              janela=JANELA_RECENTE_PADRAO):
+    """Tendência linear só nas últimas `janela` observações (linear_recente)"""
+    ajuste = ajustar_mqo(tempo[-janela:], y[:, -janela:])
+    return prever_mqo(ajuste, tempo_futuro, nivel)
+
+
+def modelos_padrao(janela_recente=JANELA_RECENTE_PADRAO, com_drivers=False):
+    """Tendências de previsao_2026_2030 + candidatos da seleção automática"""
+    modelos = {
+        'linear_total': CANDIDATOS['tendencia'],
+        'linear_recente': partial(ajustar_tendencia_recente, janela=janela_recente),
+    }
+    modelos.update({nome: funcao for nome, funcao in CANDIDATOS.items()
+                    if nome != 'tendencia' and (com_drivers or nome != 'regressao')})
+    return modelos
+
+
+def prever_origem(tarefa):
+    """
+    Reajusta um modelo com as observações anteriores à origem e prevê o
+    horizonte: tarefa = (funcao, y, tempo, drivers, origem, horizonte, nivel);
+    função de nível de módulo (picklable)
+    """
+    funcao, y, tempo, drivers, origem, horizonte, nivel = tarefa
+    futuro = slice(origem, origem + horizonte)
+    previsto = funcao(y[:, :origem], tempo[:origem],
+                      None if drivers is None else drivers[:origem], tempo[futuro],
+                      None if drivers is None else drivers[futuro], nivel)
+    return np.stack([previsto['previsao'], previsto['inferior'], previsto['superior']])
+
+# ============================================================================
+# API PRINCIPAL
+# ============================================================================
+
+def backtest(y, tempo, modelos=None, drivers=None, horizonte=HORIZONTE_PADRAO,
+             origem_minima=ORIGEM_MINIMA_PADRAO, nivel_confianca=0.95, nomes=None,
+             n_workers=1, series_por_tarefa=None):
+    """
+    Backtesting com origem móvel de vários modelos em várias séries
+
+    Parâmetros:
+    -----------
+    y : array (n,) ou (m, n) - Séries no mesmo calendário
+    tempo : array (n,) - Ano contínuo de cada observação
+    modelos : dict opcional - Nome → função com a assinatura dos candidatos
+              de previsao_modelos (padrão: modelos_padrao())
+    drivers : array (n,) ou (n × k) opcional - Regressores observados
+    horizonte : int - Passos à frente avaliados (1..horizonte)
+    origem_minima : int - Observações do primeiro ajuste
+    nivel_confianca : float - Nível dos intervalos avaliados na cobertura
+    nomes : list opcional - Nome de cada série (padrão 0..m-1)
+    n_workers : int ou None - Processos (1 = serial, None = todos os núcleos)
+    series_por_tarefa : int opcional - Divide as séries em fatias por tarefa
+
+    Retorna:
+    --------
+    dict - 'metricas' DataFrame (serie, modelo, horizonte, n, mae, mape,
+           cobertura); 'ranking' DataFrame por série (posicao pelo MAE médio
+           dos horizontes); 'previsoes' array (modelos, origens, 3, m,
+           horizonte) com previsão, inferior e superior (NaN após o fim);
+           'origens' (índices das origens)
+    """
+    y = np.atleast_2d(np.asarray(y, dtype=np.float64))
+    tempo = np.asarray(tempo, dtype=np.float64)
+    m, n = y.shape
+    if modelos is None:
+        modelos = modelos_padrao(com_drivers=drivers is not None)
+    if not 3 <= origem_minima < n:
+        raise ValueError(f"origem_minima deve estar entre 3 e {n - 1}")
+    if drivers is not None:
+        drivers = np.asarray(drivers, dtype=np.float64)
+    nomes = list(range(m)) if nomes is None else list(nomes)
+
+    origens = np.arange(origem_minima, n)
+    passo = series_por_tarefa or m
+    fatias = [slice(i, min(i + passo, m)) for i in range(0, m, passo)]
+    tarefas = [(funcao, y[fatia], tempo, drivers, origem, horizonte, nivel_confianca)
+               for funcao in modelos.values() for origem in origens for fatia in fatias]
+    resultados = iter(mapear_tarefas(prever_origem, tarefas, n_workers))
+
+    # Previsões alinhadas: (modelo, origem, previsão/inferior/superior, série, passo)
+    previsoes = np.full((len(modelos), len(origens), 3, m, horizonte), np.nan)
+    for i in range(len(modelos)):
+        for j, origem in enumerate(origens):
+            for fatia in fatias:
+                resultado = next(resultados)
+                previsoes[i, j, :, fatia, :resultado.shape[-1]] = resultado
+
+    # Valores observados no mesmo alinhamento: (origem, série, passo)
+    indice = origens[:, None] + np.arange(horizonte)
+    observado = np.where(indice < n, y[:, np.minimum(indice, n - 1)], np.nan).transpose(1, 0, 2)
+
+    previsao, inferior, superior = previsoes[:, :, 0], previsoes[:, :, 1], previsoes[:, :, 2]
+    erro = np.abs(observado - previsao)
+    avaliado = ~np.isnan(erro)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n_avaliado = avaliado.sum(axis=1)
+        mae = np.nansum(erro, axis=1) / n_avaliado
+        mape = np.nansum(erro / np.abs(observado) * 100, axis=1) / n_avaliado
+        dentro = (observado >= inferior) & (observado <= superior)
+        cobertura = np.sum(dentro & avaliado, axis=1) / n_avaliado
+
+    nomes_modelos = list(modelos)
+    metricas = pd.DataFrame({
+        'serie': np.tile(np.repeat(nomes, horizonte), len(modelos)),
+        'modelo': np.repeat(nomes_modelos, m * horizonte),
+        'horizonte': np.tile(np.arange(1, horizonte + 1), len(modelos) * m),
+        'n': n_avaliado.ravel(),
+        'mae': mae.ravel(),
+        'mape': mape.ravel(),
+        'cobertura': cobertura.ravel(),
+    })
+    metricas = metricas[metricas['n'] > 0].reset_index(drop=True)
+
+    # Placar por série: média dos horizontes (cada horizonte com o mesmo peso)
+    ranking = (metricas.groupby(['serie', 'modelo'], sort=False)
+               .agg(mae=('mae', 'mean'), mape=('mape', 'mean'),
+                    cobertura=('cobertura', 'mean'), n_previsoes=('n', 'sum'))
+               .reset_index())
+    ordem_serie = ranking['serie'].map({nome: i for i, nome in enumerate(nomes)})
+    ranking = ranking.iloc[np.lexsort((ranking['mae'], ordem_serie))].reset_index(drop=True)
+    ranking.insert(1, 'posicao', ranking.groupby('serie', sort=False).cumcount() + 1)
+
+    return {
+        'metricas': metricas,
+        'ranking': ranking,
+        'previsoes': previsoes,
+        'origens': origens,
+    }
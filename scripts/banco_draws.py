@@ -0,0 +1,182 @@
+"""
+================================================================================
+BANCO DE DRAWS PADRONIZADOS - DISTRIBUIÇÃO AO VIVO DO SIMULADOR
+Normais padrão gravadas uma vez (.npy memory-mapped) → deslocar e escalar
+================================================================================
+
+O simulador do dashboard mostra a distribuição completa do salário 2026 em
+torno dos drivers escolhidos nos sliders. Em vez de sortear a cada
+interação, um banco de normais padrão z (4 × n, uma linha contígua por
+driver) é gravado uma vez em dados/ e aberto com np.load(mmap_mode='r'): as
+páginas vêm do disco sob demanda e são compartilhadas entre processos e
+sessões do servidor.
+
+A cada mudança de slider, os drivers são
+    x = clip(centro + desvio · z, mínimo, máximo)
+com os desvios de monte_carlo.DISTRIBUICOES, e o modelo vetorizado avalia
+todos os draws. Com 10^6 draws a distribuição sai em dezenas de ms.
+
+Os limites do corte devem conter o domínio dos sliders: com os limites do
+Monte Carlo (inflação em [3, 10]) um slider em 2% empurraria todos os
+draws para >= 3% e a distribuição deixaria de ficar centrada no ponto
+escolhido. limites_com_margem dá a faixa dos sliders com alguns desvios de
+folga, e o corte só atinge as caudas extremas.
+
+Uso:
+    from banco_draws import carregar_banco, distribuicao_centrada, resumir_distribuicao
+    banco = carregar_banco()
+    limites = limites_com_margem({'desemprego': (5, 15), 'pib': (-2, 5), 'inflacao': (2, 10), 'sm_real': (0, 5)})
+    salarios = distribuicao_centrada(banco, {'desemprego': 9, 'pib': 1, 'inflacao': 6, 'sm_real': 2}, limites)
+    resumir_distribuicao(salarios)['P5']
+================================================================================
+"""
+
+import os
+
+import numpy as np
+
+from modelo_salarial import DRIVERS, MODELO_PADRAO
+from monte_carlo import DISTRIBUICOES, SEMENTE_PADRAO, dividir_blocos, gerador_bloco
+
+CAMINHO_BANCO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dados',
+                             'banco_draws_padronizados.npy')
+N_DRAWS_PADRAO = 1_000_000
+TAMANHO_BLOCO_BANCO = 2**18
+N_DESVIOS_MARGEM = 3  # folga do corte além do domínio dos sliders (desvios)
+
+# ============================================================================
+# GRAVAÇÃO E LEITURA DO BANCO
+# ============================================================================
+
+def gravar_banco(caminho=CAMINHO_BANCO, n_draws=N_DRAWS_PADRAO, semente=SEMENTE_PADRAO):
+    """
+    Grava o banco (len(DRIVERS) × n_draws) de normais padrão em blocos
+
+    Cada bloco usa o gerador independente de monte_carlo.gerador_bloco; o
+    arquivo é escrito em um temporário e renomeado, então leitores
+    concorrentes nunca veem um banco incompleto.
+    """
+    caminho = os.path.normpath(caminho)
+    temporario = f'{caminho}.{os.getpid()}.tmp'
+    banco = np.lib.format.open_memmap(temporario, mode='w+', dtype=np.float64,
+                                      shape=(len(DRIVERS), n_draws))
+    for indice, inicio, tamanho in dividir_blocos(n_draws, TAMANHO_BLOCO_BANCO):
+        banco[:, inicio:inicio + tamanho] = gerador_bloco(semente, indice).standard_normal(
+            (len(DRIVERS), tamanho))
+    banco.flush()
+    del banco
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def carregar_banco(caminho=CAMINHO_BANCO, n_draws=N_DRAWS_PADRAO, semente=SEMENTE_PADRAO):
+    """
+    Abre o banco memory-mapped (somente leitura), gravando-o se não existir
+    ou se tiver outro número de draws
+
+    Retorna:
+    --------
+    np.memmap (len(DRIVERS), n_draws)
+    """
+    if os.path.exists(caminho):
+        banco = np.load(caminho, mmap_mode='r')
+        if banco.shape == (len(DRIVERS), n_draws):
+            return banco
+        del banco
+    gravar_banco(caminho, n_draws, semente)
+    return np.load(caminho, mmap_mode='r')
+
+# ============================================================================
+# DISTRIBUIÇÃO CENTRADA NOS DRIVERS
+# ============================================================================
+
+def limites_com_margem(limites, distribuicoes=DISTRIBUICOES, n_desvios=N_DESVIOS_MARGEM):
+    """
+    Limites de corte que contêm `limites` com n_desvios desvios de folga
+
+    Com o centro em qualquer ponto de `limites`, só draws a mais de
+    n_desvios desvios do centro são cortados: a distribuição fica simétrica
+    em torno do centro (exceto nas caudas extremas).
+
+    Retorna:
+    --------
+    dict - driver → (mínimo, máximo)
+    """
+    return {nome: (minimo - n_desvios * distribuicoes[nome][1],
+                   maximo + n_desvios * distribuicoes[nome][1])
+            for nome, (minimo, maximo) in limites.items()}
+
+
+def distribuicao_centrada(banco, centro, limites=None, distribuicoes=DISTRIBUICOES,
+                          modelo=MODELO_PADRAO, base=MODELO_PADRAO.base):
+    """
+    Salários de todos os draws do banco em torno de `centro`
+
+    Parâmetros:
+    -----------
+    banco : array (len(DRIVERS), n) - Normais padrão (carregar_banco)
+    centro : dict - Valor central de cada driver (p.ex. os sliders)
+    limites : dict opcional - driver → (mínimo, máximo) do corte; deve
+              conter todos os centros possíveis (ver limites_com_margem).
+              Padrão: limites de `distribuicoes`
+    distribuicoes : dict - (média, desvio, mínimo, máximo); a média vem de
+                    `centro` e os limites só valem sem `limites`
+    modelo : callable - Modelo vetorizado (desemprego, pib, inflacao, sm_real, base=)
+    base : float - Salário base 2024
+
+    Retorna:
+    --------
+    ndarray (n,) - Salários simulados
+    """
+    drivers = []
+    for linha, nome in enumerate(DRIVERS):
+        _, desvio, minimo, maximo = distribuicoes[nome]
+        if limites is not None:
+            minimo, maximo = limites[nome]
+        x = np.multiply(banco[linha], desvio)
+        np.add(x, centro[nome], out=x)
+        drivers.append(np.clip(x, minimo, maximo, out=x))
+    return modelo(*drivers, base=base)
+
+
+def resumir_distribuicao(salarios, base=MODELO_PADRAO.base, n_classes=60, subdivisoes=30):
+    """
+    Percentis, probabilidades e histograma dos salários simulados
+
+    Uma única contagem em n_classes × subdivisoes classes finas dá o
+    histograma (somando as subdivisões) e os percentis (interpolação linear
+    dentro da classe fina, erro < amplitude / (n_classes × subdivisoes)),
+    sem ordenar nem particionar os draws.
+
+    Retorna:
+    --------
+    dict - 'Média', 'P5', 'P50', 'P95', 'Prob. Queda', 'Prob. Queda >5%'
+           (em %, como ResumoMonteCarlo), 'contagens' e 'bordas' do
+           histograma
+    """
+    n_finas = n_classes * subdivisoes
+    minimo, maximo = salarios.min(), salarios.max()
+    largura = (maximo - minimo) / n_finas if maximo > minimo else 1.0 / n_finas
+
+    classe = ((salarios - minimo) * (1 / largura)).astype(np.intp)
+    np.minimum(classe, n_finas - 1, out=classe)
+    contagens_finas = np.bincount(classe, minlength=n_finas)
+
+    # Percentis: classe fina onde a fração acumulada atinge p + interpolação
+    acumulada = np.cumsum(contagens_finas) / len(salarios)
+    probabilidades = np.array([0.05, 0.50, 0.95])
+    j = np.searchsorted(acumulada, probabilidades)
+    antes = np.where(j > 0, acumulada[j - 1], 0.0)
+    fracao = (probabilidades - antes) / (contagens_finas[j] / len(salarios))
+    p5, p50, p95 = minimo + (j + fracao) * largura
+
+    return {
+        'Média': salarios.mean(),
+        'P5': p5,
+        'P50': p50,
+        'P95': p95,
+        'Prob. Queda': np.mean(salarios < base) * 100,
+        'Prob. Queda >5%': np.mean(salarios < base * 0.95) * 100,
+        'contagens': contagens_finas.reshape(n_classes, subdivisoes).sum(axis=1),
+        'bordas': minimo + np.arange(n_classes + 1) * subdivisoes * largura,
+    }
@@ -0,0 +1,445 @@
+"""
+================================================================================
+BENCHMARKS - SIMULADOR, MONTE CARLO, REGRESSÕES, PREVISÕES E GRÁFICOS
+Tempos em JSON + comparação com um baseline salvo localmente
+================================================================================
+
+Mede:
+- simular_salario_2026 (escalar em laço) e simular_salario_2026_lote em
+  vários tamanhos de lote
+- Monte Carlo (mesmo tamanho do simulador_avancado e 10^6 draws)
+- Regressões de analise_estatistica_avancada nas séries reais: MQO,
+  bootstrap (pares/resíduos/bloco), sup-F e Bai-Perron
+- Modelos de previsao_2026_2030 nas séries reais: seleção automática e
+  backtesting
+- Grupo extra: os scripts inteiros (analise_estatistica_avancada,
+  previsao_2026_2030, simulador_avancado), incluindo I/O e gráficos
+- Cada função grafico_* de gerar_graficos_v3
+- load_data do dashboard (cache frio e quente)
+
+Os scripts e gráficos rodam em um diretório temporário (scripts/, dados/,
+graficos/), então nenhum arquivo do projeto é sobrescrito.
+
+Os tempos dependem da máquina, então nenhum baseline é versionado: grave um
+com --salvar-baseline antes da mudança e compare depois, na mesma máquina.
+
+Para rodar:
+    python benchmark.py                      # mede e compara com o baseline
+    python benchmark.py --salvar-baseline    # grava o resultado como baseline
+    python benchmark.py --filtro grafico     # só os casos que contêm 'grafico'
+
+Sai com código 1 se algum caso ficou mais lento que o baseline além da
+tolerância (padrão 15% na mediana).
+================================================================================
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from functools import lru_cache, partial
+
+import matplotlib
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+DIRETORIO_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+DIRETORIO_PROJETO = os.path.dirname(DIRETORIO_SCRIPTS)
+DIRETORIO_BENCHMARKS = os.path.join(DIRETORIO_PROJETO, 'benchmarks')
+ARQUIVO_BASELINE = os.path.join(DIRETORIO_BENCHMARKS, 'baseline.json')
+ARQUIVO_RESULTADO = os.path.join(DIRETORIO_BENCHMARKS, 'ultimo.json')
+
+TAMANHOS_LOTE = [1_000, 10_000, 100_000, 1_000_000]
+TAMANHOS_ESCALAR = [1_000, 10_000]
+TOLERANCIA_PADRAO = 0.15
+
+SCRIPTS = ['analise_estatistica_avancada.py', 'previsao_2026_2030.py', 'simulador_avancado.py']
+
+# ============================================================================
+# MEDIÇÃO
+# ============================================================================
+
+def medir(funcao, repeticoes=5, aquecimento=1, preparar=None):
+    """
+    Tempo de parede de `funcao()` em várias repetições
+
+    Parâmetros:
+    -----------
+    funcao : callable - Código medido (sem argumentos)
+    repeticoes : int - Execuções medidas
+    aquecimento : int - Execuções descartadas antes (imports, caches, JIT do BLAS)
+    preparar : callable opcional - Roda antes de cada execução, fora da medição
+
+    Retorna:
+    --------
+    dict - mediana_s, minimo_s, media_s, desvio_s, repeticoes
+    """
+    for _ in range(aquecimento):
+        if preparar is not None:
+            preparar()
+        funcao()
+
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    tempos = np.array(tempos)
+    return {
+        'mediana_s': float(np.median(tempos)),
+        'minimo_s': float(tempos.min()),
+        'media_s': float(tempos.mean()),
+        'desvio_s': float(tempos.std(ddof=1)) if tempos.size > 1 else 0.0,
+        'repeticoes': int(tempos.size),
+    }
+
+
+@contextlib.contextmanager
+def _area_temporaria():
+    # Árvore descartável com a mesma estrutura do projeto: os scripts rodam
+    # em scripts/ e escrevem em ../dados e ../graficos
+    with tempfile.TemporaryDirectory(prefix='benchmark_') as raiz:
+        shutil.copytree(os.path.join(DIRETORIO_PROJETO, 'dados'), os.path.join(raiz, 'dados'),
+                        ignore=shutil.ignore_patterns('pnad_microdados'))
+        os.makedirs(os.path.join(raiz, 'graficos'))
+        os.makedirs(os.path.join(raiz, 'scripts'))
+        diretorio_anterior = os.getcwd()
+        os.chdir(os.path.join(raiz, 'scripts'))
+        try:
+            yield raiz
+        finally:
+            os.chdir(diretorio_anterior)
+
+
+def _silencioso(funcao):
+    def executar():
+        with contextlib.redirect_stdout(io.StringIO()):
+            funcao()
+        plt.close('all')
+    return executar
+
+# ============================================================================
+# CASOS
+# ============================================================================
+
+# Cada grupo devolve nome → (montar, repetições[, preparar]); montar() faz a
+# preparação cara (imports, dados, sorteios) e devolve o código medido, e só
+# roda para os casos selecionados pelo filtro
+
+def _uma_vez(funcao):
+    # Preparação compartilhada pelos casos de um grupo, feita no primeiro uso
+    return lru_cache(maxsize=None)(funcao)
+
+
+def _drivers(n, semente=0):
+    from monte_carlo import gerar_drivers
+    return gerar_drivers(n, np.random.default_rng(semente))
+
+
+def casos_simulador():
+    from modelo_salarial import simular_salario_2026, simular_salario_2026_lote
+
+    def escalar(n):
+        d = _drivers(n)
+        colunas = [d[c].tolist() for c in ('desemprego', 'pib', 'inflacao', 'sm_real')]
+        return lambda: [simular_salario_2026(*x) for x in zip(*colunas)]
+
+    def lote(n):
+        d, saida = _drivers(n), np.empty(n)
+        return lambda: simular_salario_2026_lote(d['desemprego'], d['pib'], d['inflacao'],
+                                                 d['sm_real'], out=saida)
+
+    casos = {f'simulador/escalar/n={n}': (partial(escalar, n), 5) for n in TAMANHOS_ESCALAR}
+    casos.update({f'simulador/lote/n={n}': (partial(lote, n), 7) for n in TAMANHOS_LOTE})
+    return casos
+
+
+def casos_monte_carlo():
+    from agregacao_streaming import ResumoMonteCarlo
+    from monte_carlo import executar_monte_carlo, executar_monte_carlo_resumo
+
+    def secao_simulador(n=10_000):
+        # Seção 2 do simulador_avancado: draws + resumo
+        df = executar_monte_carlo(n, n_workers=1)
+        ResumoMonteCarlo().adicionar(df['salario_2026'].to_numpy()).resumo()
+
+    return {
+        'monte_carlo/simulador_avancado/n=10000': (lambda: secao_simulador, 5),
+        'monte_carlo/dataframe/n=1000000': (
+            lambda: lambda: executar_monte_carlo(1_000_000, n_workers=1), 3),
+        'monte_carlo/resumo_streaming/n=1000000': (
+            lambda: lambda: executar_monte_carlo_resumo(1_000_000, n_workers=1).resumo(), 3),
+    }
+
+
+def casos_regressoes():
+    # Os ajustes de analise_estatistica_avancada nas séries reais, sem I/O nem gráficos
+    from quebras_estruturais import bai_perron, busca_quebra_unica
+    from reamostragem import bootstrap_regressao
+    from regressao_linear import ajustar_mqo
+
+    @_uma_vez
+    def dados():
+        from acesso_dados import series
+        return series('tempo', 'p50', 'desemprego')
+
+    def caso(funcao):
+        return lambda: partial(funcao, *dados())
+
+    casos = {
+        'regressoes/ajustar_mqo/desemprego': (
+            caso(lambda tempo, p50, desemprego: ajustar_mqo(desemprego, p50)), 7),
+        'regressoes/ajustar_mqo/dois_periodos': (
+            caso(lambda tempo, p50, desemprego: ajustar_mqo(
+                tempo, p50, mascara=[tempo < 2022, tempo >= 2022])), 7),
+        'regressoes/busca_quebra_unica/n=10000': (
+            caso(lambda tempo, p50, desemprego: busca_quebra_unica(
+                tempo, p50, n_simulacoes=10_000, semente=42)), 5),
+        'regressoes/bai_perron/max_quebras=2': (
+            caso(lambda tempo, p50, desemprego: bai_perron(tempo, p50, max_quebras=2)), 7),
+    }
+    for metodo in ('pares', 'residuos', 'bloco'):
+        casos[f'regressoes/bootstrap_regressao/{metodo}/n=10000'] = (
+            caso(lambda tempo, p50, desemprego, metodo=metodo: bootstrap_regressao(
+                desemprego, p50, metodo, 10_000, 42)), 5)
+    return casos
+
+
+def casos_previsoes():
+    # Seleção automática e backtesting de previsao_2026_2030 nas séries reais
+    from backtesting import backtest, modelos_padrao
+    from previsao_modelos import selecionar_modelos
+
+    @_uma_vez
+    def dados():
+        from acesso_dados import series
+        tempo, p10, p50, p90, desemprego, pib = series(
+            'tempo', 'p10', 'p50', 'p90', 'desemprego', 'pib_real_indice')
+        drivers = np.column_stack([desemprego, pib])
+        tempo_futuro = np.arange(tempo[-1] + 1, 2031)
+        return (np.stack([p10, p50, p90]), tempo, drivers, tempo_futuro,
+                np.repeat(drivers[-1:], len(tempo_futuro), axis=0))
+
+    def selecao():
+        y, tempo, drivers, tempo_futuro, drivers_futuros = dados()
+        return lambda: selecionar_modelos(y, tempo, tempo_futuro, drivers=drivers,
+                                          drivers_futuros=drivers_futuros)
+
+    def avaliacao():
+        y, tempo, drivers, _, _ = dados()
+        return lambda: backtest(y, tempo, modelos=modelos_padrao(janela_recente=3, com_drivers=True),
+                                drivers=drivers, horizonte=6, origem_minima=6)
+
+    return {
+        'previsoes/selecionar_modelos/aicc': (selecao, 5),
+        'previsoes/backtest/h=6': (avaliacao, 3),
+    }
+
+
+def casos_scripts():
+    # Grupo extra: scripts inteiros (dominados por bootstraps, CSV e savefig);
+    # as regressões e previsões em si são medidas nos grupos acima
+    casos = {}
+    for script in SCRIPTS:
+        caminho = os.path.join(DIRETORIO_SCRIPTS, script)
+        casos[f'scripts/{os.path.splitext(script)[0]}'] = (
+            lambda caminho=caminho: _silencioso(
+                lambda: runpy.run_path(caminho, run_name='__main__')), 3)
+    return casos
+
+
+def casos_graficos():
+    from gerar_graficos_v3 import GRAFICOS
+
+    return {f'graficos/{funcao.__name__}': (lambda funcao=funcao: _silencioso(funcao), 3)
+            for funcao in GRAFICOS}
+
+
+def casos_dashboard():
+    @_uma_vez
+    def dashboard():
+        import logging
+        logging.getLogger('streamlit').setLevel(logging.ERROR)
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            import dashboard_salarios
+        return dashboard_salarios
+
+    def load_data(frio):
+        from acesso_dados import limpar_cache
+        carregar = dashboard().load_data
+
+        def esfriar():
+            limpar_cache()
+            carregar.clear()
+        return (carregar, esfriar) if frio else carregar
+
+    def distribuicao():
+        # Distribuição ao vivo do simulador (sem o memo por combinação de sliders)
+        from banco_draws import (carregar_banco, distribuicao_centrada, limites_com_margem,
+                                 resumir_distribuicao)
+        banco = carregar_banco(os.path.join('..', 'dados', 'banco_draws_padronizados.npy'))
+        centro = {'desemprego': 9.0, 'pib': 1.0, 'inflacao': 6.0, 'sm_real': 2.0}
+        limites = limites_com_margem(dashboard().LIMITES_SLIDERS)
+        return lambda: resumir_distribuicao(distribuicao_centrada(banco, centro, limites))
+
+    return {
+        'dashboard/load_data/frio': (partial(load_data, True), 7),
+        'dashboard/load_data/quente': (partial(load_data, False), 7),
+        'dashboard/distribuicao_simulador/n=1000000': (distribuicao, 7),
+    }
+
+
+GRUPOS_CASOS = [casos_simulador, casos_monte_carlo, casos_regressoes, casos_previsoes,
+                casos_scripts, casos_graficos, casos_dashboard]
+
+# ============================================================================
+# EXECUÇÃO E COMPARAÇÃO
+# ============================================================================
+
+def _metadados():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=DIRETORIO_PROJETO,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def executar_benchmarks(filtro=None, repeticoes=None):
+    """
+    Roda todos os casos (ou os que contêm `filtro`) e devolve o resultado
+
+    Parâmetros:
+    -----------
+    filtro : str opcional - Substring do nome do caso
+    repeticoes : int opcional - Sobrescreve as repetições de cada caso
+
+    Retorna:
+    --------
+    dict - {'metadados': {...}, 'resultados': {caso: estatísticas}}
+    """
+    resultados = {}
+    with _area_temporaria():
+        for grupo in GRUPOS_CASOS:
+            for nome, (montar, n_repeticoes) in grupo().items():
+                if filtro and filtro not in nome:
+                    continue
+                # montar() → código medido, ou (código, preparar) para casos
+                # que precisam de um passo fora da medição (p.ex. cache frio)
+                funcao = montar()
+                funcao, preparar = funcao if isinstance(funcao, tuple) else (funcao, None)
+                resultados[nome] = medir(funcao, repeticoes or n_repeticoes, preparar=preparar)
+                print(f"  {nome:<52} {resultados[nome]['mediana_s'] * 1000:10.2f} ms")
+
+    return {'metadados': _metadados(), 'resultados': resultados}
+
+
+def salvar_resultado(resultado, caminho):
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+
+
+def carregar_resultado(caminho):
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def comparar(atual, baseline, tolerancia=TOLERANCIA_PADRAO, filtro=None):
+    """
+    Compara medianas com o baseline (só os casos que contêm `filtro`, se dado)
+
+    Retorna:
+    --------
+    DataFrame - caso, baseline_ms, atual_ms, razao, status
+                ('regressão', 'melhora', 'ok', 'novo' ou 'ausente')
+    """
+    antes = {c: r for c, r in baseline['resultados'].items() if not filtro or filtro in c}
+    depois = atual['resultados']
+    linhas = []
+    for caso in list(antes) + [c for c in depois if c not in antes]:
+        t_antes = antes[caso]['mediana_s'] if caso in antes else np.nan
+        t_depois = depois[caso]['mediana_s'] if caso in depois else np.nan
+        razao = t_depois / t_antes
+        if caso not in depois:
+            status = 'ausente'
+        elif caso not in antes:
+            status = 'novo'
+        elif razao > 1 + tolerancia:
+            status = 'regressão'
+        elif razao < 1 / (1 + tolerancia):
+            status = 'melhora'
+        else:
+            status = 'ok'
+        linhas.append({'caso': caso, 'baseline_ms': t_antes * 1000, 'atual_ms': t_depois * 1000,
+                       'razao': razao, 'status': status})
+    return pd.DataFrame(linhas)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks do projeto")
+    parser.add_argument('--filtro', help="roda só os casos que contêm este texto")
+    parser.add_argument('--repeticoes', type=int, help="repetições por caso")
+    parser.add_argument('--saida', default=ARQUIVO_RESULTADO, help="JSON do resultado")
+    parser.add_argument('--baseline', default=ARQUIVO_BASELINE, help="JSON do baseline")
+    parser.add_argument('--salvar-baseline', action='store_true',
+                        help="grava este resultado também como baseline")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA_PADRAO,
+                        help="aumento relativo da mediana tolerado (0.15 = 15%%)")
+    argumentos = parser.parse_args()
+
+    print("="*80)
+    print("BENCHMARKS")
+    print("="*80)
+
+    resultado = executar_benchmarks(argumentos.filtro, argumentos.repeticoes)
+    salvar_resultado(resultado, argumentos.saida)
+    print(f"\n✅ Resultado salvo em {argumentos.saida}")
+
+    if argumentos.salvar_baseline:
+        salvar_resultado(resultado, argumentos.baseline)
+        print(f"✅ Baseline salvo em {argumentos.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(argumentos.baseline):
+        print("⚠️ Sem baseline para comparar (use --salvar-baseline)")
+        sys.exit(0)
+
+    comparacao = comparar(resultado, carregar_resultado(argumentos.baseline),
+                          argumentos.tolerancia, argumentos.filtro)
+    print("\n" + "="*80)
+    print("COMPARAÇÃO COM O BASELINE")
+    print("="*80)
+    print(comparacao.to_string(index=False, float_format=lambda x: f'{x:.2f}'))
+
+    regressoes = comparacao[comparacao['status'] == 'regressão']
+    if len(regressoes):
+        print(f"\n❌ {len(regressoes)} caso(s) mais lento(s) que o baseline")
+        sys.exit(1)
+    print("\n✅ Nenhuma regressão")
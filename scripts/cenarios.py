@@ -0,0 +1,196 @@
+"""
+================================================================================
+CENÁRIOS - MOTOR DECLARATIVO DE CENÁRIOS MACROECONÔMICOS
+Definições em arquivo → Milhares de trajetórias em lote → Esperado + Quantis
+================================================================================
+
+Os cenários deixam de ser dicionários digitados no script: cada um é uma
+linha por ano em um CSV de dados/ com a probabilidade e os drivers
+(desemprego, pib, inflacao, sm_real). O salário de cada ano vem do
+modelo_salarial (as mesmas elasticidades do simulador e do Monte Carlo),
+avaliado para todos os cenários × anos em uma única chamada vetorizada.
+
+Formato (dados/cenarios_2025_2030.csv):
+    cenario,probabilidade,ano,desemprego,pib,inflacao,sm_real
+    Base,0.60,2025,6.8,2.0,5.0,2.0
+- 'ano' é opcional (arquivos de um único ano, como projecoes_2026.csv)
+- drivers ausentes assumem a média de monte_carlo.DISTRIBUICOES
+
+Para milhares de cenários, expandir_cenarios perturba os drivers de cada
+cenário nomeado (normal truncada com os desvios do Monte Carlo) e reparte
+a probabilidade entre as cópias. Os pesos podem ser substituídos pelos do
+usuário (por nome de cenário ou um peso por linha).
+
+Uso:
+    from cenarios import avaliar_cenarios, carregar_cenarios
+    cenarios = carregar_cenarios('cenarios_2025_2030')
+    resultado = avaliar_cenarios(cenarios, pesos={'Pessimista': 0.3, 'Base': 0.5, 'Otimista': 0.2})
+    resultado['esperado'], resultado['tabela']
+================================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+from acesso_dados import carregar_csv
+from modelo_salarial import DRIVERS, MODELO_PADRAO
+from monte_carlo import DISTRIBUICOES
+from quantis_ponderados import quantis_ponderados
+
+ANO_PADRAO = 2026              # Arquivos sem a coluna 'ano'
+QUANTIS_PADRAO = (0.05, 0.50, 0.95)
+
+# ============================================================================
+# DEFINIÇÕES
+# ============================================================================
+
+def carregar_cenarios(definicoes='cenarios_2025_2030', ano_padrao=ANO_PADRAO):
+    """
+    Lê as definições de cenários de dados/ (ou de um DataFrame)
+
+    Parâmetros:
+    -----------
+    definicoes : str ou DataFrame - Nome do CSV em dados/ ou a tabela com
+                 cenario, probabilidade, [ano] e drivers
+    ano_padrao : int - Ano usado quando não há coluna 'ano'
+
+    Retorna:
+    --------
+    dict - 'cenario' (S,) nome de cada trajetória, 'probabilidade' (S,),
+           'anos' (T,), 'drivers' array (S, T, 4) na ordem de DRIVERS
+    """
+    if isinstance(definicoes, str):
+        tabela = carregar_csv(definicoes)
+    else:
+        tabela = definicoes.copy()
+    faltando = [c for c in ('cenario', 'probabilidade') if c not in tabela.columns]
+    if faltando:
+        raise KeyError(f"Colunas ausentes nas definições: {faltando}")
+    if 'ano' not in tabela.columns:
+        tabela['ano'] = ano_padrao
+    for driver in DRIVERS:
+        if driver not in tabela.columns:
+            tabela[driver] = DISTRIBUICOES[driver][0]
+    tabela['cenario'] = tabela['cenario'].astype(str)
+
+    nomes = pd.unique(tabela['cenario'])
+    anos = np.sort(pd.unique(tabela['ano']))
+    grade = pd.MultiIndex.from_product([nomes, anos], names=['cenario', 'ano'])
+    tabela = tabela.set_index(['cenario', 'ano'])
+    if not tabela.index.is_unique:
+        raise ValueError("Cada cenário deve ter uma única linha por ano")
+    incompletos = grade.difference(tabela.index)
+    if len(incompletos):
+        raise ValueError(f"Cenários sem todos os anos: {sorted(set(incompletos.get_level_values(0)))}")
+    tabela = tabela.reindex(grade)
+
+    probabilidade = tabela['probabilidade'].to_numpy(dtype=np.float64).reshape(len(nomes), len(anos))
+    if np.any(probabilidade != probabilidade[:, :1]):
+        raise ValueError("A probabilidade de um cenário deve ser a mesma em todos os anos")
+    probabilidade = probabilidade[:, 0]
+    if np.any(probabilidade < 0) or not np.isclose(probabilidade.sum(), 1.0):
+        raise ValueError(f"Probabilidades devem ser >= 0 e somar 1 (soma: {probabilidade.sum():.4f})")
+
+    return {
+        'cenario': np.asarray(nomes, dtype=object),
+        'probabilidade': probabilidade,
+        'anos': anos.astype(np.int64),
+        'drivers': tabela[DRIVERS].to_numpy(dtype=np.float64).reshape(len(nomes), len(anos), len(DRIVERS)),
+    }
+
+
+def expandir_cenarios(cenarios, n_por_cenario, escala=1.0, semente=42):
+    """
+    Gera n_por_cenario trajetórias ao redor de cada cenário nomeado
+
+    Cada driver de cada ano recebe um choque normal com desvio
+    escala × desvio de monte_carlo.DISTRIBUICOES, cortado nos mesmos limites.
+    A probabilidade do cenário é dividida igualmente entre as cópias.
+
+    Retorna:
+    --------
+    dict - Mesmo formato de carregar_cenarios, com S × n_por_cenario linhas
+    """
+    if n_por_cenario < 1:
+        raise ValueError("n_por_cenario deve ser >= 1")
+    drivers = np.repeat(cenarios['drivers'], n_por_cenario, axis=0)
+    rng = np.random.default_rng(semente)
+    desvio, minimo, maximo = (np.array([DISTRIBUICOES[d][i] for d in DRIVERS]) for i in (1, 2, 3))
+    drivers = np.clip(drivers + rng.standard_normal(drivers.shape) * desvio * escala, minimo, maximo)
+    return {
+        'cenario': np.repeat(cenarios['cenario'], n_por_cenario),
+        'probabilidade': np.repeat(cenarios['probabilidade'] / n_por_cenario, n_por_cenario),
+        'anos': cenarios['anos'],
+        'drivers': drivers,
+    }
+
+# ============================================================================
+# AVALIAÇÃO EM LOTE
+# ============================================================================
+
+def pesos_cenarios(cenarios, pesos=None):
+    """
+    Pesos normalizados de cada trajetória
+
+    pesos: None (probabilidades do arquivo), dict nome → peso (repartido
+    entre as trajetórias do mesmo cenário) ou array com um peso por linha.
+    Pesos do usuário são relativos: são normalizados para somar 1.
+    """
+    if pesos is None:
+        pesos = cenarios['probabilidade']
+    elif isinstance(pesos, dict):
+        desconhecidos = set(pesos) - set(cenarios['cenario'])
+        if desconhecidos:
+            raise KeyError(f"Cenários inexistentes: {sorted(desconhecidos)}")
+        nomes, contagem = np.unique(cenarios['cenario'], return_counts=True)
+        copias = dict(zip(nomes, contagem))
+        pesos = np.array([pesos.get(nome, 0.0) / copias[nome] for nome in cenarios['cenario']])
+    pesos = np.asarray(pesos, dtype=np.float64)
+    if pesos.shape != cenarios['probabilidade'].shape:
+        raise ValueError(f"Informe um peso por trajetória ({len(cenarios['probabilidade'])})")
+    if np.any(pesos < 0) or pesos.sum() <= 0:
+        raise ValueError("Pesos devem ser >= 0 com soma positiva")
+    return pesos / pesos.sum()
+
+
+def avaliar_cenarios(cenarios, pesos=None, quantis=QUANTIS_PADRAO, modelo=MODELO_PADRAO,
+                     base=MODELO_PADRAO.base):
+    """
+    Salário de todas as trajetórias × anos e o resumo ponderado por ano
+
+    Parâmetros:
+    -----------
+    cenarios : dict - De carregar_cenarios ou expandir_cenarios
+    pesos : None, dict ou array - Ver pesos_cenarios
+    quantis : tuple - Probabilidades dos quantis ponderados
+    modelo : callable - Modelo vetorizado (desemprego, pib, inflacao, sm_real, base=)
+    base : float - Salário base 2024
+
+    Retorna:
+    --------
+    dict - 'salarios' (S, T), 'pesos' (S,), 'esperado' (T,), 'quantis'
+           (Q, T) e 'tabela' DataFrame por ano (esperado, quantis e
+           probabilidade de ficar abaixo da base)
+    """
+    drivers = cenarios['drivers']
+    salarios = modelo(*(drivers[..., i] for i in range(len(DRIVERS))), base=base)
+    pesos = pesos_cenarios(cenarios, pesos)
+    esperado = pesos @ salarios
+
+    n_cenarios, n_anos = salarios.shape
+    _, valores_quantis = quantis_ponderados(salarios.ravel(), np.repeat(pesos, n_anos),
+                                            np.tile(np.arange(n_anos), n_cenarios), quantis)
+    prob_abaixo = pesos @ (salarios < base)
+
+    tabela = pd.DataFrame({'ano': cenarios['anos'], 'esperado': esperado})
+    for p, valores in zip(quantis, valores_quantis.T):
+        tabela[f"p{round(p * 100):02d}"] = valores
+    tabela['prob_abaixo_base'] = prob_abaixo
+
+    return {
+        'salarios': salarios,
+        'pesos': pesos,
+        'esperado': esperado,
+        'quantis': valores_quantis.T,
+        'tabela': tabela,
+    }
@@ -21,6 +21,11 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
+from acesso_dados import frequencias_disponiveis, painel
+from banco_draws import (N_DESVIOS_MARGEM, carregar_banco, distribuicao_centrada,
+                         limites_com_margem, resumir_distribuicao)
+from frequencias import PERIODOS_POR_ANO
+from modelo_salarial import MODELO_PADRAO
 
 # ============================================================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -64,26 +69,106 @@ st.markdown("""
 # ============================================================================
 
 @st.cache_data
-def load_data():
-    anos = np.array([2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019, 
-                     2020, 2021, 2022, 2023, 2024])
-    
-    data = pd.DataFrame({
-        'ano': anos,
-        'p10': [187, 205, 215, 202, 198, 185, 182, 184, 210, 192, 203, 207, 218],
-        'p50': [805, 829, 865, 834, 836, 851, 863, 852, 880, 810, 831, 872, 930],
-        'p90': [2234, 2293, 2355, 2240, 2319, 2301, 2337, 2295, 2368, 2172, 2234, 2376, 2465],
-        'desemprego': [7.4, 7.3, 7.0, 8.9, 11.6, 12.6, 12.1, 11.8, 13.7, 14.0, 9.6, 7.7, 6.6],
-        'part_trabalho': [68.1, 67.8, 65.9, 70.2, 71.6, 71.6, 71.4, 74.2, 67.1, 66.6, 69.4, 70.4, 73.7],
-        'gini': [0.504, 0.499, 0.497, 0.490, 0.498, 0.498, 0.506, 0.506, 0.500, 0.499, 0.486, 0.494, 0.488]
-    })
+def load_data(frequencia='anual'):
+    # Séries históricas lidas (uma vez) de dados/*.csv via acesso_dados;
+    # 'tempo' (ano contínuo) é o eixo x em qualquer frequência
+    data = painel(frequencia)[['tempo', 'ano', 'p10', 'p50', 'p90', 'desemprego',
+                               'part_trabalho', 'gini']]
     
-    # Variação percentual
-    data['variacao_p50'] = data['p50'].pct_change() * 100
+    # Variação percentual contra o mesmo período do ano anterior
+    data['variacao_p50'] = data['p50'].pct_change(periods=PERIODOS_POR_ANO[frequencia]) * 100
     
     return data
 
-df = load_data()
+# Superfície de resposta do simulador: todos os pontos dos sliders
+# (passo 0.5) calculados uma vez por servidor e compartilhados entre sessões,
+# com o mesmo modelo do simulador e das previsões (modelo_salarial.MODELO_PADRAO)
+PASSO_SLIDER = 0.5
+LIMITES_SLIDERS = {
+    'desemprego': (5.0, 15.0),
+    'pib': (-2.0, 5.0),
+    'inflacao': (2.0, 10.0),
+    'sm_real': (0.0, 5.0),
+}
+
+@st.cache_resource
+def superficie_simulador():
+    eixos = {nome: np.arange(minimo, maximo + PASSO_SLIDER / 2, PASSO_SLIDER)
+             for nome, (minimo, maximo) in LIMITES_SLIDERS.items()}
+    return MODELO_PADRAO.superficie(eixos)
+
+def indice_slider(nome, valor):
+    return int(round((valor - LIMITES_SLIDERS[nome][0]) / PASSO_SLIDER))
+
+@st.cache_resource(max_entries=4096)
+def figura_decomposicao(i_desemp, i_pib, i_infl, i_sm):
+    # Memo LRU das figuras por combinação de sliders
+    impactos = superficie_simulador()['impactos']
+    decomp_data = pd.DataFrame({
+        'Fator': ['Desemprego', 'Salário Mínimo', 'PIB', 'Inflação'],
+        'Impacto (pp)': [impactos['desemprego'][i_desemp], impactos['sm_real'][i_sm],
+                         impactos['pib'][i_pib], impactos['inflacao'][i_infl]]
+    })
+    
+    fig_decomp = px.bar(
+        decomp_data,
+        x='Fator',
+        y='Impacto (pp)',
+        color='Impacto (pp)',
+        color_continuous_scale=['red', 'yellow', 'green'],
+        title="Contribuição de Cada Fator"
+    )
+    
+    fig_decomp.update_layout(height=400, showlegend=False)
+    return fig_decomp
+
+# Distribuição ao vivo: banco de normais padrão (memory-mapped, um por
+# servidor) deslocado e escalado para os sliders; ver banco_draws.py
+@st.cache_resource
+def banco_simulador():
+    return carregar_banco()
+
+@st.cache_resource(max_entries=4096)
+def distribuicao_simulador(i_desemp, i_pib, i_infl, i_sm):
+    eixos = superficie_simulador()['eixos']
+    centro = {'desemprego': eixos['desemprego'][i_desemp], 'pib': eixos['pib'][i_pib],
+              'inflacao': eixos['inflacao'][i_infl], 'sm_real': eixos['sm_real'][i_sm]}
+    # Corte além do domínio dos sliders (não nos limites do Monte Carlo), para
+    # a distribuição ficar centrada no ponto escolhido mesmo nos extremos
+    salarios = distribuicao_centrada(banco_simulador(), centro, limites_com_margem(LIMITES_SLIDERS))
+    resumo = resumir_distribuicao(salarios, MODELO_PADRAO.base)
+    
+    # Linhas e faixa como shapes do layout (bem mais rápido que add_vline)
+    linha = lambda x, cor, estilo: dict(type='line', x0=x, x1=x, y0=0, y1=1, yref='paper',
+                                         line=dict(color=cor, dash=estilo, width=2))
+    rotulo = lambda x, texto: dict(x=x, y=1, yref='paper', text=texto, showarrow=False,
+                                   yanchor='bottom')
+    bordas = resumo['bordas']
+    fig_dist = go.Figure(
+        go.Bar(
+            x=(bordas[:-1] + bordas[1:]) / 2,
+            y=resumo['contagens'] / resumo['contagens'].sum() * 100,
+            width=np.diff(bordas),
+            marker_color='#3498DB',
+            name='Cenários'
+        ),
+        layout=dict(
+            title="Distribuição do Salário 2026 em Torno dos Drivers Escolhidos",
+            xaxis_title="Salário Real 2026 (R$)",
+            yaxis_title="% dos Cenários",
+            bargap=0,
+            height=400,
+            showlegend=False,
+            shapes=[dict(type='rect', x0=resumo['P5'], x1=resumo['P95'], y0=0, y1=1,
+                         yref='paper', fillcolor='orange', opacity=0.1, line_width=0),
+                    linha(MODELO_PADRAO.base, 'green', 'dash'),
+                    linha(resumo['P50'], 'red', 'dot')],
+            annotations=[rotulo(resumo['P5'], "P5-P95"),
+                         rotulo(MODELO_PADRAO.base, f"Base 2024: R${MODELO_PADRAO.base}"),
+                         rotulo(resumo['P50'], f"Mediana: R${resumo['P50']:.0f}")]
+        )
+    )
+    return resumo, fig_dist
 
 # ============================================================================
 # SIDEBAR - CONTROLES
@@ -91,6 +176,15 @@ df = load_data()
 
 st.sidebar.markdown("## 🎛️ Controles")
 
+# Seletor de frequência (só aparece se houver séries trimestrais/mensais em dados/)
+frequencias = frequencias_disponiveis()
+frequencia = 'anual'
+if len(frequencias) > 1:
+    frequencia = st.sidebar.selectbox("Frequência dos Dados", frequencias,
+                                      format_func=str.capitalize)
+
+df = load_data(frequencia)
+
 # Seletor de período
 periodo = st.sidebar.radio(
     "Período de Análise",
@@ -180,7 +274,7 @@ if modo == "Dashboard Principal":
     fig1 = go.Figure()
     
     fig1.add_trace(go.Scatter(
-        x=df_filtered['ano'],
+        x=df_filtered['tempo'],
         y=df_filtered['p50'],
         mode='lines+markers',
         name='Salário Real Mediana',
@@ -211,13 +305,13 @@ if modo == "Dashboard Principal":
         fig2 = make_subplots(specs=[[{"secondary_y": True}]])
         
         fig2.add_trace(
-            go.Scatter(x=df_filtered['ano'], y=df_filtered['desemprego'],
+            go.Scatter(x=df_filtered['tempo'], y=df_filtered['desemprego'],
                       name="Desemprego", line=dict(color='#E74C3C', width=2)),
             secondary_y=False
         )
         
         fig2.add_trace(
-            go.Scatter(x=df_filtered['ano'], y=df_filtered['p50'],
+            go.Scatter(x=df_filtered['tempo'], y=df_filtered['p50'],
                       name="Salário", line=dict(color='#2ECC71', width=2)),
             secondary_y=True
         )
@@ -234,7 +328,7 @@ if modo == "Dashboard Principal":
         fig3 = go.Figure()
         
         fig3.add_trace(go.Scatter(
-            x=df_filtered['ano'],
+            x=df_filtered['tempo'],
             y=df_filtered['part_trabalho'],
             fill='tozeroy',
             name='Participação Trabalho',
@@ -339,24 +433,18 @@ elif modo == "Simulador de Cenários":
             help="Fórmula atual: INPC + PIB passado"
         )
     
-    # Cálculo do impacto
-    base_2024 = 930
-    
-    # Impacto desemprego (elasticidade -2.0)
-    impacto_desemp = -2.0 * (desemprego_sim - 6.6)
+    # Impacto via superfície pré-calculada (consulta, sem recalcular o modelo)
+    superficie = superficie_simulador()
+    indices = (indice_slider('desemprego', desemprego_sim), indice_slider('pib', pib_sim),
+               indice_slider('inflacao', inflacao_sim), indice_slider('sm_real', salario_minimo_real))
     
-    # Impacto salário mínimo (40% do ganho)
-    impacto_sm = 0.40 * salario_minimo_real
-    
-    # Impacto PIB (via emprego e produtividade)
-    impacto_pib = 0.30 * pib_sim
-    
-    # Impacto inflação (corrói ganho nominal)
-    impacto_inflacao = -(inflacao_sim - 3.0) * 0.5
-    
-    # Total
-    impacto_total = impacto_desemp + impacto_sm + impacto_pib + impacto_inflacao
-    salario_2026 = base_2024 * (1 + impacto_total/100)
+    base_2024 = MODELO_PADRAO.base
+    impacto_desemp = superficie['impactos']['desemprego'][indices[0]]
+    impacto_pib = superficie['impactos']['pib'][indices[1]]
+    impacto_inflacao = superficie['impactos']['inflacao'][indices[2]]
+    impacto_sm = superficie['impactos']['sm_real'][indices[3]]
+    impacto_total = superficie['impacto_total'][indices]
+    salario_2026 = superficie['salario'][indices]
     
     st.markdown("---")
     
@@ -388,22 +476,31 @@ elif modo == "Simulador de Cenários":
     # Decomposição do impacto
     st.markdown("### 📊 Decomposição do Impacto")
     
-    decomp_data = pd.DataFrame({
-        'Fator': ['Desemprego', 'Salário Mínimo', 'PIB', 'Inflação'],
-        'Impacto (pp)': [impacto_desemp, impacto_sm, impacto_pib, impacto_inflacao]
-    })
+    fig_decomp = figura_decomposicao(*indices)
+    st.plotly_chart(fig_decomp, use_container_width=True)
     
-    fig_decomp = px.bar(
-        decomp_data,
-        x='Fator',
-        y='Impacto (pp)',
-        color='Impacto (pp)',
-        color_continuous_scale=['red', 'yellow', 'green'],
-        title="Contribuição de Cada Fator"
-    )
+    # Distribuição de resultados (incerteza do Monte Carlo ao redor dos sliders)
+    st.markdown("### 🎲 Distribuição de Resultados (Monte Carlo)")
     
-    fig_decomp.update_layout(height=400, showlegend=False)
-    st.plotly_chart(fig_decomp, use_container_width=True)
+    resumo_dist, fig_dist = distribuicao_simulador(*indices)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("P5 (cenário ruim)", f"R${resumo_dist['P5']:.0f}")
+    with col2:
+        st.metric("P95 (cenário bom)", f"R${resumo_dist['P95']:.0f}")
+    with col3:
+        st.metric("Prob. de Queda vs 2024", f"{resumo_dist['Prob. Queda']:.1f}%")
+    with col4:
+        st.metric("Prob. de Queda >5%", f"{resumo_dist['Prob. Queda >5%']:.1f}%")
+    
+    if not resumo_dist['P5'] <= salario_2026 <= resumo_dist['P95']:
+        st.warning("⚠️ A projeção pontual ficou fora da faixa P5-P95 da distribuição simulada")
+    
+    st.plotly_chart(fig_dist, use_container_width=True)
+    st.caption(f"{banco_simulador().shape[1]:,} draws".replace(',', '.')
+               + " com os desvios do Monte Carlo, centrados nos valores dos sliders"
+               + f" (corte a {N_DESVIOS_MARGEM} desvios além da faixa dos sliders)")
     
     # Interpretação
     st.markdown("### 💡 Interpretação")
@@ -0,0 +1,210 @@
+"""
+================================================================================
+FREQUÊNCIAS - ÍNDICE DE PERÍODOS E CONVERSÃO ANUAL ↔ TRIMESTRAL ↔ MENSAL
+PeriodIndex + Tempo contínuo + Agregação/desagregação vetorizadas
+================================================================================
+
+As análises eram indexadas por `anos` (13 pontos). A PNAD Contínua é
+trimestral (com divulgações mensais de trimestres móveis) e o CAGED é mensal.
+Aqui cada série ganha um índice de períodos (pandas PeriodIndex) e um tempo
+contínuo em anos (2012.0, 2012.25, ...), que serve de regressor em qualquer
+frequência: tendências continuam em R$/ano.
+
+As conversões operam sobre o último eixo de arrays (..., n), então muitas
+séries (p.ex. 27 UFs × 150 meses) são convertidas em uma única chamada:
+- agregar: mensal → trimestral → anual (média, soma, primeiro, último)
+- desagregar: anual → trimestral → mensal (repetir, dividir, interpolar)
+
+Uso:
+    from frequencias import agregar, indice_periodos, tempo_continuo
+    periodos = indice_periodos(anos, meses, 'mensal')
+    anual, anos = agregar(p50_mensal, periodos, 'anual')
+================================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+# Frequência → código de período do pandas e períodos por ano
+CODIGOS = {'anual': 'Y', 'trimestral': 'Q', 'mensal': 'M'}
+PERIODOS_POR_ANO = {'anual': 1, 'trimestral': 4, 'mensal': 12}
+
+AGREGACOES = ('media', 'soma', 'primeiro', 'ultimo')
+DESAGREGACOES = ('repetir', 'dividir', 'interpolar')
+
+# ============================================================================
+# ÍNDICE DE PERÍODOS E TEMPO CONTÍNUO
+# ============================================================================
+
+def _validar(frequencia):
+    if frequencia not in CODIGOS:
+        raise ValueError(f"Frequência desconhecida: '{frequencia}' (opções: {list(CODIGOS)})")
+    return CODIGOS[frequencia]
+
+
+def frequencia_de(periodos):
+    """Nome da frequência ('anual', 'trimestral', 'mensal') de um PeriodIndex"""
+    codigo = periodos.freqstr[0].replace('A', 'Y')  # 'Y-DEC', 'Q-DEC', 'M'
+    for frequencia, codigo_frequencia in CODIGOS.items():
+        if codigo == codigo_frequencia:
+            return frequencia
+    raise ValueError(f"Frequência de período não suportada: {periodos.freqstr}")
+
+
+def indice_periodos(anos, subperiodos=None, frequencia='anual'):
+    """
+    PeriodIndex a partir de colunas inteiras (vetorizado)
+
+    Parâmetros:
+    -----------
+    anos : array (n,) - Ano de cada observação
+    subperiodos : array (n,) opcional - Trimestre (1-4) ou mês (1-12)
+    frequencia : str - 'anual', 'trimestral' ou 'mensal'
+
+    Retorna:
+    --------
+    pd.PeriodIndex
+    """
+    codigo = _validar(frequencia)
+    anos = np.asarray(anos, dtype=np.int64)
+    if frequencia == 'anual':
+        meses = np.ones_like(anos)
+    elif subperiodos is None:
+        raise ValueError(f"Frequência '{frequencia}' precisa do trimestre/mês de cada linha")
+    else:
+        passo = 12 // PERIODOS_POR_ANO[frequencia]
+        meses = (np.asarray(subperiodos, dtype=np.int64) - 1) * passo + 1
+    datas = pd.to_datetime(pd.DataFrame({'year': anos, 'month': meses, 'day': 1}))
+    return pd.PeriodIndex(datas.dt.to_period(codigo))
+
+
+def tempo_continuo(periodos):
+    """
+    Tempo em anos de cada período: ano + (posição no ano - 1) / períodos por ano
+
+    2012 → 2012.0 (anual); 2012Q2 → 2012.25; 2012-03 → 2012.1667.
+    Usado como regressor, dá tendências em R$/ano em qualquer frequência.
+    """
+    por_ano = PERIODOS_POR_ANO[frequencia_de(periodos)]
+    posicao = (np.asarray(periodos.month) - 1) * por_ano // 12
+    return np.asarray(periodos.year, dtype=np.float64) + posicao / por_ano
+
+
+def tempo_medio_anual(anos, frequencia):
+    """Tempo contínuo médio dos períodos de cada ano (meio do ano em subperíodos)"""
+    por_ano = PERIODOS_POR_ANO[frequencia]
+    return np.asarray(anos, dtype=np.float64) + (por_ano - 1) / (2 * por_ano)
+
+# ============================================================================
+# AGREGAÇÃO E DESAGREGAÇÃO
+# ============================================================================
+
+def agregar(valores, periodos, frequencia, como='media', completos=True):
+    """
+    Converte séries para uma frequência menor (p.ex. mensal → anual)
+
+    Parâmetros:
+    -----------
+    valores : array (n,) ou (m, n) - Séries no calendário de `periodos`
+    periodos : PeriodIndex (n,) - Períodos ordenados e sem repetição
+    frequencia : str - Frequência de destino
+    como : str - 'media' (taxas, níveis), 'soma' (fluxos, p.ex. saldo do
+           CAGED), 'primeiro' ou 'ultimo' (estoques)
+    completos : bool - NaN nos períodos de destino com subperíodos faltando
+                (p.ex. o ano corrente com 5 meses)
+
+    Retorna:
+    --------
+    (valores (..., g), PeriodIndex (g,)) na frequência de destino
+    """
+    if como not in AGREGACOES:
+        raise ValueError(f"Agregação desconhecida: '{como}' (opções: {AGREGACOES})")
+    origem = frequencia_de(periodos)
+    if PERIODOS_POR_ANO[frequencia] > PERIODOS_POR_ANO[origem]:
+        raise ValueError(f"Use desagregar para ir de '{origem}' para '{frequencia}'")
+    if not periodos.is_monotonic_increasing or not periodos.is_unique:
+        raise ValueError("Os períodos devem estar ordenados e sem repetição")
+    valores = np.asarray(valores, dtype=np.float64)
+
+    destino = periodos.asfreq(_validar(frequencia))
+    # Períodos ordenados: cada grupo de destino é um trecho contíguo
+    inicio = np.flatnonzero(np.r_[True, destino[1:] != destino[:-1]])
+    tamanho = np.diff(np.r_[inicio, len(destino)])
+
+    if como in ('media', 'soma'):
+        resultado = np.add.reduceat(valores, inicio, axis=-1)
+        if como == 'media':
+            resultado = resultado / tamanho
+    else:
+        resultado = valores[..., inicio if como == 'primeiro' else inicio + tamanho - 1]
+
+    if completos:
+        esperado = PERIODOS_POR_ANO[origem] // PERIODOS_POR_ANO[frequencia]
+        resultado = np.where(tamanho == esperado, resultado, np.nan)
+    return resultado, destino[inicio]
+
+
+def desagregar(valores, periodos, frequencia, como='interpolar'):
+    """
+    Converte séries para uma frequência maior (p.ex. anual → mensal)
+
+    Parâmetros:
+    -----------
+    valores : array (n,) ou (m, n) - Séries no calendário de `periodos`
+    periodos : PeriodIndex (n,) - Períodos ordenados
+    frequencia : str - Frequência de destino
+    como : str - 'repetir' (degrau, p.ex. taxas anuais), 'dividir' (fluxos
+           repartidos igualmente) ou 'interpolar' (linear entre os meios
+           dos períodos de origem; constante antes do primeiro e depois do
+           último)
+
+    Retorna:
+    --------
+    (valores (..., n × razão), PeriodIndex) na frequência de destino
+    """
+    if como not in DESAGREGACOES:
+        raise ValueError(f"Desagregação desconhecida: '{como}' (opções: {DESAGREGACOES})")
+    origem = frequencia_de(periodos)
+    razao = PERIODOS_POR_ANO[frequencia] // PERIODOS_POR_ANO[origem]
+    if razao < 1:
+        raise ValueError(f"Use agregar para ir de '{origem}' para '{frequencia}'")
+    valores = np.asarray(valores, dtype=np.float64)
+    codigo = _validar(frequencia)
+
+    destino = pd.period_range(periodos[0].asfreq(codigo, how='start'),
+                              periodos[-1].asfreq(codigo, how='end'), freq=codigo)
+    destino = destino[np.isin(destino.asfreq(periodos.freqstr).asi8, periodos.asi8)]
+    origem_de = np.searchsorted(periodos.asi8, destino.asfreq(periodos.freqstr).asi8)
+
+    if como == 'repetir':
+        return valores[..., origem_de], destino
+    if como == 'dividir':
+        return valores[..., origem_de] / razao, destino
+
+    # Interpolação linear entre os meios dos períodos: pesos calculados uma
+    # vez e aplicados a todas as séries
+    meio_origem = tempo_continuo(periodos) + 0.5 / PERIODOS_POR_ANO[origem]
+    meio_destino = tempo_continuo(destino) + 0.5 / PERIODOS_POR_ANO[frequencia]
+    if len(periodos) == 1:
+        return valores[..., origem_de], destino
+    direita = np.clip(np.searchsorted(meio_origem, meio_destino), 1, len(periodos) - 1)
+    esquerda = direita - 1
+    peso = (meio_destino - meio_origem[esquerda]) / (meio_origem[direita] - meio_origem[esquerda])
+    peso = np.clip(peso, 0.0, 1.0)
+    interpolado = valores[..., esquerda] * (1 - peso) + valores[..., direita] * peso
+    return interpolado, destino
+
+
+def converter(valores, periodos, frequencia, como=None):
+    """
+    Agrega ou desagrega conforme a frequência de destino
+
+    `como` segue agregar (padrão 'media') ou desagregar (padrão 'interpolar');
+    na mesma frequência os valores voltam sem alteração.
+    """
+    origem = frequencia_de(periodos)
+    if PERIODOS_POR_ANO[frequencia] == PERIODOS_POR_ANO[origem]:
+        return np.asarray(valores, dtype=np.float64), periodos
+    if PERIODOS_POR_ANO[frequencia] < PERIODOS_POR_ANO[origem]:
+        return agregar(valores, periodos, frequencia, como or 'media')
+    return desagregar(valores, periodos, frequencia, como or 'interpolar')
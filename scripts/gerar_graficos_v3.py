@@ -6,6 +6,13 @@ Autor: Vitor Ramos dos Santos
 ============================================================================
 """
 
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
@@ -13,6 +20,7 @@ import pandas as pd
 import seaborn as sns
 from matplotlib.ticker import FuncFormatter
 from matplotlib import rcParams
+from acesso_dados import carregar_csv, series
 
 # Configuração global
 rcParams['font.family'] = 'sans-serif'
@@ -30,6 +38,9 @@ CORES = {
     'cinza_claro': '#ECF0F1'
 }
 
+# P50 2025 (preliminar, ainda fora de dados/percentis_rendimento.csv)
+P50_2025_PRELIMINAR = 938
+
 def formatar_reais(x, pos):
     """Formatar valores em reais"""
     return f'R${x:.0f}'
@@ -43,10 +54,9 @@ def formatar_mil(x, pos):
 # ============================================================================
 
 def grafico_1_trajetoria():
-    anos = np.array([2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019, 
-                     2020, 2021, 2022, 2023, 2024, 2025])
-    p50 = np.array([805, 829, 865, 834, 836, 851, 863, 852, 
-                    880, 810, 831, 872, 930, 938])
+    anos, p50 = series('ano', 'p50')
+    anos = np.append(anos, 2025)
+    p50 = np.append(p50, P50_2025_PRELIMINAR)
     
     # Marcos históricos
     marcos = {
@@ -186,10 +196,7 @@ def grafico_3_progressivo():
 # ============================================================================
 
 def grafico_4_participacao_pib():
-    anos = np.array([2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019, 
-                     2020, 2021, 2022, 2023, 2024])
-    trabalho = np.array([68.1, 67.8, 65.9, 70.2, 71.6, 71.6, 71.4, 74.2, 
-                         67.1, 66.6, 69.4, 70.4, 73.7])
+    anos, trabalho = series('ano', 'part_trabalho')
     capital = 100 - trabalho
     
     fig, ax = plt.subplots(figsize=(14, 8))
@@ -243,12 +250,7 @@ def grafico_4_participacao_pib():
 # ============================================================================
 
 def grafico_5_desemprego_salario():
-    anos = np.array([2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019, 
-                     2020, 2021, 2022, 2023, 2024])
-    desemprego = np.array([7.4, 7.3, 7.0, 8.9, 11.6, 12.6, 12.1, 11.8, 
-                           13.7, 14.0, 9.6, 7.7, 6.6])
-    p50 = np.array([805, 829, 865, 834, 836, 851, 863, 852, 
-                    880, 810, 831, 872, 930])
+    anos, desemprego, p50 = series('ano', 'desemprego', 'p50')
     
     fig, ax1 = plt.subplots(figsize=(14, 8))
     
@@ -305,12 +307,7 @@ def grafico_5_desemprego_salario():
 # ============================================================================
 
 def grafico_6_massa_pib():
-    anos = np.array([2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019, 
-                     2020, 2021, 2022, 2023, 2024])
-    massa_indice = np.array([100, 105.2, 109.5, 105.4, 104.3, 104.1, 108.1, 110.2, 
-                             103.8, 100.2, 106.5, 118.9, 126.5])
-    pib_indice = np.array([100, 103.0, 103.5, 99.8, 96.5, 97.7, 99.5, 100.7, 
-                           96.8, 101.7, 104.8, 107.8, 111.2])
+    anos, massa_indice, pib_indice = series('ano', 'massa_indice', 'pib_real_indice')
     
     fig, ax = plt.subplots(figsize=(14, 8))
     
@@ -356,8 +353,9 @@ def grafico_6_massa_pib():
 # ============================================================================
 
 def grafico_7_caged_reversao():
-    setores = ['Serviços', 'Indústria', 'Construção', 'Comércio', 'Agropecuária']
-    saldos = [-280.810, -135.087, -104.077, -54.355, -43.836]
+    caged = carregar_csv('caged_setorial_2025')
+    setores = caged['setor'].astype(str).tolist()
+    saldos = (caged['saldo'] / 1000).tolist()  # mil empregos
     
     fig, ax = plt.subplots(figsize=(11, 7))
     
@@ -497,9 +495,10 @@ def grafico_9_horas_produtividade():
 # ============================================================================
 
 def grafico_10_projecoes():
-    cenarios = ['Pessimista', 'Base', 'Otimista']
-    valores = [870, 930, 960]
-    probs = ['20%', '60%', '20%']
+    projecoes = carregar_csv('projecoes_2026')
+    cenarios = projecoes['cenario'].astype(str).tolist()
+    valores = projecoes['p50_projetado'].tolist()
+    probs = [f'{p:.0%}' for p in projecoes['probabilidade']]
     cores_barras = [CORES['vermelho'], CORES['amarelo'], CORES['verde']]
     variacoes = [(v/930 - 1)*100 for v in valores]
     
@@ -545,21 +544,108 @@ def grafico_10_projecoes():
 # MAIN: GERAR TODOS OS GRÁFICOS
 # ============================================================================
 
+# ============================================================================
+# RENDERIZAÇÃO: SERIAL OU EM PARALELO (UM PROCESSO POR GRÁFICO)
+# ============================================================================
+
+GRAFICOS = [
+    grafico_1_trajetoria,
+    grafico_2_decomposicao,
+    grafico_3_progressivo,
+    grafico_4_participacao_pib,
+    grafico_5_desemprego_salario,
+    grafico_6_massa_pib,
+    grafico_7_caged_reversao,
+    grafico_8_criacao_empregos,
+    grafico_9_horas_produtividade,
+    grafico_10_projecoes,
+]
+
+
+def _iniciar_worker():
+    # Cada worker tem o próprio estado do matplotlib: backend sem janela e
+    # nenhuma figura herdada do processo pai
+    matplotlib.use('Agg')
+    plt.close('all')
+
+
+def _renderizar(nome):
+    inicio = time.perf_counter()
+    globals()[nome]()
+    plt.close('all')
+    return nome, time.perf_counter() - inicio
+
+
+def renderizar_graficos(graficos=GRAFICOS, n_workers=1):
+    """
+    Gera os gráficos em série (n_workers=1) ou em um pool de processos
+
+    Os arquivos gerados são os mesmos nos dois modos: cada função salva o
+    seu PNG e cada worker começa de um matplotlib limpo (contexto 'spawn',
+    com os rcParams definidos no topo deste módulo).
+
+    Parâmetros:
+    -----------
+    graficos : list - Funções grafico_* a gerar
+    n_workers : int - Processos em paralelo (None = todos os núcleos)
+
+    Retorna:
+    --------
+    dict - nome do gráfico → tempo de parede (s), na ordem de `graficos`
+
+    Se algum gráfico falhar, os pendentes são cancelados e um RuntimeError
+    com o nome do gráfico é levantado na hora, sem esperar os que já estão
+    em renderização.
+    """
+    nomes = [g.__name__ for g in graficos]
+    tempos = {}
+
+    if n_workers == 1:
+        for nome in nomes:
+            try:
+                tempos[nome] = _renderizar(nome)[1]
+            except Exception as erro:
+                raise RuntimeError(f"Falha ao gerar {nome}: {erro}") from erro
+        return tempos
+
+    n_workers = min(n_workers or os.cpu_count() or 1, len(nomes))
+    # Sem `with`: a saída do bloco esperaria os gráficos já em renderização
+    pool = ProcessPoolExecutor(max_workers=n_workers, initializer=_iniciar_worker,
+                               mp_context=multiprocessing.get_context('spawn'))
+    futuros = {pool.submit(_renderizar, nome): nome for nome in nomes}
+    for futuro in as_completed(futuros):
+        nome = futuros[futuro]
+        try:
+            tempos[nome] = futuro.result()[1]
+        except Exception as erro:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise RuntimeError(f"Falha ao gerar {nome}: {erro}") from erro
+    pool.shutdown()
+
+    return {nome: tempos[nome] for nome in nomes}
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Gera os 10 gráficos principais")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processos em paralelo (1 = serial, 0 = todos os núcleos)")
+    argumentos = parser.parse_args()
+
     print("\n" + "="*70)
     print("GERANDO TODOS OS GRÁFICOS - VERSÃO 3.0")
     print("="*70 + "\n")
     
-    grafico_1_trajetoria()
-    grafico_2_decomposicao()
-    grafico_3_progressivo()
-    grafico_4_participacao_pib()
-    grafico_5_desemprego_salario()
-    grafico_6_massa_pib()
-    grafico_7_caged_reversao()
-    grafico_8_criacao_empregos()
-    grafico_9_horas_produtividade()
-    grafico_10_projecoes()
+    inicio = time.perf_counter()
+    tempos = renderizar_graficos(GRAFICOS, n_workers=argumentos.workers or None)
+    total = time.perf_counter() - inicio
+    
+    print("\nTempo por gráfico:")
+    for nome, segundos in tempos.items():
+        print(f"  {nome:<32} {segundos:6.2f} s")
+    print(f"  {'total (parede)':<32} {total:6.2f} s")
     
     print("\n" + "="*70)
     print("✅ TODOS OS 10 GRÁFICOS CRIADOS COM SUCESSO!")
@@ -0,0 +1,173 @@
+"""
+================================================================================
+ÍNDICES DE SOBOL - SENSIBILIDADE GLOBAL BASEADA EM VARIÂNCIA
+Desenho de Saltelli + Avaliação em lotes paralelos + IC por bootstrap
+================================================================================
+
+Quanto da variância do salário 2026 vem de cada driver?
+- S1 (primeira ordem): efeito do driver sozinho
+- ST (efeito total): efeito do driver incluindo todas as interações
+ST - S1 mede as interações; soma de S1 ≈ 1 indica modelo aditivo.
+
+Desenho (Saltelli 2010): duas matrizes independentes A e B (N × k) e, para
+cada driver i, AB_i = A com a coluna i de B. São N·(k+2) avaliações do
+modelo, feitas em blocos com as mesmas sementes e o mesmo pool de processos
+do motor Monte Carlo (resultado idêntico com 1 ou N processos).
+
+Estimadores: S1 de Saltelli (2010) e ST de Jansen (1999).
+
+Uso:
+    from indices_sobol import indices_sobol
+    tabela = indices_sobol(n_base=2**14)
+================================================================================
+"""
+
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from modelo_salarial import MODELO_PADRAO
+from monte_carlo import (DISTRIBUICOES, SEMENTE_PADRAO, TAMANHO_BLOCO_PADRAO,
+                         dividir_blocos, gerador_bloco, mapear_blocos,
+                         transformar_uniformes)
+
+# Réplicas bootstrap reamostradas por vez (limita a memória)
+REPLICAS_POR_LOTE = 50
+
+# ============================================================================
+# AMOSTRAGEM E AVALIAÇÃO
+# ============================================================================
+
+def avaliar_bloco_sobol(tarefa, modelo=MODELO_PADRAO,
+                        distribuicoes=DISTRIBUICOES, vetorizado=True):
+    """
+    Avalia o modelo nas linhas de A, B e AB_i de um bloco do desenho
+
+    Parâmetros:
+    -----------
+    tarefa : tuple - (semente, indice, inicio, tamanho), como em mapear_blocos
+    modelo : callable - f(*drivers) na ordem de `distribuicoes`
+    vetorizado : bool - False para modelos escalares (p.ex. simular_salario_2026)
+
+    Retorna:
+    --------
+    ndarray (k+2, tamanho) - linhas f(A), f(B), f(AB_1), ..., f(AB_k)
+    """
+    semente, indice, _, tamanho = tarefa
+    k = len(distribuicoes)
+    uniformes = gerador_bloco(semente, indice).random((tamanho, 2 * k))
+    a, b = uniformes[:, :k], uniformes[:, k:]
+
+    # Todas as (k+2) matrizes empilhadas em um único lote
+    matrizes = [a, b]
+    for i in range(k):
+        ab = a.copy()
+        ab[:, i] = b[:, i]
+        matrizes.append(ab)
+    drivers = list(transformar_uniformes(np.concatenate(matrizes), distribuicoes).values())
+
+    if vetorizado:
+        saida = np.asarray(modelo(*drivers), dtype=np.float64)
+    else:
+        saida = np.fromiter(map(modelo, *drivers), dtype=np.float64, count=len(drivers[0]))
+    return saida.reshape(k + 2, tamanho)
+
+# ============================================================================
+# ESTIMADORES
+# ============================================================================
+
+def estimar_indices(f_a, f_b, f_ab):
+    """
+    S1 (Saltelli 2010) e ST (Jansen 1999) a partir das avaliações
+
+    Aceita dimensões extras à esquerda (p.ex. réplicas bootstrap): f_a e f_b
+    com formato (..., N) e f_ab com formato (..., k, N).
+
+    Retorna:
+    --------
+    (s1, st) - arrays (..., k)
+    """
+    # Saídas centradas na média de A e B: o estimador de S1 fica instável
+    # quando a média é grande frente ao desvio (salários ~R$900 vs ~R$30)
+    juntos = np.concatenate([f_a, f_b], axis=-1)
+    media = juntos.mean(axis=-1, keepdims=True)
+    variancia = juntos.var(axis=-1)[..., None]
+    f_a = (f_a - media)[..., None, :]
+    f_b = (f_b - media)[..., None, :]
+    f_ab = f_ab - media[..., None, :]
+    s1 = np.mean(f_b * (f_ab - f_a), axis=-1) / variancia
+    st = 0.5 * np.mean((f_a - f_ab) ** 2, axis=-1) / variancia
+    return s1, st
+
+
+def _bootstrap(avaliacoes, n_bootstrap, rng):
+    # Reamostra as N linhas do desenho (mantendo A, B e AB_i pareados)
+    n = avaliacoes.shape[1]
+    s1, st = [], []
+    for inicio in range(0, n_bootstrap, REPLICAS_POR_LOTE):
+        replicas = min(REPLICAS_POR_LOTE, n_bootstrap - inicio)
+        linhas = rng.integers(0, n, size=(replicas, n))
+        amostra = np.moveaxis(avaliacoes[:, linhas], 0, 1)  # (réplicas, k+2, N)
+        parcial = estimar_indices(amostra[:, 0], amostra[:, 1], amostra[:, 2:])
+        s1.append(parcial[0])
+        st.append(parcial[1])
+    return np.concatenate(s1), np.concatenate(st)
+
+# ============================================================================
+# API PRINCIPAL
+# ============================================================================
+
+def indices_sobol(modelo=MODELO_PADRAO, distribuicoes=DISTRIBUICOES,
+                  n_base=2**14, n_bootstrap=500, nivel_confianca=0.95,
+                  semente=SEMENTE_PADRAO, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                  n_workers=1, vetorizado=True):
+    """
+    Índices de Sobol de primeira ordem e de efeito total com IC bootstrap
+
+    Parâmetros:
+    -----------
+    modelo : callable - Simulador f(*drivers) na ordem de `distribuicoes`;
+             com n_workers > 1 deve ser picklable (função de nível de módulo
+             ou um ModeloSalarial)
+    distribuicoes : dict - nome → (média, desvio, mínimo, máximo)
+    n_base : int - Linhas de A e B (total de avaliações = n_base × (k+2))
+    n_bootstrap : int - Réplicas bootstrap para os intervalos (0 = sem IC)
+    nivel_confianca : float - Nível dos intervalos percentis
+    semente : int - Semente raiz (desenho e bootstrap reprodutíveis)
+    tamanho_bloco : int - Linhas do desenho por bloco
+    n_workers : int ou None - Processos (1 = serial, None = todos os núcleos)
+    vetorizado : bool - False para modelos escalares (p.ex. simular_salario_2026)
+
+    Retorna:
+    --------
+    DataFrame - fator, S1, S1_inf, S1_sup, ST, ST_inf, ST_sup
+    """
+    if n_base < 2:
+        raise ValueError("n_base deve ser >= 2")
+    k = len(distribuicoes)
+
+    avaliacoes = np.empty((k + 2, n_base), dtype=np.float64)
+    avaliar = partial(avaliar_bloco_sobol, modelo=modelo, distribuicoes=distribuicoes,
+                      vetorizado=vetorizado)
+    blocos = dividir_blocos(n_base, tamanho_bloco)
+    for (_, inicio, tamanho), parcial in zip(
+            blocos, mapear_blocos(avaliar, n_base, semente, tamanho_bloco, n_workers)):
+        avaliacoes[:, inicio:inicio + tamanho] = parcial
+
+    f_a, f_b, f_ab = avaliacoes[0], avaliacoes[1], avaliacoes[2:]
+    if f_a.var() == 0 and f_b.var() == 0:
+        raise ValueError("Saída do modelo sem variância: índices indefinidos")
+    s1, st = estimar_indices(f_a, f_b, f_ab)
+
+    tabela = pd.DataFrame({'fator': list(distribuicoes), 'S1': s1, 'ST': st})
+    if n_bootstrap:
+        # Fluxo próprio, separado dos blocos do desenho (spawn_key de 2 níveis)
+        rng = np.random.default_rng(np.random.SeedSequence(semente, spawn_key=(0, 1)))
+        s1_boot, st_boot = _bootstrap(avaliacoes, n_bootstrap, rng)
+        caudas = [(1 - nivel_confianca) / 2 * 100, (1 + nivel_confianca) / 2 * 100]
+        tabela['S1_inf'], tabela['S1_sup'] = np.percentile(s1_boot, caudas, axis=0)
+        tabela['ST_inf'], tabela['ST_sup'] = np.percentile(st_boot, caudas, axis=0)
+        tabela = tabela[['fator', 'S1', 'S1_inf', 'S1_sup', 'ST', 'ST_inf', 'ST_sup']]
+
+    return tabela
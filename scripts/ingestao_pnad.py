@@ -0,0 +1,261 @@
+"""
+================================================================================
+INGESTÃO PNAD CONTÍNUA - MICRODADOS TRIMESTRAIS (LARGURA FIXA)
+Leitura em chunks + Pesos amostrais + Agregados trimestrais e anuais
+================================================================================
+
+Gera a partir dos microdados do IBGE as séries que hoje estão digitadas à mão:
+P10/P50/P90 do rendimento, Gini e taxa de desemprego.
+
+Entrada (disco local):
+- PNADC_TTAAAA.txt            → microdados trimestrais (largura fixa)
+- input_PNADC_trimestral.txt  → layout SAS distribuído pelo IBGE (@pos var $larg.)
+- deflatores (opcional)       → CSV ano,trimestre,uf,deflator (R$ de 2012)
+
+Nenhum arquivo é carregado inteiro: cada chunk é reduzido a uma tabela de
+frequência ponderada (grupo × valor do rendimento → soma dos pesos), que é
+pequena e exata para quantis e Gini.
+
+Para rodar:
+    python ingestao_pnad.py
+================================================================================
+"""
+
+import glob
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from quantis_ponderados import quantis_ponderados_por_grupo
+
+# ============================================================================
+# CONFIGURAÇÃO
+# ============================================================================
+
+DIRETORIO_MICRODADOS = '../dados/pnad_microdados'
+ARQUIVO_LAYOUT = os.path.join(DIRETORIO_MICRODADOS, 'input_PNADC_trimestral.txt')
+ARQUIVO_DEFLATORES = os.path.join(DIRETORIO_MICRODADOS, 'deflatores.csv')
+PADRAO_ARQUIVOS = 'PNADC_*.txt'
+TAMANHO_CHUNK = 250_000
+
+# Variáveis do dicionário IBGE → nomes usados no projeto
+VARIAVEIS = {
+    'Ano': 'ano',
+    'Trimestre': 'trimestre',
+    'UF': 'uf',
+    'V1028': 'peso',             # Peso do domicílio e pessoas (com calibração)
+    'V2007': 'sexo',             # 1 = homem, 2 = mulher
+    'VD4002': 'ocupacao',        # 1 = ocupado, 2 = desocupado
+    'VD4010': 'atividade',       # Grupamento de atividade do trabalho principal
+    'VD4020': 'rendimento',      # Rendimento mensal efetivo de todos os trabalhos
+}
+
+# Chaves das tabelas de frequência (agregados saem de qualquer subconjunto)
+GRUPOS = ['ano', 'trimestre', 'uf', 'sexo', 'atividade']
+
+# Segmentação publicada em percentis_rendimento_segmentos.csv
+SEGMENTOS = ['ano', 'uf', 'sexo', 'atividade']
+
+PERCENTIS = [10, 50, 90]
+
+# ============================================================================
+# LAYOUT E LEITURA EM CHUNKS
+# ============================================================================
+
+_LINHA_LAYOUT = re.compile(r'@(\d+)\s+(\w+)\s+\$?(\d+)\.')
+
+
+def ler_layout(caminho=ARQUIVO_LAYOUT):
+    """
+    Lê o layout SAS do IBGE (linhas '@0001 Ano $4.') → {variável: (início, fim)}
+
+    As posições seguem a convenção de pd.read_fwf (base 0, fim exclusivo).
+    """
+    layout = {}
+    with open(caminho, encoding='latin-1') as f:
+        for linha in f:
+            achado = _LINHA_LAYOUT.search(linha)
+            if achado:
+                posicao, nome, largura = achado.groups()
+                inicio = int(posicao) - 1
+                layout[nome] = (inicio, inicio + int(largura))
+    return layout
+
+
+def ler_microdados_em_chunks(arquivo, layout, variaveis=VARIAVEIS, tamanho_chunk=TAMANHO_CHUNK):
+    """
+    Itera sobre o arquivo de largura fixa em DataFrames de `tamanho_chunk` linhas
+
+    Só as colunas de `variaveis` são lidas, já renomeadas e numéricas.
+    """
+    faltando = [v for v in variaveis if v not in layout]
+    if faltando:
+        raise KeyError(f"Variáveis ausentes no layout: {faltando}")
+
+    leitor = pd.read_fwf(arquivo, colspecs=[layout[v] for v in variaveis],
+                         names=list(variaveis.values()), header=None,
+                         dtype=np.float64, chunksize=tamanho_chunk)
+    for chunk in leitor:
+        yield chunk
+
+# ============================================================================
+# REDUÇÃO DE CADA CHUNK
+# ============================================================================
+
+def reduzir_chunk(chunk, grupos=GRUPOS):
+    """
+    Reduz um chunk às tabelas de frequência ponderada
+
+    Retorna:
+    --------
+    (renda, forca) - renda: grupos + rendimento → peso (ocupados com renda > 0)
+                     forca: grupos + ocupacao → peso (ocupados e desocupados)
+    """
+    ocupados_com_renda = chunk[(chunk['ocupacao'] == 1) & (chunk['rendimento'] > 0)]
+    renda = (ocupados_com_renda.groupby(grupos + ['rendimento'], sort=False, dropna=False)['peso']
+             .sum().reset_index())
+
+    # Desocupados não têm atividade: a força de trabalho não é aberta por ela
+    grupos_forca = [g for g in grupos if g != 'atividade']
+    forca = (chunk[chunk['ocupacao'].isin([1, 2])]
+             .groupby(grupos_forca + ['ocupacao'], sort=False)['peso'].sum().reset_index())
+
+    return renda, forca
+
+
+def _consolidar(tabelas, chaves):
+    if not tabelas:
+        return pd.DataFrame(columns=chaves + ['peso'])
+    return (pd.concat(tabelas, ignore_index=True)
+            .groupby(chaves, sort=False, dropna=False)['peso'].sum().reset_index())
+
+
+def ingerir_arquivos(arquivos, layout, grupos=GRUPOS, tamanho_chunk=TAMANHO_CHUNK,
+                     consolidar_a_cada=20):
+    """
+    Lê todos os arquivos em chunks e acumula as tabelas de frequência
+
+    A cada `consolidar_a_cada` chunks as tabelas parciais são somadas, então a
+    memória fica limitada ao tamanho das tabelas (não ao dos microdados).
+    """
+    chaves_renda = grupos + ['rendimento']
+    chaves_forca = [g for g in grupos if g != 'atividade'] + ['ocupacao']
+    renda, forca = [], []
+
+    for arquivo in arquivos:
+        print(f"  Lendo {os.path.basename(arquivo)}...")
+        for chunk in ler_microdados_em_chunks(arquivo, layout, tamanho_chunk=tamanho_chunk):
+            parcial_renda, parcial_forca = reduzir_chunk(chunk, grupos)
+            renda.append(parcial_renda)
+            forca.append(parcial_forca)
+            if len(renda) >= consolidar_a_cada:
+                renda = [_consolidar(renda, chaves_renda)]
+                forca = [_consolidar(forca, chaves_forca)]
+
+    return _consolidar(renda, chaves_renda), _consolidar(forca, chaves_forca)
+
+
+def aplicar_deflatores(renda, caminho=ARQUIVO_DEFLATORES):
+    """
+    Converte o rendimento para R$ de 2012 (rendimento × deflator)
+
+    O CSV tem colunas ano, trimestre, uf, deflator. Sem arquivo, mantém nominal.
+    """
+    if not os.path.exists(caminho):
+        print("  ⚠️ Sem arquivo de deflatores: rendimentos em valores nominais")
+        return renda
+
+    deflatores = pd.read_csv(caminho)
+    chaves = [c for c in ['ano', 'trimestre', 'uf'] if c in deflatores.columns and c in renda.columns]
+    renda = renda.merge(deflatores[chaves + ['deflator']], on=chaves, how='left', validate='m:1')
+    if renda['deflator'].isna().any():
+        raise ValueError("Deflator ausente para algum grupo dos microdados")
+    renda['rendimento'] = renda['rendimento'] * renda.pop('deflator')
+    return renda
+
+# ============================================================================
+# AGREGADOS: PERCENTIS, GINI E DESEMPREGO
+# ============================================================================
+
+def agregar_desemprego(forca, chaves):
+    """Taxa de desemprego ponderada: desocupados / (ocupados + desocupados)"""
+    pesos_forca = forca.pivot_table(index=chaves, columns='ocupacao', values='peso',
+                                    aggfunc='sum', fill_value=0)
+    taxa = pesos_forca[2] / (pesos_forca[1] + pesos_forca[2]) * 100
+    return taxa.rename('desemprego').reset_index()
+
+
+def agregar(renda, forca, chaves, percentis=PERCENTIS):
+    """
+    Calcula percentis ponderados, Gini e desemprego por `chaves`
+
+    Parâmetros:
+    -----------
+    renda, forca : DataFrame - Tabelas de frequência de ingerir_arquivos
+    chaves : list - Nível de agregação (p.ex. ['ano', 'trimestre'])
+    percentis : list - Percentis (0-100)
+
+    Retorna:
+    --------
+    DataFrame - chaves + p10, p50, p90, gini, desemprego
+    """
+    tabela = quantis_ponderados_por_grupo(renda, 'rendimento', 'peso', chaves,
+                                          percentis, incluir_gini=True)
+    if not set(chaves) <= set(forca.columns):
+        return tabela  # desemprego não se define por atividade (desocupados não têm)
+    return tabela.merge(agregar_desemprego(forca, chaves), on=chaves, how='left')
+
+
+def agregar_anual(renda, forca, percentis=PERCENTIS):
+    """
+    Agregados anuais: percentis/Gini sobre os trimestres empilhados e
+    desemprego como média das taxas trimestrais (convenção do IBGE)
+    """
+    tabela = agregar(renda, forca, ['ano'], percentis).drop(columns='desemprego')
+    taxas = agregar_desemprego(forca, ['ano', 'trimestre'])
+    anual = taxas.groupby('ano')['desemprego'].mean().reset_index()
+    return tabela.merge(anual, on='ano', how='left')
+
+# ============================================================================
+# MAIN: GERAR SÉRIES A PARTIR DOS MICRODADOS
+# ============================================================================
+
+if __name__ == '__main__':
+    print("="*80)
+    print("INGESTÃO PNAD CONTÍNUA - MICRODADOS TRIMESTRAIS")
+    print("="*80)
+
+    arquivos = sorted(glob.glob(os.path.join(DIRETORIO_MICRODADOS, PADRAO_ARQUIVOS)))
+    if not arquivos:
+        raise SystemExit(f"Nenhum arquivo {PADRAO_ARQUIVOS} em {DIRETORIO_MICRODADOS}")
+
+    layout = ler_layout(ARQUIVO_LAYOUT)
+    renda, forca = ingerir_arquivos(arquivos, layout)
+    renda = aplicar_deflatores(renda)
+
+    trimestral = agregar(renda, forca, ['ano', 'trimestre'])
+    anual = agregar_anual(renda, forca)
+    segmentos = agregar(renda.dropna(subset=SEGMENTOS), forca, SEGMENTOS)
+
+    for tabela in (trimestral, anual, segmentos):
+        for p in PERCENTIS:
+            tabela[f'p{p}'] = tabela[f'p{p}'].round().astype(int)
+        tabela['gini'] = tabela['gini'].round(3)
+        if 'desemprego' in tabela:
+            tabela['desemprego'] = tabela['desemprego'].round(1)
+        for chave in set(GRUPOS) & set(tabela.columns):
+            tabela[chave] = tabela[chave].astype(int)
+
+    anual[['ano'] + [f'p{p}' for p in PERCENTIS]].to_csv('../dados/percentis_rendimento.csv', index=False)
+    anual.to_csv('../dados/pnad_indicadores_anuais.csv', index=False)
+    trimestral.to_csv('../dados/pnad_indicadores_trimestrais.csv', index=False)
+    segmentos.to_csv('../dados/percentis_rendimento_segmentos.csv', index=False)
+
+    print(f"\n✅ {len(arquivos)} arquivos processados")
+    print("\nArquivos gerados:")
+    print("  - percentis_rendimento.csv")
+    print("  - pnad_indicadores_anuais.csv")
+    print("  - pnad_indicadores_trimestrais.csv")
+    print("  - percentis_rendimento_segmentos.csv")
@@ -0,0 +1,122 @@
+"""
+================================================================================
+JANELAS MÓVEIS - MÉDIA, VOLATILIDADE E REGRESSÃO INCREMENTAIS
+Janela deslizante | Janela expansiva → várias séries de uma vez
+================================================================================
+
+Em vez de recalcular np.std ou refazer a regressão em cada janela, as
+estatísticas vêm de somas (n, Σx, Σy, Σx², Σxy, Σy²) atualizadas de forma
+incremental: ao deslizar, a janela soma a observação que entra e subtrai a
+que sai, o que equivale à diferença de duas somas acumuladas. Cada janela
+custa O(1), qualquer que seja o tamanho, e tudo é vetorizado em séries
+empilhadas (m × n), p.ex. séries mensais das 27 UFs.
+
+As somas acumuladas são as de quebras_estruturais (séries centradas antes,
+para não perder precisão em séries longas com nível alto).
+
+Resultados alinhados à direita (como pandas .rolling): a posição t resume
+a janela que termina em t; posições sem janela completa ficam NaN.
+
+Uso:
+    from janelas_moveis import estatisticas_moveis
+    moveis = estatisticas_moveis(p50, janela=5, x=desemprego)
+    moveis['volatilidade'], moveis['inclinacao']
+================================================================================
+"""
+
+import numpy as np
+
+from quebras_estruturais import somas_acumuladas
+
+# ============================================================================
+# ESTATÍSTICAS A PARTIR DAS SOMAS DA JANELA
+# ============================================================================
+
+def _estatisticas(somas, inicio, fim, medias, ddof, com_regressor):
+    # Somas da janela [inicio, fim): diferença das somas acumuladas (O(1))
+    d = {chave: acumulada[..., fim] - acumulada[..., inicio]
+         for chave, acumulada in somas.items()}
+    media_x, media_y = medias
+    n = d['n']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        syy = np.maximum(d['yy'] - d['y'] ** 2 / n, 0.0)
+        resultado = {
+            'n': n,
+            'media': d['y'] / n + media_y,
+            'volatilidade': np.sqrt(np.where(n > ddof, syy / (n - ddof), np.nan)),
+        }
+        if com_regressor:
+            sxx = np.maximum(d['xx'] - d['x'] ** 2 / n, 0.0)
+            sxy = d['xy'] - d['x'] * d['y'] / n
+            variavel = sxx > 1e-12 * np.maximum(d['xx'], 1)
+            inclinacao = np.where(variavel, sxy / sxx, np.nan)
+            # Intercepto na escala original: y = a + b·x
+            resultado['inclinacao'] = inclinacao
+            resultado['intercepto'] = (d['y'] / n + media_y
+                                       - inclinacao * (d['x'] / n + media_x))
+            resultado['correlacao'] = np.where(variavel & (syy > 0),
+                                               sxy / np.sqrt(sxx * syy), np.nan)
+    return resultado
+
+
+def _preparar(y, x):
+    y = np.asarray(y, dtype=np.float64)
+    com_regressor = x is not None
+    x = np.zeros(y.shape[-1]) if x is None else np.asarray(x, dtype=np.float64)
+    medias = (x.mean(axis=-1, keepdims=True), y.mean(axis=-1, keepdims=True))
+    return somas_acumuladas(x, y), medias, com_regressor, y.shape[-1]
+
+
+def _alinhar(resultado, n, primeira):
+    # Preenche com NaN as posições antes da primeira janela completa
+    alinhado = {}
+    for chave, valores in resultado.items():
+        saida = np.full(valores.shape[:-1] + (n,), np.nan)
+        saida[..., primeira:] = valores
+        alinhado[chave] = saida
+    return alinhado
+
+# ============================================================================
+# API PRINCIPAL
+# ============================================================================
+
+def estatisticas_moveis(y, janela, x=None, ddof=0):
+    """
+    Média, volatilidade e regressão de y em x em janelas deslizantes
+
+    Parâmetros:
+    -----------
+    y : array (n,) ou (m, n) - Séries (p.ex. variação anual, salário)
+    janela : int - Observações por janela
+    x : array (n,) ou (m, n) opcional - Regressor (p.ex. desemprego); sem x
+        só média e volatilidade são calculadas
+    ddof : int - Graus de liberdade da volatilidade (0 = np.std, 1 = pandas)
+
+    Retorna:
+    --------
+    dict - 'n', 'media', 'volatilidade' e, com x, 'inclinacao',
+           'intercepto', 'correlacao'; cada um (..., n), NaN nas primeiras
+           janela-1 posições
+    """
+    somas, medias, com_regressor, n = _preparar(y, x)
+    if not 1 <= janela <= n:
+        raise ValueError(f"janela deve estar entre 1 e {n}")
+    inicio = np.arange(n - janela + 1)
+    resultado = _estatisticas(somas, inicio, inicio + janela, medias, ddof, com_regressor)
+    return _alinhar(resultado, n, janela - 1)
+
+
+def estatisticas_expansivas(y, x=None, ddof=0, minimo=2):
+    """
+    Mesmas estatísticas de estatisticas_moveis em janelas expansivas
+
+    A janela começa na primeira observação e cresce até o fim da série;
+    posições com menos de `minimo` observações ficam NaN.
+    """
+    somas, medias, com_regressor, n = _preparar(y, x)
+    if not 1 <= minimo <= n:
+        raise ValueError(f"minimo deve estar entre 1 e {n}")
+    fim = np.arange(minimo, n + 1)
+    resultado = _estatisticas(somas, np.zeros_like(fim), fim, medias, ddof, com_regressor)
+    return _alinhar(resultado, n, minimo - 1)
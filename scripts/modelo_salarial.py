@@ -0,0 +1,306 @@
+"""
+================================================================================
+MODELO SALARIAL - ELASTICIDADES E SIMULAÇÃO 2026
+Modelo compilado uma vez → avaliação vetorizada, memo e decomposição
+================================================================================
+
+As elasticidades ficam em um único objeto, ModeloSalarial, construído uma
+vez: os coeficientes e referências viram vetores na ordem de DRIVERS e os
+termos são pré-ordenados na ordem de soma da fórmula original
+    impacto = e_desemp·(desemprego - 6.6) + e_pib·pib + e_sm·sm_real
+              + e_infl·(inflacao - 3.0)
+    salário = base · (1 + impacto/100)
+então todas as avaliações (escalar, lote, superfície) são idênticas bit a
+bit. Dashboard, simulador e scripts de previsão usam a mesma instância,
+MODELO_PADRAO, que é chamável como os modelos vetorizados (modelo=...).
+
+Uso:
+    from modelo_salarial import MODELO_PADRAO
+    MODELO_PADRAO(desemprego, pib, inflacao, sm_real)          # lote
+    MODELO_PADRAO.avaliar_cenario(9.0, 1.0, 6.0, 2.0)          # escalar, memo
+    MODELO_PADRAO.impactos(desemprego, pib, inflacao, sm_real) # pp por fator
+    MODELO_PADRAO.superficie(eixos)                            # grade completa
+    ModeloSalarial(elasticidades={'pib': 0.5})                 # variante
+================================================================================
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# PARÂMETROS DO MODELO
+# ============================================================================
+
+# Base
+SALARIO_BASE_2024 = 930
+
+# Elasticidades (baseadas na análise de regressão)
+ELASTICIDADE_DESEMPREGO = -2.0  # Cada 1pp desemprego → -2% salário
+ELASTICIDADE_PIB = 0.3          # Cada 1% PIB → +0.3% salário
+ELASTICIDADE_SM = 0.4           # SM explica 40% do movimento de P50
+ELASTICIDADE_INFLACAO = -0.5    # Inflação acima meta corrói ganhos
+
+# Pontos de referência
+DESEMPREGO_REFERENCIA = 6.6     # Desemprego 2024
+META_INFLACAO = 3.0             # Meta de inflação
+
+# Colunas esperadas quando os drivers vêm em um DataFrame
+DRIVERS = ['desemprego', 'pib', 'inflacao', 'sm_real']
+
+# Os mesmos parâmetros por driver (entrada de ModeloSalarial)
+ELASTICIDADES = {
+    'desemprego': ELASTICIDADE_DESEMPREGO,
+    'pib': ELASTICIDADE_PIB,
+    'inflacao': ELASTICIDADE_INFLACAO,
+    'sm_real': ELASTICIDADE_SM,
+}
+REFERENCIAS = {
+    'desemprego': DESEMPREGO_REFERENCIA,
+    'pib': 0.0,
+    'inflacao': META_INFLACAO,
+    'sm_real': 0.0,
+}
+
+# Ordem de soma dos impactos (a da versão escalar original)
+ORDEM_SOMA = ['desemprego', 'pib', 'sm_real', 'inflacao']
+
+# Cenários escalares memorizados por instância (avaliar_cenario)
+TAMANHO_MEMO = 4096
+
+# ============================================================================
+# MODELO COMPILADO
+# ============================================================================
+
+class ModeloSalarial:
+    """
+    Modelo de elasticidades construído uma vez e reutilizado
+
+    Parâmetros:
+    -----------
+    elasticidades : dict opcional - driver → elasticidade (sobrepõe ELASTICIDADES)
+    referencias : dict opcional - driver → ponto de referência (sobrepõe REFERENCIAS)
+    base : float - Salário base 2024
+
+    Atributos:
+    ----------
+    coeficientes : ndarray (4,) - Elasticidades na ordem de DRIVERS
+    referencias : ndarray (4,) - Referências na ordem de DRIVERS
+    base : float - Salário base 2024
+    avaliar_escalar : callable - Um cenário escalar (desemprego, pib,
+                      inflacao, sm_real, base=None) → salário
+    avaliar_cenario : callable - avaliar_escalar com memo LRU (TAMANHO_MEMO
+                      cenários), para consultas repetidas
+    """
+
+    def __init__(self, elasticidades=None, referencias=None, base=SALARIO_BASE_2024):
+        elasticidades = {**ELASTICIDADES, **(elasticidades or {})}
+        referencias = {**REFERENCIAS, **(referencias or {})}
+        desconhecidos = (set(elasticidades) | set(referencias)) - set(DRIVERS)
+        if desconhecidos:
+            raise KeyError(f"Drivers desconhecidos: {sorted(desconhecidos)}")
+
+        self.base = base
+        self.coeficientes = np.array([elasticidades[d] for d in DRIVERS], dtype=np.float64)
+        self.referencias = np.array([referencias[d] for d in DRIVERS], dtype=np.float64)
+        self.coeficientes.flags.writeable = False
+        self.referencias.flags.writeable = False
+
+        # Termos pré-ordenados: (posição em DRIVERS, referência, coeficiente);
+        # referência None = termo sem subtração (mesmas operações da fórmula)
+        self._termos = tuple(
+            (DRIVERS.index(d), referencias[d] or None, elasticidades[d]) for d in ORDEM_SOMA)
+        self.avaliar_escalar = self._compilar_escalar()
+        self.avaliar_cenario = lru_cache(maxsize=TAMANHO_MEMO)(self.avaliar_escalar)
+
+    def __reduce__(self):
+        # Recria o modelo (e um memo vazio) ao enviar a workers de processo
+        return (ModeloSalarial, (dict(zip(DRIVERS, self.coeficientes.tolist())),
+                                 dict(zip(DRIVERS, self.referencias.tolist())), self.base))
+
+    def __repr__(self):
+        termos = ', '.join(f"{d}={c:+g}" for d, c in zip(DRIVERS, self.coeficientes))
+        return f"ModeloSalarial({termos}, base={self.base})"
+
+    # ------------------------------------------------------------------------
+    # Avaliação
+    # ------------------------------------------------------------------------
+
+    def _compilar_escalar(self):
+        """Versão escalar com os coeficientes fixos em variáveis locais (x - 0.0 == x)"""
+        e_desemp, e_pib, e_infl, e_sm = self.coeficientes.tolist()
+        r_desemp, r_pib, r_infl, r_sm = self.referencias.tolist()
+        base_padrao = self.base
+
+        def avaliar_escalar(desemprego, pib, inflacao, sm_real, base=None):
+            # Mesma ordem de soma de ORDEM_SOMA
+            impacto_total = (e_desemp * (desemprego - r_desemp) + e_pib * (pib - r_pib)
+                             + e_sm * (sm_real - r_sm) + e_infl * (inflacao - r_infl))
+            return (base_padrao if base is None else base) * (1 + impacto_total/100)
+
+        return avaliar_escalar
+
+    def avaliar(self, desemprego, pib=None, inflacao=None, sm_real=None, base=None, out=None):
+        """
+        Salário 2026 de milhões de cenários (vetorizado)
+
+        As contas são feitas in-place sobre `out` e um único buffer auxiliar,
+        para limitar a memória em 10^8 draws.
+
+        Parâmetros:
+        -----------
+        desemprego : array ou DataFrame - Taxa de desemprego (%), ou um DataFrame
+                     com as colunas 'desemprego', 'pib', 'inflacao' e 'sm_real'
+        pib : array - Crescimento PIB (%)
+        inflacao : array - Inflação anual (%)
+        sm_real : array - Ganho real salário mínimo (%)
+        base : float ou array opcional - Salário base (padrão self.base)
+        out : ndarray float64 opcional - Buffer de saída pré-alocado
+
+        Retorna:
+        --------
+        ndarray - Salários projetados 2026 (formato do broadcast das entradas)
+        """
+        if isinstance(desemprego, pd.DataFrame):
+            if pib is not None or inflacao is not None or sm_real is not None:
+                raise ValueError("Passe um DataFrame OU arrays separados, não ambos")
+            faltando = [c for c in DRIVERS if c not in desemprego.columns]
+            if faltando:
+                raise KeyError(f"Colunas ausentes no DataFrame: {faltando}")
+            desemprego, pib, inflacao, sm_real = (desemprego[c].to_numpy() for c in DRIVERS)
+        elif pib is None or inflacao is None or sm_real is None:
+            raise ValueError("Informe desemprego, pib, inflacao e sm_real")
+
+        valores = [np.asarray(x, dtype=np.float64) for x in (desemprego, pib, inflacao, sm_real)]
+        forma = np.broadcast_shapes(*(x.shape for x in valores))
+        if out is None:
+            out = np.empty(forma, dtype=np.float64)
+        elif out.shape != forma or out.dtype != np.float64:
+            raise ValueError(f"`out` deve ser float64 com formato {forma}")
+        aux = np.empty(forma, dtype=np.float64)
+
+        # impacto_total = soma dos termos na ordem de ORDEM_SOMA
+        for i, (posicao, referencia, coeficiente) in enumerate(self._termos):
+            destino = out if i == 0 else aux
+            if referencia is None:
+                np.multiply(valores[posicao], coeficiente, out=destino)
+            else:
+                np.subtract(valores[posicao], referencia, out=destino)
+                np.multiply(destino, coeficiente, out=destino)
+            if i:
+                np.add(out, aux, out=out)
+
+        # base * (1 + impacto_total/100)
+        np.divide(out, 100, out=out)
+        np.add(out, 1, out=out)
+        np.multiply(out, self.base if base is None else base, out=out)
+
+        return out
+
+    __call__ = avaliar
+
+    # ------------------------------------------------------------------------
+    # Decomposição
+    # ------------------------------------------------------------------------
+
+    def impactos(self, desemprego, pib, inflacao, sm_real):
+        """
+        Contribuição de cada fator (pontos percentuais) no salário 2026
+
+        Cada componente depende só do seu driver, então os arrays podem ter
+        tamanhos diferentes (p.ex. os eixos de uma grade).
+
+        Retorna:
+        --------
+        dict - driver → array de impactos (pp), na ordem de ORDEM_SOMA
+        """
+        valores = (desemprego, pib, inflacao, sm_real)
+        impactos = {}
+        for posicao, referencia, coeficiente in self._termos:
+            x = np.asarray(valores[posicao], dtype=np.float64)
+            impactos[DRIVERS[posicao]] = coeficiente * (x if referencia is None else x - referencia)
+        return impactos
+
+    def superficie(self, eixos):
+        """
+        Impactos e salários em todas as combinações dos eixos
+
+        Parâmetros:
+        -----------
+        eixos : dict - driver → valores (1-D), com os quatro DRIVERS
+
+        Retorna:
+        --------
+        dict - 'eixos', 'impactos' (por eixo), 'impacto_total' e 'salario'
+               (tensores desemprego × pib × inflacao × sm_real)
+        """
+        eixos = {d: np.asarray(eixos[d], dtype=np.float64) for d in DRIVERS}
+        impactos = self.impactos(**eixos)
+        grade = np.ix_(*eixos.values())
+
+        impacto_total = None
+        for nome, impacto in impactos.items():
+            impacto = impacto.reshape(grade[DRIVERS.index(nome)].shape)
+            impacto_total = impacto if impacto_total is None else impacto_total + impacto
+        return {'eixos': eixos, 'impactos': impactos,
+                'impacto_total': impacto_total,
+                'salario': self.avaliar(*grade)}
+
+
+# Instância compartilhada (parâmetros deste módulo)
+MODELO_PADRAO = ModeloSalarial()
+
+# ============================================================================
+# FUNÇÃO: SIMULAR SALÁRIO 2026
+# ============================================================================
+
+def simular_salario_2026(desemprego, pib, inflacao, sm_real, base=SALARIO_BASE_2024):
+    """
+    Simula salário 2026 baseado em drivers macroeconômicos
+
+    Parâmetros:
+    -----------
+    desemprego : float - Taxa de desemprego (%)
+    pib : float - Crescimento PIB (%)
+    inflacao : float - Inflação anual (%)
+    sm_real : float - Ganho real salário mínimo (%)
+    base : float - Salário base 2024
+
+    Retorna:
+    --------
+    float - Salário projetado 2026
+    """
+    return MODELO_PADRAO.avaliar_escalar(desemprego, pib, inflacao, sm_real, base)
+
+# ============================================================================
+# FUNÇÃO: SIMULAR SALÁRIO 2026 EM LOTE (VETORIZADA)
+# ============================================================================
+
+def simular_salario_2026_lote(desemprego, pib=None, inflacao=None, sm_real=None,
+                              base=SALARIO_BASE_2024, out=None):
+    """
+    Versão vetorizada de simular_salario_2026 para milhões de cenários
+
+    Aplica exatamente as mesmas operações da versão escalar, na mesma ordem,
+    então os resultados são idênticos bit a bit (ver ModeloSalarial.avaliar).
+
+    Retorna:
+    --------
+    ndarray - Salários projetados 2026 (formato do broadcast das entradas)
+    """
+    return MODELO_PADRAO.avaliar(desemprego, pib, inflacao, sm_real, base=base, out=out)
+
+# ============================================================================
+# DECOMPOSIÇÃO DO IMPACTO POR FATOR
+# ============================================================================
+
+def decompor_impactos_lote(desemprego, pib, inflacao, sm_real):
+    """
+    Contribuição de cada fator (pontos percentuais) no salário 2026
+
+    Retorna:
+    --------
+    dict - 'desemprego', 'pib', 'sm_real', 'inflacao' → array de impactos (pp)
+    """
+    return MODELO_PADRAO.impactos(desemprego, pib, inflacao, sm_real)
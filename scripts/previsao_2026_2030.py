@@ -8,20 +8,45 @@ Múltiplos modelos + Cenários + Intervalos de confiança
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
-from scipy import stats
+from acesso_dados import series
+from backtesting import backtest, modelos_padrao
+from cenarios import avaliar_cenarios, carregar_cenarios, expandir_cenarios
+from frequencias import PERIODOS_POR_ANO, agregar, tempo_continuo, tempo_medio_anual
+from modelo_salarial import DRIVERS, MODELO_PADRAO
+from previsao_modelos import selecionar_modelos
+from regressao_linear import ajustar_mqo, prever_mqo
 import warnings
 warnings.filterwarnings('ignore')
 
+# Frequência dos dados históricos ('anual', 'trimestral' ou 'mensal'); as
+# previsões e os cenários continuam anuais
+FREQUENCIA = 'anual'
+
+# Cenários: definições em dados/<ARQUIVO_CENARIOS>.csv; pesos do usuário
+# (None = probabilidades do arquivo; p.ex. {'Pessimista': 0.3, 'Base': 0.5,
+# 'Otimista': 0.2}) e trajetórias perturbadas por cenário para os quantis
+ARQUIVO_CENARIOS = 'cenarios_2025_2030'
+PESOS_CENARIOS = None
+TRAJETORIAS_POR_CENARIO = 2000
+CENARIO_DRIVERS = 'Base'  # Drivers futuros da regressão na seleção automática
+
+# Seleção automática de modelos: 'aicc' ou 'validacao' (MAE nos últimos
+# períodos) e processos do ajuste dos candidatos (None = todos os núcleos)
+CRITERIO_SELECAO = 'aicc'
+N_WORKERS = 1
+
+# Backtesting com origem móvel: passos à frente avaliados (na frequência dos
+# dados) e observações do primeiro ajuste
+HORIZONTE_BACKTEST = 6
+ORIGEM_MINIMA_BACKTEST = 6
+
 # ============================================================================
 # DADOS HISTÓRICOS
 # ============================================================================
 
-anos_historico = np.array([2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019, 
-                           2020, 2021, 2022, 2023, 2024])
-
-p50_historico = np.array([805, 829, 865, 834, 836, 851, 863, 852, 
-                          880, 810, 831, 872, 930])
+# tempo = ano contínuo (2012.0, 2012.25, ...): tendências em R$/ano
+tempo_historico, p50_historico = series('tempo', 'p50', frequencia=FREQUENCIA)
+periodos_por_ano = PERIODOS_POR_ANO[FREQUENCIA]
 
 # ============================================================================
 # MODELO 1: TENDÊNCIA LINEAR (2012-2024)
@@ -34,33 +59,21 @@ print("="*80)
 # Anos para prever
 anos_futuros = np.array([2025, 2026, 2027, 2028, 2029, 2030])
 
-# Modelo linear completo
-X_hist = anos_historico.reshape(-1, 1)
-y_hist = p50_historico
-
-model_total = LinearRegression()
-model_total.fit(X_hist, y_hist)
-
-# Previsão
-X_fut = anos_futuros.reshape(-1, 1)
-previsao_linear = model_total.predict(X_fut)
-
-# Intervalo de confiança
-n = len(y_hist)
-y_pred_hist = model_total.predict(X_hist)
-residuos = y_hist - y_pred_hist
-std_residuos = np.std(residuos)
+# Modelos lineares: histórico completo e últimos 3 anos (2022-2024) em um
+# único ajuste, um subconjunto de anos por linha
+recente = np.arange(len(tempo_historico)) >= len(tempo_historico) - 3 * periodos_por_ano
+ajustes = ajustar_mqo(tempo_historico, p50_historico, mascara=[np.ones_like(recente), recente])
+crescimento_total, crescimento_recente = ajustes['coeficientes'][:, 1]
 
-# IC 95%
-t_crit = stats.t.ppf(0.975, n-2)
-margem_erro = t_crit * std_residuos * np.sqrt(1 + 1/n + (X_fut - X_hist.mean())**2 / ((X_hist - X_hist.mean())**2).sum())
-
-ic_lower = previsao_linear - margem_erro.flatten()
-ic_upper = previsao_linear + margem_erro.flatten()
+# Previsão com intervalo de predição 95% (t com n-2 graus de liberdade), no
+# tempo médio de cada ano (= média anual da tendência em qualquer frequência)
+previsoes = prever_mqo(ajustes, tempo_medio_anual(anos_futuros, FREQUENCIA))
+previsao_linear, previsao_recente = previsoes['previsao']
+ic_lower, ic_upper = previsoes['inferior'][0], previsoes['superior'][0]
 
 print("\n1. MODELO LINEAR (TENDÊNCIA 2012-2024)")
 print("-" * 60)
-print(f"Crescimento médio: R${model_total.coef_[0]:.2f}/ano")
+print(f"Crescimento médio: R${crescimento_total:.2f}/ano")
 print(f"\nPrevisões:")
 for i, ano in enumerate(anos_futuros):
     print(f"  {ano}: R${previsao_linear[i]:.0f} (IC 95%: R${ic_lower[i]:.0f} - R${ic_upper[i]:.0f})")
@@ -69,21 +82,11 @@ for i, ano in enumerate(anos_futuros):
 # MODELO 2: TENDÊNCIA RECENTE (2022-2024)
 # ============================================================================
 
-# Usar apenas período recente
-anos_recente = anos_historico[-3:]
-p50_recente = p50_historico[-3:]
-
-X_rec = anos_recente.reshape(-1, 1)
-y_rec = p50_recente
-
-model_recente = LinearRegression()
-model_recente.fit(X_rec, y_rec)
-
-previsao_recente = model_recente.predict(X_fut)
+# Ajustado junto com o modelo 1 (mesma chamada, só os últimos 3 anos)
 
 print("\n2. MODELO RECENTE (TENDÊNCIA 2022-2024)")
 print("-" * 60)
-print(f"Crescimento médio: R${model_recente.coef_[0]:.2f}/ano")
+print(f"Crescimento médio: R${crescimento_recente:.2f}/ano")
 print(f"\nPrevisões:")
 for i, ano in enumerate(anos_futuros):
     print(f"  {ano}: R${previsao_recente[i]:.0f}")
@@ -96,61 +99,30 @@ print("\n3. CENÁRIOS MACROECONÔMICOS")
 print("-" * 60)
 
 # Base: 2024
-base_2024 = 930
-
-# Cenário Pessimista
-# Premissas: desemprego sobe para 10%, inflação 7%, PIB +0.5%
-# Impacto: perde ~7pp (componente conjuntural)
-cenario_pessimista = {
-    2025: base_2024 * 0.98,  # -2%
-    2026: base_2024 * 0.94,  # -6%
-    2027: base_2024 * 0.92,  # -8%
-    2028: base_2024 * 0.91,  # -9%
-    2029: base_2024 * 0.91,  # -9%
-    2030: base_2024 * 0.92,  # -8% (leve recuperação)
-}
-
-# Cenário Base
-# Premissas: desemprego 7-8%, inflação 5.5%, PIB +2%
-# Impacto: queda moderada, depois estabiliza
-cenario_base = {
-    2025: base_2024 * 1.00,  # estável
-    2026: base_2024 * 0.98,  # -2%
-    2027: base_2024 * 0.97,  # -3%
-    2028: base_2024 * 0.98,  # -2%
-    2029: base_2024 * 0.99,  # -1%
-    2030: base_2024 * 1.00,  # volta ao nível
-}
-
-# Cenário Otimista
-# Premissas: desemprego 5.5%, inflação 4%, PIB +3%
-# Impacto: crescimento retoma
-cenario_otimista = {
-    2025: base_2024 * 1.02,  # +2%
-    2026: base_2024 * 1.05,  # +5%
-    2027: base_2024 * 1.08,  # +8%
-    2028: base_2024 * 1.11,  # +11%
-    2029: base_2024 * 1.14,  # +14%
-    2030: base_2024 * 1.17,  # +17%
-}
-
-print("\nCenário PESSIMISTA (Prob: 30%)")
-print("  Premissas: Desemprego 10%, Inflação 7%, PIB +0.5%")
-for ano in anos_futuros:
-    var = ((cenario_pessimista[ano]/base_2024) - 1) * 100
-    print(f"  {ano}: R${cenario_pessimista[ano]:.0f} ({var:+.1f}% vs 2024)")
-
-print("\nCenário BASE (Prob: 50%)")
-print("  Premissas: Desemprego 7-8%, Inflação 5.5%, PIB +2%")
-for ano in anos_futuros:
-    var = ((cenario_base[ano]/base_2024) - 1) * 100
-    print(f"  {ano}: R${cenario_base[ano]:.0f} ({var:+.1f}% vs 2024)")
-
-print("\nCenário OTIMISTA (Prob: 20%)")
-print("  Premissas: Desemprego 5.5%, Inflação 4%, PIB +3%")
-for ano in anos_futuros:
-    var = ((cenario_otimista[ano]/base_2024) - 1) * 100
-    print(f"  {ano}: R${cenario_otimista[ano]:.0f} ({var:+.1f}% vs 2024)")
+base_2024 = MODELO_PADRAO.base
+
+# Drivers por ano e probabilidade de cada cenário vêm de dados/ (cenarios.py);
+# o salário de cada ano sai do modelo compartilhado (modelo_salarial.MODELO_PADRAO)
+cenarios = carregar_cenarios(ARQUIVO_CENARIOS)
+colunas_anos = np.searchsorted(cenarios['anos'], anos_futuros)
+if not np.array_equal(cenarios['anos'][np.minimum(colunas_anos, len(cenarios['anos']) - 1)],
+                      anos_futuros):
+    raise ValueError(f"{ARQUIVO_CENARIOS}.csv deve cobrir os anos {anos_futuros.tolist()}")
+
+resultado_cenarios = avaliar_cenarios(cenarios, PESOS_CENARIOS, modelo=MODELO_PADRAO)
+salarios_cenarios = resultado_cenarios['salarios'][:, colunas_anos]
+pesos_cenarios = resultado_cenarios['pesos']
+
+for nome, peso, drivers, salarios in zip(cenarios['cenario'], pesos_cenarios,
+                                         cenarios['drivers'][:, colunas_anos], salarios_cenarios):
+    desemprego, pib, inflacao, sm_real = drivers.T
+    print(f"\nCenário {nome.upper()} (Prob: {peso:.0%})")
+    print(f"  Premissas: Desemprego {desemprego.min():.1f}-{desemprego.max():.1f}%, "
+          f"Inflação {inflacao.min():.1f}-{inflacao.max():.1f}%, "
+          f"PIB {pib.min():+.1f} a {pib.max():+.1f}%, SM real {sm_real.min():+.1f} a {sm_real.max():+.1f}%")
+    for ano, salario in zip(anos_futuros, salarios):
+        var = ((salario/base_2024) - 1) * 100
+        print(f"  {ano}: R${salario:.0f} ({var:+.1f}% vs 2024)")
 
 # ============================================================================
 # PREVISÃO ESPERADA (MÉDIA PONDERADA)
@@ -159,15 +131,106 @@ for ano in anos_futuros:
 print("\n4. PREVISÃO ESPERADA (Média Ponderada por Probabilidade)")
 print("-" * 60)
 
-previsao_esperada = {}
-for ano in anos_futuros:
-    esperado = (0.30 * cenario_pessimista[ano] + 
-                0.50 * cenario_base[ano] + 
-                0.20 * cenario_otimista[ano])
-    previsao_esperada[ano] = esperado
+previsao_esperada = resultado_cenarios['esperado'][colunas_anos]
+for ano, esperado in zip(anos_futuros, previsao_esperada):
     var = ((esperado/base_2024) - 1) * 100
     print(f"  {ano}: R${esperado:.0f} ({var:+.1f}% vs 2024)")
 
+# Milhares de trajetórias ao redor de cada cenário, avaliadas em um lote:
+# quantis ponderados e probabilidade de ficar abaixo de 2024
+trajetorias = expandir_cenarios(cenarios, TRAJETORIAS_POR_CENARIO)
+distribuicao = avaliar_cenarios(trajetorias, PESOS_CENARIOS)
+faixa_cenarios = distribuicao['quantis'][:, colunas_anos]
+prob_abaixo_base = distribuicao['tabela']['prob_abaixo_base'].to_numpy()[colunas_anos]
+
+print(f"\n  Distribuição ({len(trajetorias['cenario']):,} trajetórias):")
+for i, ano in enumerate(anos_futuros):
+    print(f"  {ano}: P5 R${faixa_cenarios[0, i]:.0f} | P50 R${faixa_cenarios[1, i]:.0f} | "
+          f"P95 R${faixa_cenarios[2, i]:.0f} | P(abaixo de 2024) = {prob_abaixo_base[i]:.0%}")
+
+# ============================================================================
+# MODELO 5: SELEÇÃO AUTOMÁTICA (p10, p50, p90)
+# ============================================================================
+
+print(f"\n5. SELEÇÃO AUTOMÁTICA DE MODELOS (critério: {CRITERIO_SELECAO})")
+print("-" * 60)
+
+# Tendência, passeio com deriva, ARIMA(1,1,0), ETS (SES, Holt, amortecido) e
+# regressão em desemprego + PIB, ajustados nos três percentis de uma vez
+periodos_historico, p10_historico, p90_historico, desemprego_historico, pib_historico = series(
+    'periodo', 'p10', 'p90', 'desemprego', 'pib_real_indice', frequencia=FREQUENCIA)
+percentis = ['p10', 'p50', 'p90']
+
+# Horizonte na frequência dos dados: do período seguinte ao último até 2030
+ultimo_futuro = pd.Period(str(anos_futuros[-1]), 'Y').asfreq(periodos_historico.freqstr, how='end')
+periodos_futuros = pd.period_range(periodos_historico[-1] + 1, ultimo_futuro,
+                                   freq=periodos_historico.freqstr)
+
+# Drivers futuros do cenário CENARIO_DRIVERS: desemprego do ano de cada
+# período e índice do PIB crescendo à taxa do ano a partir do último valor
+trajetoria = cenarios['drivers'][list(cenarios['cenario']).index(CENARIO_DRIVERS)]
+ano_de = np.searchsorted(cenarios['anos'], np.clip(periodos_futuros.year, cenarios['anos'][0],
+                                                   cenarios['anos'][-1]))
+crescimento = (1 + trajetoria[ano_de, DRIVERS.index('pib')] / 100) ** (1 / periodos_por_ano)
+drivers_futuros = np.column_stack([
+    trajetoria[ano_de, DRIVERS.index('desemprego')],
+    pib_historico[-1] * np.cumprod(crescimento),
+])
+
+selecao = selecionar_modelos(
+    np.stack([p10_historico, p50_historico, p90_historico]), tempo_historico,
+    tempo_continuo(periodos_futuros),
+    drivers=np.column_stack([desemprego_historico, pib_historico]),
+    drivers_futuros=drivers_futuros, criterio=CRITERIO_SELECAO,
+    nomes=percentis, n_workers=N_WORKERS)
+
+# Previsões e limites em médias anuais (aproximação dos limites fora da
+# frequência anual)
+automatico = {}
+for chave in ('previsao', 'inferior', 'superior'):
+    anuais, anos_previstos = agregar(selecao[chave], periodos_futuros, 'anual')
+    automatico[chave] = anuais[:, np.isin(anos_previstos.year, anos_futuros)]
+
+tabela_selecao = selecao['tabela']
+print(tabela_selecao.pivot(index='modelo', columns='serie', values=CRITERIO_SELECAO)
+      .reindex(index=tabela_selecao['modelo'].unique(), columns=percentis)
+      .round(2).to_string())
+for i, percentil in enumerate(percentis):
+    parametros = tabela_selecao.loc[tabela_selecao['escolhido'], 'parametros'].iloc[i]
+    print(f"\n  {percentil}: {selecao['escolhido'][i]} ({parametros})")
+    for j, ano in enumerate(anos_futuros):
+        print(f"    {ano}: R${automatico['previsao'][i, j]:.0f} "
+              f"(IC 95%: R${automatico['inferior'][i, j]:.0f} - R${automatico['superior'][i, j]:.0f})")
+
+tabela_selecao.to_csv('../dados/selecao_modelos_previsao.csv', index=False)
+
+# ============================================================================
+# BACKTESTING (ORIGEM MÓVEL)
+# ============================================================================
+
+print(f"\n6. BACKTESTING: REAJUSTE EM CADA ORIGEM, 1 A {HORIZONTE_BACKTEST} PASSOS")
+print("-" * 60)
+
+# Os modelos 1 e 2 e os candidatos da seleção, reajustados com os dados
+# disponíveis em cada origem; a regressão usa os drivers observados
+avaliacao = backtest(
+    np.stack([p10_historico, p50_historico, p90_historico]), tempo_historico,
+    modelos=modelos_padrao(janela_recente=3 * periodos_por_ano, com_drivers=True),
+    drivers=np.column_stack([desemprego_historico, pib_historico]),
+    horizonte=HORIZONTE_BACKTEST, origem_minima=ORIGEM_MINIMA_BACKTEST,
+    nomes=percentis, n_workers=N_WORKERS)
+
+ranking = avaliacao['ranking']
+print(f"Origens: {len(avaliacao['origens'])} | Placar p50 (média dos horizontes):")
+print(ranking[ranking['serie'] == 'p50'].drop(columns='serie').round(3).to_string(index=False))
+for percentil in percentis:
+    melhor = ranking[ranking['serie'] == percentil].iloc[0]
+    print(f"  {percentil}: melhor = {melhor['modelo']} (MAE R${melhor['mae']:.1f}, "
+          f"cobertura IC 95%: {melhor['cobertura']:.0%})")
+
+avaliacao['metricas'].to_csv('../dados/backtesting_metricas.csv', index=False)
+ranking.to_csv('../dados/backtesting_ranking.csv', index=False)
+
 # ============================================================================
 # SALVAR PREVISÕES
 # ============================================================================
@@ -178,10 +241,16 @@ df_previsoes = pd.DataFrame({
     'linear_recente': previsao_recente.flatten(),
     'ic_95_lower': ic_lower,
     'ic_95_upper': ic_upper,
-    'pessimista': [cenario_pessimista[a] for a in anos_futuros],
-    'base': [cenario_base[a] for a in anos_futuros],
-    'otimista': [cenario_otimista[a] for a in anos_futuros],
-    'esperado': [previsao_esperada[a] for a in anos_futuros]
+    **{nome.lower(): salarios for nome, salarios in zip(cenarios['cenario'], salarios_cenarios)},
+    'esperado': previsao_esperada,
+    'cenarios_p05': faixa_cenarios[0],
+    'cenarios_p50': faixa_cenarios[1],
+    'cenarios_p95': faixa_cenarios[2],
+    'prob_abaixo_2024': prob_abaixo_base,
+    'automatico': automatico['previsao'][1],
+    'automatico_lower': automatico['inferior'][1],
+    'automatico_upper': automatico['superior'][1],
+    'modelo_automatico': selecao['escolhido'][1],
 })
 
 df_previsoes.to_csv('../dados/previsoes_2026_2030.csv', index=False)
@@ -193,7 +262,7 @@ df_previsoes.to_csv('../dados/previsoes_2026_2030.csv', index=False)
 fig, ax = plt.subplots(figsize=(14, 8))
 
 # Histórico
-ax.plot(anos_historico, p50_historico, 'o-', linewidth=3, markersize=8, 
+ax.plot(tempo_historico, p50_historico, 'o-', linewidth=3, markersize=8, 
         label='Histórico (2012-2024)', color='#2E86C1', zorder=5)
 
 # Modelo linear
@@ -204,19 +273,27 @@ ax.plot(anos_futuros, previsao_linear, '--', linewidth=2,
 ax.fill_between(anos_futuros, ic_lower, ic_upper, alpha=0.2, color='gray', 
                 label='Intervalo Confiança 95%')
 
-# Cenários
-ax.plot(anos_futuros, [cenario_pessimista[a] for a in anos_futuros], 
-        'v-', linewidth=2, label='Pessimista (30%)', color='#E74C3C')
-ax.plot(anos_futuros, [cenario_base[a] for a in anos_futuros], 
-        's-', linewidth=2, label='Base (50%)', color='#F39C12')
-ax.plot(anos_futuros, [cenario_otimista[a] for a in anos_futuros], 
-        '^-', linewidth=2, label='Otimista (20%)', color='#2ECC71')
+# Cenários (estilo pelo nome; outros cenários do arquivo em cinza)
+estilos = {'Pessimista': ('v-', '#E74C3C'), 'Base': ('s-', '#F39C12'),
+           'Otimista': ('^-', '#2ECC71')}
+for nome, peso, salarios in zip(cenarios['cenario'], pesos_cenarios, salarios_cenarios):
+    marcador, cor = estilos.get(nome, ('o-', '#7F8C8D'))
+    ax.plot(anos_futuros, salarios, marcador, linewidth=2,
+            label=f'{nome} ({peso:.0%})', color=cor)
+
+# Faixa P5-P95 das trajetórias
+ax.fill_between(anos_futuros, faixa_cenarios[0], faixa_cenarios[2], alpha=0.12,
+                color='#9B59B6', label='Cenários P5-P95')
 
 # Esperado
-ax.plot(anos_futuros, [previsao_esperada[a] for a in anos_futuros], 
+ax.plot(anos_futuros, previsao_esperada, 
         'D-', linewidth=3, markersize=8, label='Esperado (ponderado)', 
         color='#9B59B6', zorder=4)
 
+# Seleção automática (p50)
+ax.plot(anos_futuros, automatico['previsao'][1], 'o:', linewidth=2,
+        label=f"Automático ({selecao['escolhido'][1]})", color='#17202A', alpha=0.8)
+
 # Linha divisória
 ax.axvline(2024.5, color='red', linestyle=':', linewidth=2, alpha=0.5)
 ax.text(2024.5, 750, 'Previsão →', ha='center', fontsize=11, 
@@ -240,6 +317,8 @@ print("✅ PREVISÕES COMPLETAS!")
 print("="*80)
 print("\nArquivos gerados:")
 print("  - previsoes_2026_2030.csv")
+print("  - selecao_modelos_previsao.csv")
+print("  - backtesting_metricas.csv, backtesting_ranking.csv")
 print("  - 11_previsao_2026_2030.png")
 print("\nPróximo: Dashboard Streamlit interativo")
 
@@ -0,0 +1,345 @@
+"""
+================================================================================
+PREVISÃO - SELEÇÃO AUTOMÁTICA DE MODELOS PARA MUITAS SÉRIES
+Tendência | Passeio com deriva | ARIMA(1,1,0) | ETS (SES, Holt, amortecido)
+| Regressão em drivers → escolha por AICc ou erro de validação
+================================================================================
+
+Cada candidato é ajustado para todas as séries de uma vez (y com formato
+m × n, p.ex. p10/p50/p90 ou as 27 UFs):
+- tendencia:       y = a + b·t (MQO em lote, regressao_linear)
+- deriva:          passeio aleatório com deriva, ARIMA(0,1,0) + c
+- arima:           ARIMA(1,1,0) + c por mínimos quadrados condicionais
+- ses / holt / holt_amortecido: ETS(A,N,N), ETS(A,A,N) e ETS(A,Ad,N),
+                   parâmetros por busca em grade vetorizada (séries × grade)
+- regressao:       y = a + Σ b·driver (p.ex. desemprego e PIB); exige os
+                   drivers futuros
+
+Critérios:
+- 'aicc': erros de um passo dentro da amostra, na mesma amostra para todos
+  os modelos (a partir da 3ª observação)
+- 'validacao': reajusta sem as últimas n_teste observações e compara o MAE
+  das previsões; o escolhido é reajustado com a série inteira
+
+Os candidatos (e, opcionalmente, fatias de séries) rodam em paralelo no
+pool de processos do projeto. Sem dependências além de NumPy/SciPy.
+
+Uso:
+    from previsao_modelos import selecionar_modelos
+    selecao = selecionar_modelos(p50[None, :], tempo, tempo_futuro)
+    selecao['escolhido'], selecao['previsao']
+================================================================================
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from monte_carlo import contexto_pool
+from regressao_linear import ajustar_mqo, mqo_lote, prever_mqo
+
+MODELOS = ('tendencia', 'deriva', 'arima', 'ses', 'holt', 'holt_amortecido', 'regressao')
+CRITERIOS = ('aicc', 'validacao')
+
+# Grades dos parâmetros de suavização (β relativo a α: 0 < β ≤ α)
+GRADE_ALFA = np.linspace(0.05, 1.0, 20)
+GRADE_BETA_RELATIVO = np.linspace(0.05, 1.0, 20)
+GRADE_FI = np.array([0.80, 0.85, 0.90, 0.95, 0.98])
+
+INICIO_COMUM = 2  # primeira observação com erro de um passo em todos os modelos
+
+# ============================================================================
+# CANDIDATOS
+# ============================================================================
+# Todos recebem y (m, n), tempo (n,), drivers (n, k) ou None, tempo_futuro
+# (h,), drivers_futuros (h, k) ou None, e o nível do intervalo. Devolvem
+# 'previsao', 'inferior', 'superior' (m, h), 'sqr' (m,) dos erros de um passo
+# a partir de INICIO_COMUM, 'k' (parâmetros estimados) e 'parametros' (m,).
+
+def _intervalo(previsao, desvio, nivel):
+    z = stats.norm.ppf((1 + nivel) / 2)
+    return {'previsao': previsao, 'inferior': previsao - z * desvio,
+            'superior': previsao + z * desvio}
+
+
+def _ajustar_tendencia(y, tempo, drivers, tempo_futuro, drivers_futuros, nivel):
+    ajuste = ajustar_mqo(tempo, y)
+    previsto = prever_mqo(ajuste, tempo_futuro, nivel)
+    b = ajuste['coeficientes'][:, 1]
+    return {'previsao': previsto['previsao'], 'inferior': previsto['inferior'],
+            'superior': previsto['superior'],
+            'sqr': np.sum(ajuste['residuos'][:, INICIO_COMUM:] ** 2, axis=-1), 'k': 2,
+            'parametros': [f"b={v:+.2f}/ano" for v in b]}
+
+
+def _ajustar_regressao(y, tempo, drivers, tempo_futuro, drivers_futuros, nivel):
+    if drivers is None or drivers_futuros is None:
+        raise ValueError("O candidato 'regressao' exige drivers e drivers_futuros")
+    ajuste = ajustar_mqo(drivers, y)
+    previsto = prever_mqo(ajuste, drivers_futuros, nivel)
+    return {'previsao': previsto['previsao'], 'inferior': previsto['inferior'],
+            'superior': previsto['superior'],
+            'sqr': np.sum(ajuste['residuos'][:, INICIO_COMUM:] ** 2, axis=-1),
+            'k': 1 + np.asarray(drivers).reshape(len(tempo), -1).shape[1],
+            'parametros': [' '.join(f"{v:+.2f}" for v in c[1:]) for c in ajuste['coeficientes']]}
+
+
+def _ajustar_deriva(y, tempo, drivers, tempo_futuro, drivers_futuros, nivel):
+    diferencas = np.diff(y, axis=-1)
+    t = diferencas.shape[-1]
+    deriva = diferencas.mean(axis=-1)
+    erros = diferencas - deriva[:, None]
+    sigma2 = np.sum(erros ** 2, axis=-1) / (t - 1)
+    h = np.arange(1, len(tempo_futuro) + 1)
+    previsao = y[:, -1:] + deriva[:, None] * h
+    # Variância do passeio (h·σ²) + incerteza da deriva estimada (h²·σ²/t)
+    desvio = np.sqrt(sigma2[:, None] * (h + h ** 2 / t))
+    return {**_intervalo(previsao, desvio, nivel),
+            'sqr': np.sum(erros[:, INICIO_COMUM - 1:] ** 2, axis=-1), 'k': 1,
+            'parametros': [f"c={v:+.2f}" for v in deriva]}
+
+
+def _ajustar_arima(y, tempo, drivers, tempo_futuro, drivers_futuros, nivel):
+    # Δy_t = c + φ·Δy_{t-1} + e_t, em lote: X (m, n-2, 2)
+    diferencas = np.diff(y, axis=-1)
+    alvo, defasada = diferencas[:, 1:], diferencas[:, :-1]
+    X = np.stack([np.ones_like(defasada), defasada], axis=-1)
+    beta, _ = mqo_lote(X, alvo)
+    erros = alvo - np.einsum('mnp,mp->mn', X, beta)
+    sigma2 = np.sum(erros ** 2, axis=-1) / (alvo.shape[-1] - 2)
+    c, fi = beta[:, 0], beta[:, 1]
+
+    horizonte = len(tempo_futuro)
+    previsao = np.empty((y.shape[0], horizonte))
+    nivel_atual, diferenca = y[:, -1].copy(), diferencas[:, -1].copy()
+    for passo in range(horizonte):
+        diferenca = c + fi * diferenca
+        nivel_atual = nivel_atual + diferenca
+        previsao[:, passo] = nivel_atual
+    # Pesos ψ do nível: Ψ_j = 1 + φ + ... + φ^j; Var(h) = σ² Σ_{j<h} Ψ_j²
+    psi = np.cumsum(fi[:, None] ** np.arange(horizonte), axis=-1)
+    desvio = np.sqrt(sigma2[:, None] * np.cumsum(psi ** 2, axis=-1))
+    return {**_intervalo(previsao, desvio, nivel),
+            'sqr': np.sum(erros ** 2, axis=-1), 'k': 2,
+            'parametros': [f"c={a:+.2f} φ={b:+.2f}" for a, b in zip(c, fi)]}
+
+
+def _grade_ets(tendencia, amortecido):
+    if not tendencia:
+        return GRADE_ALFA, np.zeros_like(GRADE_ALFA), np.ones_like(GRADE_ALFA)
+    fis = GRADE_FI if amortecido else np.ones(1)
+    alfa, relativo, fi = (g.ravel() for g in np.meshgrid(GRADE_ALFA, GRADE_BETA_RELATIVO, fis,
+                                                         indexing='ij'))
+    return alfa, alfa * relativo, fi
+
+
+def _ajustar_ets(y, tempo_futuro, nivel, tendencia, amortecido):
+    # Forma de correção de erros, avaliada para todas as séries × grade:
+    #   ŷ = l + φb;  e = y - ŷ;  l ← ŷ + αe;  b ← φb + βe
+    alfa, beta, fi = _grade_ets(tendencia, amortecido)
+    m, n = y.shape
+    l = np.repeat(y[:, :1], alfa.size, axis=1)
+    b = np.repeat(y[:, 1:2] - y[:, :1] if tendencia else np.zeros((m, 1)), alfa.size, axis=1)
+    sqr = np.zeros((m, alfa.size))
+    for t in range(1, n):
+        previsto = l + fi * b
+        erro = y[:, t:t + 1] - previsto
+        if t >= INICIO_COMUM:
+            sqr += erro ** 2
+        l = previsto + alfa * erro
+        b = fi * b + beta * erro
+
+    melhor = np.argmin(sqr, axis=1)
+    escolher = lambda v: np.take_along_axis(v, melhor[:, None], axis=1)[:, 0]
+    l, b, sqr = escolher(l), escolher(b), escolher(sqr)
+    alfa, beta, fi = alfa[melhor], beta[melhor], fi[melhor]
+    k = 1 + tendencia + amortecido
+
+    h = np.arange(1, len(tempo_futuro) + 1)
+    # φ_h = φ + φ² + ... + φ^h (= h sem amortecimento)
+    fi_acumulado = np.cumsum(fi[:, None] ** h, axis=-1)
+    previsao = l[:, None] + fi_acumulado * b[:, None]
+    # Var(h) = σ²[1 + Σ_{j<h} (α + β·φ_j)²]  (Hyndman et al. 2008, classe 1)
+    c = alfa[:, None] + beta[:, None] * fi_acumulado[:, :-1]
+    sigma2 = sqr / (n - INICIO_COMUM - k)
+    desvio = np.sqrt(sigma2[:, None] * np.concatenate(
+        [np.ones((m, 1)), 1 + np.cumsum(c ** 2, axis=-1)], axis=-1))
+
+    if amortecido:
+        parametros = [f"α={a:.2f} β={bb:.2f} φ={f:.2f}" for a, bb, f in zip(alfa, beta, fi)]
+    elif tendencia:
+        parametros = [f"α={a:.2f} β={bb:.2f}" for a, bb in zip(alfa, beta)]
+    else:
+        parametros = [f"α={a:.2f}" for a in alfa]
+    return {**_intervalo(previsao, desvio, nivel), 'sqr': sqr, 'k': k,
+            'parametros': parametros}
+
+
+def _ajustar_ses(y, tempo, drivers, tempo_futuro, drivers_futuros, nivel):
+    return _ajustar_ets(y, tempo_futuro, nivel, tendencia=False, amortecido=False)
+
+
+def _ajustar_holt(y, tempo, drivers, tempo_futuro, drivers_futuros, nivel):
+    return _ajustar_ets(y, tempo_futuro, nivel, tendencia=True, amortecido=False)
+
+
+def _ajustar_holt_amortecido(y, tempo, drivers, tempo_futuro, drivers_futuros, nivel):
+    return _ajustar_ets(y, tempo_futuro, nivel, tendencia=True, amortecido=True)
+
+
+CANDIDATOS = {
+    'tendencia': _ajustar_tendencia,
+    'deriva': _ajustar_deriva,
+    'arima': _ajustar_arima,
+    'ses': _ajustar_ses,
+    'holt': _ajustar_holt,
+    'holt_amortecido': _ajustar_holt_amortecido,
+    'regressao': _ajustar_regressao,
+}
+
+# ============================================================================
+# EXECUÇÃO (SERIAL OU EM PARALELO)
+# ============================================================================
+
+def ajustar_candidato(tarefa):
+    """
+    Ajusta um candidato: tarefa = (nome, y, tempo, drivers, tempo_futuro,
+    drivers_futuros, nivel_confianca); função de nível de módulo (picklable)
+    """
+    nome, *argumentos = tarefa
+    return CANDIDATOS[nome](*argumentos)
+
+
+def mapear_tarefas(funcao, tarefas, n_workers=1):
+    """Aplica `funcao` às tarefas, em ordem, no pool do projeto (1 = serial)"""
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, len(tarefas)))
+    if n_workers == 1:
+        return [funcao(t) for t in tarefas]
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=contexto_pool()) as pool:
+        return list(pool.map(funcao, tarefas))
+
+
+def aicc(sqr, n_efetivo, k):
+    """AICc gaussiano (k parâmetros estimados + variância) a partir da SQR"""
+    k = k + 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (n_efetivo * np.log(sqr / n_efetivo) + 2 * k
+                + 2 * k * (k + 1) / np.maximum(n_efetivo - k - 1, 1e-9))
+
+# ============================================================================
+# API PRINCIPAL
+# ============================================================================
+
+def selecionar_modelos(y, tempo, tempo_futuro, drivers=None, drivers_futuros=None,
+                       candidatos=None, criterio='aicc', n_teste=3, nivel_confianca=0.95,
+                       nomes=None, n_workers=1, series_por_tarefa=None):
+    """
+    Ajusta os candidatos em todas as séries e escolhe o melhor por série
+
+    Parâmetros:
+    -----------
+    y : array (n,) ou (m, n) - Séries no mesmo calendário
+    tempo : array (n,) - Ano contínuo (frequencias.tempo_continuo)
+    tempo_futuro : array (h,) - Ano contínuo dos períodos a prever
+    drivers : array (n,) ou (n × k) opcional - Regressores do candidato
+              'regressao' (p.ex. desemprego e PIB)
+    drivers_futuros : array (h,) ou (h × k) opcional - Trajetória dos drivers
+    candidatos : list opcional - Subconjunto de MODELOS (padrão: todos os
+                 aplicáveis; 'regressao' só com drivers)
+    criterio : str - 'aicc' ou 'validacao' (MAE nas últimas n_teste obs.)
+    n_teste : int - Observações reservadas no critério 'validacao'
+    nivel_confianca : float - Nível dos intervalos de previsão
+    nomes : list opcional - Nome de cada série (padrão 0..m-1)
+    n_workers : int ou None - Processos (1 = serial, None = todos os núcleos)
+    series_por_tarefa : int opcional - Divide as séries em fatias por tarefa
+
+    Retorna:
+    --------
+    dict - 'escolhido' (m,); 'previsao', 'inferior', 'superior' (m, h) do
+           escolhido; 'candidatos' nome → resultado (m, h); 'tabela'
+           DataFrame (serie, modelo, criterio, parametros, escolhido)
+    """
+    y = np.atleast_2d(np.asarray(y, dtype=np.float64))
+    tempo = np.asarray(tempo, dtype=np.float64)
+    tempo_futuro = np.asarray(tempo_futuro, dtype=np.float64)
+    m, n = y.shape
+    if criterio not in CRITERIOS:
+        raise ValueError(f"Critério desconhecido: '{criterio}' (opções: {CRITERIOS})")
+    if candidatos is None:
+        candidatos = [c for c in MODELOS if c != 'regressao' or drivers_futuros is not None]
+    desconhecidos = set(candidatos) - set(MODELOS)
+    if desconhecidos:
+        raise ValueError(f"Candidatos desconhecidos: {sorted(desconhecidos)} (opções: {MODELOS})")
+    minimo = INICIO_COMUM + 4 + (criterio == 'validacao') * n_teste
+    if n < minimo:
+        raise ValueError(f"São necessárias ao menos {minimo} observações")
+    if drivers is not None:
+        drivers = np.asarray(drivers, dtype=np.float64)
+        drivers_futuros = np.asarray(drivers_futuros, dtype=np.float64)
+    nomes = list(range(m)) if nomes is None else list(nomes)
+
+    # Tarefas: candidato × fatia de séries (× ajuste de validação)
+    passo = series_por_tarefa or m
+    fatias = [slice(i, min(i + passo, m)) for i in range(0, m, passo)]
+
+    def tarefa(nome, fatia, fim=None):
+        corte = slice(None, fim)
+        futuro = tempo_futuro if fim is None else tempo[fim:]
+        drivers_fut = drivers_futuros if fim is None or drivers is None else drivers[fim:]
+        return (nome, y[fatia, corte], tempo[corte],
+                None if drivers is None else drivers[corte], futuro, drivers_fut,
+                nivel_confianca)
+
+    tarefas = [tarefa(nome, fatia) for nome in candidatos for fatia in fatias]
+    if criterio == 'validacao':
+        tarefas += [tarefa(nome, fatia, -n_teste) for nome in candidatos for fatia in fatias]
+    resultados = mapear_tarefas(ajustar_candidato, tarefas, n_workers)
+
+    def juntar(partes):
+        juntos = {chave: np.concatenate([p[chave] for p in partes])
+                  for chave in ('previsao', 'inferior', 'superior', 'sqr')}
+        juntos['parametros'] = [v for p in partes for v in p['parametros']]
+        juntos['k'] = partes[0]['k']
+        return juntos
+
+    n_fatias = len(fatias)
+    ajustes = {nome: juntar(resultados[i * n_fatias:(i + 1) * n_fatias])
+               for i, nome in enumerate(candidatos)}
+    if criterio == 'aicc':
+        pontuacao = np.stack([aicc(ajustes[c]['sqr'], n - INICIO_COMUM, ajustes[c]['k'])
+                              for c in candidatos], axis=1)
+    else:
+        deslocamento = len(candidatos) * n_fatias
+        validacao = [juntar(resultados[deslocamento + i * n_fatias:
+                                       deslocamento + (i + 1) * n_fatias])
+                     for i in range(len(candidatos))]
+        pontuacao = np.stack([np.mean(np.abs(v['previsao'] - y[:, -n_teste:]), axis=-1)
+                              for v in validacao], axis=1)
+
+    pontuacao = np.where(np.isfinite(pontuacao), pontuacao, np.inf)
+    melhor = np.argmin(pontuacao, axis=1)
+    escolhido = np.array(candidatos, dtype=object)[melhor]
+    linhas = np.arange(m)
+    empilhar = lambda chave: np.stack([ajustes[c][chave] for c in candidatos], axis=1)[linhas, melhor]
+
+    tabela = pd.DataFrame({
+        'serie': np.repeat(nomes, len(candidatos)),
+        'modelo': np.tile(candidatos, m),
+        criterio: pontuacao.ravel(),
+        'parametros': [ajustes[c]['parametros'][i] for i in range(m) for c in candidatos],
+    })
+    tabela['escolhido'] = tabela['modelo'].to_numpy() == np.repeat(escolhido, len(candidatos))
+
+    return {
+        'escolhido': escolhido,
+        'previsao': empilhar('previsao'),
+        'inferior': empilhar('inferior'),
+        'superior': empilhar('superior'),
+        'candidatos': ajustes,
+        'tabela': tabela,
+    }
@@ -0,0 +1,143 @@
+"""
+================================================================================
+QUANTIS PONDERADOS POR GRUPO - MOTOR VETORIZADO
+Uma ordenação + pesos acumulados → todos os percentis de todos os grupos
+================================================================================
+
+Definição (mesma do IBGE para percentis de rendimento): o quantil p de um
+grupo é o menor valor cuja fração acumulada de peso atinge p.
+
+Em vez de um groupby().apply por grupo, os dados são ordenados uma única vez
+por (grupo, valor); os pesos acumulados globais e o início de cada grupo
+permitem localizar todos os quantis com um único searchsorted.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _ordenar_por_grupo(valores, pesos, codigos):
+    valores = np.asarray(valores, dtype=np.float64)
+    pesos = np.asarray(pesos, dtype=np.float64)
+    codigos = np.asarray(codigos)
+    if valores.shape != pesos.shape or valores.shape != codigos.shape:
+        raise ValueError("valores, pesos e codigos devem ter o mesmo tamanho")
+    if valores.size == 0:
+        raise ValueError("Nenhuma observação")
+    if np.isnan(valores).any() or np.isnan(pesos).any():
+        raise ValueError("valores e pesos não podem ter NaN")
+    if (pesos < 0).any():
+        raise ValueError("Pesos devem ser não negativos")
+
+    ordem = np.lexsort((valores, codigos))
+    valores, pesos, codigos = valores[ordem], pesos[ordem], codigos[ordem]
+    inicio = np.flatnonzero(np.r_[True, codigos[1:] != codigos[:-1]])
+    return valores, pesos, codigos[inicio], inicio
+
+
+def quantis_ponderados(valores, pesos, codigos, probabilidades):
+    """
+    Quantis ponderados de vários grupos em uma passada vetorizada
+
+    Parâmetros:
+    -----------
+    valores : array - Observações
+    pesos : array - Pesos amostrais (>= 0)
+    codigos : array - Código do grupo de cada observação (int ou ordenável)
+    probabilidades : array - Quantis em [0, 1]
+
+    Retorna:
+    --------
+    (grupos, quantis) - códigos únicos ordenados e array (n_grupos, n_probabilidades)
+    """
+    probabilidades = np.atleast_1d(np.asarray(probabilidades, dtype=np.float64))
+    if np.any((probabilidades < 0) | (probabilidades > 1)):
+        raise ValueError("probabilidades devem estar em [0, 1]")
+
+    valores, pesos, grupos, inicio = _ordenar_por_grupo(valores, pesos, codigos)
+    fim = np.r_[inicio[1:], valores.size] - 1
+
+    acumulado = np.cumsum(pesos)
+    antes = np.r_[0.0, acumulado][inicio]
+    totais = acumulado[fim] - antes
+
+    # Alvo de peso acumulado de cada (grupo, p) na escala global
+    alvos = antes[:, None] + probabilidades[None, :] * totais[:, None]
+    indices = np.searchsorted(acumulado, alvos, side='left')
+    indices = np.clip(indices, inicio[:, None], fim[:, None])
+
+    return grupos, valores[indices]
+
+
+def gini_ponderado(valores, pesos, codigos):
+    """
+    Índice de Gini ponderado de vários grupos em uma passada vetorizada
+
+    Retorna:
+    --------
+    (grupos, gini) - códigos únicos ordenados e array (n_grupos,)
+    """
+    valores, pesos, grupos, inicio = _ordenar_por_grupo(valores, pesos, codigos)
+    tamanhos = np.diff(np.r_[inicio, valores.size])
+
+    renda = valores * pesos
+    renda_acumulada = np.cumsum(renda)
+    renda_antes = np.repeat(np.r_[0.0, renda_acumulada][inicio], tamanhos)
+    renda_total = np.repeat(np.add.reduceat(renda, inicio), tamanhos)
+    peso_total = np.add.reduceat(pesos, inicio)
+
+    # Curva de Lorenz: L_i e L_{i-1} dentro de cada grupo
+    lorenz = (renda_acumulada - renda_antes) / renda_total
+    lorenz_anterior = lorenz - renda / renda_total
+
+    gini = 1 - np.add.reduceat(pesos * (lorenz + lorenz_anterior), inicio) / peso_total
+    return grupos, gini
+
+
+def _rotulo_percentil(p):
+    return f'p{p:g}'
+
+
+def quantis_ponderados_por_grupo(dados, valor, peso, grupos, percentis=(10, 50, 90),
+                                 incluir_gini=False):
+    """
+    Percentis ponderados (e opcionalmente Gini) por grupo de um DataFrame
+
+    Parâmetros:
+    -----------
+    dados : DataFrame - Uma linha por observação (ou por valor, em tabelas de frequência)
+    valor : str - Coluna com o valor (p.ex. 'rendimento')
+    peso : str - Coluna com o peso amostral
+    grupos : list - Colunas de agrupamento (p.ex. ['ano', 'uf', 'sexo', 'atividade'])
+    percentis : list - Percentis em 0-100 (qualquer lista, p.ex. range(5, 100, 5))
+    incluir_gini : bool - Acrescenta a coluna 'gini'
+
+    Retorna:
+    --------
+    DataFrame - grupos + p10, p50, p90, ... (+ gini)
+    """
+    grupos = list(grupos)
+    percentis = list(percentis)
+
+    if grupos:
+        # groupby descarta chaves NaN (ngroup devolve NaN, não -1): checar antes
+        if dados[grupos].isna().any(axis=None):
+            raise ValueError("Colunas de grupo não podem ter valores ausentes")
+        agrupado = dados.groupby(grupos, sort=True)
+        codigos = agrupado.ngroup().to_numpy()
+        chaves = agrupado.size().index.to_frame(index=False)
+    else:
+        codigos = np.zeros(len(dados), dtype=np.int64)
+
+    valores = dados[valor].to_numpy()
+    pesos = dados[peso].to_numpy()
+    presentes, quantis = quantis_ponderados(valores, pesos, codigos,
+                                            np.asarray(percentis, dtype=np.float64) / 100)
+
+    resultado = pd.DataFrame(quantis, columns=[_rotulo_percentil(p) for p in percentis])
+    if incluir_gini:
+        resultado['gini'] = gini_ponderado(valores, pesos, codigos)[1]
+
+    if grupos:
+        resultado = pd.concat([chaves.iloc[presentes].reset_index(drop=True), resultado], axis=1)
+    return resultado
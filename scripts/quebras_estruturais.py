@@ -0,0 +1,332 @@
+"""
+================================================================================
+QUEBRAS ESTRUTURAIS - BUSCA EM TODAS AS DATAS CANDIDATAS
+Chow | sup-F | Múltiplas quebras (Bai-Perron) → várias séries de uma vez
+================================================================================
+
+Em vez de supor a quebra em 2021, cada data candidata é testada. O modelo
+de cada regime é uma tendência linear (y = a + b·t) ou só um nível (média).
+
+Somas acumuladas de 1, t, y, t², t·y e y² dão a soma dos quadrados dos
+resíduos (SQR) de qualquer segmento [i, j) em O(1): o teste sup-F custa O(n)
+e a matriz de SQR de todos os segmentos, base da programação dinâmica de
+Bai-Perron, O(n²). Tudo é vetorizado em séries empilhadas (m × n), p.ex. as
+27 UFs da PNAD, anuais, trimestrais ou mensais.
+
+Convenção: a quebra k é o índice da PRIMEIRA observação do novo regime
+(k = 10 em 2012-2024 → regimes 2012-2021 e 2022-2024).
+
+Uso:
+    from quebras_estruturais import busca_quebra_unica, bai_perron
+    busca = busca_quebra_unica(anos, p50)       # sup-F + p-valor simulado
+    multiplas = bai_perron(anos, p50, max_quebras=2)
+================================================================================
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+MODELOS = {'tendencia': 2, 'media': 1}  # modelo → parâmetros por regime
+TRIMAGEM_PADRAO = 0.15                   # fração mínima da amostra por regime
+
+# ============================================================================
+# SOMAS ACUMULADAS E SQR DE SEGMENTOS
+# ============================================================================
+
+def _parametros(modelo):
+    if modelo not in MODELOS:
+        raise ValueError(f"Modelo desconhecido: '{modelo}' (opções: {list(MODELOS)})")
+    return MODELOS[modelo]
+
+
+def tamanho_minimo_padrao(n, modelo='tendencia'):
+    """
+    Menor regime admitido: trimagem de 15% e ao menos p+2 observações
+
+    Com p+1 um regime de tendência tem 1 grau de liberdade (3 pontos em
+    2012-2024): a reta passa quase exata e a SQR favorece quebras espúrias.
+    """
+    return max(_parametros(modelo) + 2, math.ceil(TRIMAGEM_PADRAO * n))
+
+
+def somas_acumuladas(x, y):
+    """
+    Somas acumuladas (com zero inicial) para a SQR de segmentos em O(1)
+
+    x e y são centrados antes (x na média, cada série na sua média) para
+    evitar cancelamento numérico com anos ~2000 e salários ~R$900.
+
+    Parâmetros:
+    -----------
+    x : array (n,) ou (m, n) - Tempo (anos, índice do mês/trimestre) ou um
+        regressor próprio de cada série (p.ex. desemprego de cada UF)
+    y : array (n,) ou (m, n) - Uma ou m séries no mesmo calendário
+
+    Retorna:
+    --------
+    dict - 'n', 'x', 'y', 'xx', 'xy', 'yy', cada um (..., n+1)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if y.shape[-1] != x.shape[-1]:
+        raise ValueError(f"y tem {y.shape[-1]} observações, x tem {x.shape[-1]}")
+    if not (np.all(np.isfinite(y)) and np.all(np.isfinite(x))):
+        raise ValueError("Séries com valores ausentes: use um painel completo")
+    x = x - x.mean(axis=-1, keepdims=True)
+    y = y - y.mean(axis=-1, keepdims=True)
+    x, y = np.broadcast_arrays(x, y)
+
+    def acumular(v):
+        zero = np.zeros(v.shape[:-1] + (1,))
+        return np.concatenate([zero, np.cumsum(v, axis=-1)], axis=-1)
+
+    return {'n': acumular(np.ones_like(y)), 'x': acumular(x), 'y': acumular(y),
+            'xx': acumular(x * x), 'xy': acumular(x * y), 'yy': acumular(y * y)}
+
+
+def sqr_segmentos(somas, inicio, fim, modelo='tendencia'):
+    """
+    SQR do ajuste de cada segmento [inicio, fim) a partir das somas acumuladas
+
+    inicio e fim são arrays de índices com formatos compatíveis (broadcast);
+    o resultado tem formato (..., *broadcast(inicio, fim)). Segmentos com
+    menos de p+1 observações (ou x constante) recebem +inf.
+    """
+    p = _parametros(modelo)
+    inicio, fim = np.broadcast_arrays(np.asarray(inicio), np.asarray(fim))
+    d = {chave: acumulada[..., fim] - acumulada[..., inicio]
+         for chave, acumulada in somas.items()}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        syy = d['yy'] - d['y'] ** 2 / d['n']
+        if p == 2:
+            sxx = d['xx'] - d['x'] ** 2 / d['n']
+            sxy = d['xy'] - d['x'] * d['y'] / d['n']
+            sqr = syy - sxy ** 2 / sxx
+            valido = (d['n'] > p) & (sxx > 1e-12 * np.maximum(d['xx'], 1))
+        else:
+            sqr = syy
+            valido = d['n'] > p
+    return np.where(valido, np.maximum(sqr, 0.0), np.inf)
+
+# ============================================================================
+# QUEBRA ÚNICA: CHOW E SUP-F
+# ============================================================================
+
+def _estatistica_f(sqr_restrito, sqr_irrestrito, n, p):
+    # F de Chow: (SQR_r - SQR_u)/p ÷ SQR_u/(n - 2p)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return ((sqr_restrito - sqr_irrestrito) / p) / (sqr_irrestrito / (n - 2 * p))
+
+
+def teste_chow(x, y, quebra, modelo='tendencia'):
+    """
+    Teste de Chow para uma quebra em data conhecida
+
+    Parâmetros:
+    -----------
+    x : array (n,) - Tempo
+    y : array (n,) ou (m, n) - Séries
+    quebra : int - Índice da primeira observação do novo regime
+    modelo : str - 'tendencia' ou 'media'
+
+    Retorna:
+    --------
+    dict - 'f', 'p_valor' (...,)
+    """
+    p = _parametros(modelo)
+    n = np.asarray(x).size
+    if quebra < p + 1 or n - quebra < p + 1:
+        raise ValueError(f"Cada regime precisa de ao menos {p + 1} observações")
+    somas = somas_acumuladas(x, y)
+    restrito = sqr_segmentos(somas, 0, n, modelo)
+    irrestrito = sqr_segmentos(somas, 0, quebra, modelo) + sqr_segmentos(somas, quebra, n, modelo)
+    f = _estatistica_f(restrito, irrestrito, n, p)
+    return {'f': f, 'p_valor': stats.f.sf(f, p, n - 2 * p)}
+
+
+def _sup_f(somas, n, p, candidatos, modelo):
+    restrito = sqr_segmentos(somas, 0, n, modelo)[..., None]
+    irrestrito = (sqr_segmentos(somas, 0, candidatos, modelo)
+                  + sqr_segmentos(somas, candidatos, n, modelo))
+    return _estatistica_f(restrito, irrestrito, n, p)
+
+
+def busca_quebra_unica(x, y, modelo='tendencia', tamanho_minimo=None,
+                       n_simulacoes=999, semente=42):
+    """
+    Busca a quebra mais provável em todas as datas candidatas (sup-F)
+
+    O F de Chow é calculado em cada candidata; a quebra estimada é a de maior
+    F (equivalente à menor SQR). Como o máximo de vários F não segue a
+    distribuição F, o p-valor vem da distribuição de sup-F simulada sob a
+    hipótese nula (tendência única, erros normais i.i.d.). A estatística não
+    depende dos coeficientes nem da variância, então uma simulação serve
+    para todas as séries com o mesmo calendário.
+
+    Parâmetros:
+    -----------
+    x : array (n,) - Tempo
+    y : array (n,) ou (m, n) - Séries
+    modelo : str - 'tendencia' ou 'media'
+    tamanho_minimo : int opcional - Menor regime (padrão tamanho_minimo_padrao)
+    n_simulacoes : int - Réplicas da nula para o p-valor (0 = sem p-valor)
+    semente : int - Semente das réplicas
+
+    Retorna:
+    --------
+    dict - 'quebra' (...,) índice; 'inicio_regime' (...,) x da quebra;
+           'sup_f', 'p_valor', 'p_valor_chow' (nominal, ignora a busca);
+           'candidatos' (c,) e 'f' (..., c) para o perfil completo
+    """
+    x = np.asarray(x, dtype=np.float64)
+    p = _parametros(modelo)
+    n = x.size
+    h = tamanho_minimo or tamanho_minimo_padrao(n, modelo)
+    if h < p + 1:
+        raise ValueError(f"tamanho_minimo deve ser >= {p + 1}")
+    candidatos = np.arange(h, n - h + 1)
+    if candidatos.size == 0:
+        raise ValueError(f"Série curta demais para regimes de {h} observações")
+
+    f = _sup_f(somas_acumuladas(x, y), n, p, candidatos, modelo)
+    melhor = np.argmax(f, axis=-1)
+    sup_f = np.take_along_axis(f, melhor[..., None], axis=-1)[..., 0]
+
+    resultado = {
+        'quebra': candidatos[melhor],
+        'inicio_regime': x[candidatos[melhor]],
+        'sup_f': sup_f,
+        'p_valor_chow': stats.f.sf(sup_f, p, n - 2 * p),
+        'candidatos': candidatos,
+        'f': f,
+    }
+    if n_simulacoes:
+        rng = np.random.default_rng(semente)
+        nula = _sup_f(somas_acumuladas(x, rng.standard_normal((n_simulacoes, n))),
+                      n, p, candidatos, modelo).max(axis=-1)
+        excedentes = np.sum(nula >= sup_f[..., None], axis=-1)
+        resultado['p_valor'] = (1 + excedentes) / (n_simulacoes + 1)
+    return resultado
+
+# ============================================================================
+# MÚLTIPLAS QUEBRAS: BAI-PERRON (PROGRAMAÇÃO DINÂMICA)
+# ============================================================================
+
+def bai_perron(x, y, max_quebras=2, modelo='tendencia', tamanho_minimo=None):
+    """
+    Quebras múltiplas por minimização global da SQR (Bai e Perron 2003)
+
+    A matriz de SQR de todos os segmentos vem das somas acumuladas; a
+    programação dinâmica escolhe, para cada número de quebras m, as datas
+    de menor SQR total. O número de quebras é escolhido pelo BIC (LWZ),
+    contando as datas de quebra como parâmetros.
+
+    Parâmetros:
+    -----------
+    x : array (n,) - Tempo
+    y : array (n,) ou (m, n) - Séries
+    max_quebras : int - Maior número de quebras avaliado
+    modelo : str - 'tendencia' ou 'media'
+    tamanho_minimo : int opcional - Menor regime (padrão tamanho_minimo_padrao)
+
+    Retorna:
+    --------
+    dict - 'n_quebras' (...,) escolhido pelo BIC; 'quebras' (..., max_quebras)
+           índices escolhidos (-1 nas posições sem quebra); 'datas' lista em
+           que datas[m] (..., m) são as quebras ótimas com m quebras;
+           'sqr' e 'bic' (..., max_quebras + 1)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    p = _parametros(modelo)
+    n = x.size
+    h = tamanho_minimo or tamanho_minimo_padrao(n, modelo)
+    if h < p + 1:
+        raise ValueError(f"tamanho_minimo deve ser >= {p + 1}")
+    max_quebras = min(max_quebras, n // h - 1)
+    if max_quebras < 0:
+        raise ValueError(f"Série curta demais para regimes de {h} observações")
+
+    # sqr[..., i, j] = SQR do segmento [i, j); segmentos curtos = +inf
+    posicoes = np.arange(n + 1)
+    sqr = sqr_segmentos(somas_acumuladas(x, y), posicoes[:, None], posicoes[None, :], modelo)
+    sqr = np.where(posicoes[None, :] - posicoes[:, None] >= h, sqr, np.inf)
+
+    # custo[m][..., j] = menor SQR de [0, j) com m quebras; origem = última quebra
+    custo = [sqr[..., 0, :]]
+    origens = []
+    for _ in range(max_quebras):
+        total = custo[-1][..., :, None] + sqr
+        origens.append(np.argmin(total, axis=-2))
+        custo.append(np.min(total, axis=-2))
+
+    forma = sqr.shape[:-2]
+    datas = []
+    for m in range(max_quebras + 1):
+        quebras = np.empty(forma + (m,), dtype=np.int64)
+        fim = np.full(forma, n, dtype=np.int64)
+        for nivel in range(m, 0, -1):
+            fim = np.take_along_axis(origens[nivel - 1], fim[..., None], axis=-1)[..., 0]
+            quebras[..., nivel - 1] = fim
+        datas.append(quebras)
+
+    sqr_total = np.stack([c[..., n] for c in custo], axis=-1)
+    n_quebras_grade = np.arange(max_quebras + 1)
+    n_parametros = (n_quebras_grade + 1) * p + n_quebras_grade
+    with np.errstate(divide='ignore'):
+        bic = n * np.log(sqr_total / n) + n_parametros * np.log(n)
+    escolhido = np.argmin(bic, axis=-1)
+
+    quebras = np.full(forma + (max_quebras,), -1, dtype=np.int64)
+    for m in range(1, max_quebras + 1):
+        selecionado = escolhido == m
+        quebras[..., :m] = np.where(selecionado[..., None], datas[m], quebras[..., :m])
+
+    return {
+        'n_quebras': escolhido,
+        'quebras': quebras,
+        'datas': datas,
+        'sqr': sqr_total,
+        'bic': bic,
+    }
+
+# ============================================================================
+# PAINÉIS (P.EX. UFs)
+# ============================================================================
+
+def quebras_por_grupo(df, grupo, tempo, valor, modelo='tendencia', max_quebras=2,
+                      tamanho_minimo=None, n_simulacoes=999, semente=42):
+    """
+    sup-F e Bai-Perron para todas as séries de um painel em formato longo
+
+    Parâmetros:
+    -----------
+    df : DataFrame - Colunas grupo, tempo e valor (p.ex. uf, ano, p50)
+    grupo, tempo, valor : str - Nomes das colunas
+
+    Retorna:
+    --------
+    DataFrame - Uma linha por grupo: quebra sup-F, sup_f, p_valor e as
+                quebras escolhidas pelo BIC (início de cada novo regime)
+    """
+    painel = df.pivot_table(index=grupo, columns=tempo, values=valor, aggfunc='first')
+    x = painel.columns.to_numpy(dtype=np.float64)
+    y = painel.to_numpy(dtype=np.float64)
+
+    unica = busca_quebra_unica(x, y, modelo, tamanho_minimo, n_simulacoes, semente)
+    multiplas = bai_perron(x, y, max_quebras, modelo, tamanho_minimo)
+
+    tabela = pd.DataFrame({
+        grupo: painel.index,
+        'inicio_regime_supf': unica['inicio_regime'],
+        'sup_f': unica['sup_f'],
+        'p_valor': unica.get('p_valor', np.nan),
+        'n_quebras_bic': multiplas['n_quebras'],
+    })
+    for i in range(multiplas['quebras'].shape[-1]):
+        indices = multiplas['quebras'][:, i]
+        tabela[f'quebra_{i + 1}'] = np.where(indices >= 0, x[np.maximum(indices, 0)], np.nan)
+    return tabela
@@ -0,0 +1,175 @@
+"""
+================================================================================
+REAMOSTRAGEM - BOOTSTRAP EM LOTE PARA REGRESSÕES E ESTATÍSTICAS
+Pares | Resíduos | Blocos móveis → milhares de reamostras em uma conta
+================================================================================
+
+Em vez de milhares de LinearRegression().fit, todas as reamostras viram uma
+pilha de matrizes de desenho (B × n × p) resolvida de uma vez por mínimos
+quadrados em forma fechada (SVD em lote de regressao_linear). No bootstrap
+de resíduos a matriz de desenho é fixa, então basta uma pseudo-inversa para
+todas as reamostras.
+
+Métodos:
+- 'pares':    reamostra as linhas (x, y) com reposição
+- 'residuos': y* = Xβ + e*, com e* sorteados dos resíduos (reescalados)
+- 'bloco':    bootstrap de blocos móveis dos resíduos, preservando a
+              dependência temporal (séries anuais)
+
+Intervalos: percentis das reamostras válidas (reamostras de pares sem
+variação em x, comuns em amostras de 3 pontos, são descartadas e contadas).
+Abaixo de N_MINIMO_REAMOSTRAGEM observações só 'residuos' é informativo
+(metodos_aplicaveis).
+================================================================================
+"""
+
+import numpy as np
+
+from regressao_linear import desenho, mqo_lote
+
+METODOS = ('pares', 'residuos', 'bloco')
+N_MINIMO_REAMOSTRAGEM = 8   # abaixo disso, 'pares' e 'bloco' degeneram
+
+# ============================================================================
+# ÍNDICES DE REAMOSTRAGEM
+# ============================================================================
+
+def tamanho_bloco_padrao(n):
+    """Regra usual n^(1/3) para o bootstrap de blocos móveis"""
+    return max(1, int(round(n ** (1 / 3))))
+
+
+def metodos_aplicaveis(n, n_minimo=N_MINIMO_REAMOSTRAGEM):
+    """
+    Métodos informativos para uma amostra de n observações
+
+    Com poucos pontos, muitas reamostras de pares repetem um único x (e são
+    descartadas) e os blocos móveis viram 1-2 blocos: só 'residuos' fica.
+    """
+    return METODOS if n >= n_minimo else ('residuos',)
+
+
+def indices_reamostragem(n, n_reamostras, rng, metodo='pares', tamanho_bloco=None):
+    """
+    Índices (n_reamostras × n) das observações sorteadas
+
+    'pares'/'residuos': sorteio independente com reposição.
+    'bloco': blocos móveis de `tamanho_bloco` posições consecutivas,
+             concatenados e cortados em n.
+    """
+    if metodo in ('pares', 'residuos'):
+        return rng.integers(0, n, size=(n_reamostras, n))
+    if metodo != 'bloco':
+        raise ValueError(f"Método desconhecido: '{metodo}' (opções: {METODOS})")
+
+    tamanho_bloco = tamanho_bloco or tamanho_bloco_padrao(n)
+    if not 1 <= tamanho_bloco <= n:
+        raise ValueError("tamanho_bloco deve estar entre 1 e n")
+    n_blocos = -(-n // tamanho_bloco)
+    inicios = rng.integers(0, n - tamanho_bloco + 1, size=(n_reamostras, n_blocos))
+    indices = inicios[:, :, None] + np.arange(tamanho_bloco)
+    return indices.reshape(n_reamostras, -1)[:, :n]
+
+
+def intervalo_percentil(reamostras, nivel_confianca=0.95):
+    """Limites (inferior, superior) por percentis, ignorando NaN; formato (2, ...)"""
+    caudas = [(1 - nivel_confianca) / 2 * 100, (1 + nivel_confianca) / 2 * 100]
+    return np.nanpercentile(reamostras, caudas, axis=0)
+
+# ============================================================================
+# BOOTSTRAP DE REGRESSÕES E DE ESTATÍSTICAS
+# ============================================================================
+
+def bootstrap_regressao(x, y, metodo='pares', n_reamostras=5000, semente=42,
+                        nivel_confianca=0.95, tamanho_bloco=None, intercepto=True):
+    """
+    Intervalos bootstrap dos coeficientes de uma regressão linear
+
+    Parâmetros:
+    -----------
+    x : array (n,) ou (n × k) - Regressores
+    y : array (n,) - Resposta
+    metodo : str - 'pares', 'residuos' ou 'bloco' (blocos móveis dos resíduos)
+    n_reamostras : int - Número de reamostras
+    semente : int - Semente (reprodutível)
+    nivel_confianca : float - Nível dos intervalos percentis
+    tamanho_bloco : int opcional - Só para 'bloco' (padrão n^(1/3))
+    intercepto : bool - Inclui a constante (primeiro coeficiente)
+
+    Retorna:
+    --------
+    dict - 'coeficientes' (p,), 'erro_padrao' (p,), 'ic' (2 × p),
+           'reamostras' (B × p, só as válidas), 'n_validas'
+    """
+    X = desenho(x, intercepto)
+    y = np.asarray(y, dtype=np.float64)
+    n, p = X.shape
+    if n <= p:
+        raise ValueError("São necessárias mais observações que coeficientes")
+    rng = np.random.default_rng(semente)
+
+    beta, _ = mqo_lote(X, y)
+    indices = indices_reamostragem(n, n_reamostras, rng, metodo, tamanho_bloco)
+
+    if metodo == 'pares':
+        reamostras, validas = mqo_lote(X[indices], y[indices])
+        reamostras = reamostras[validas]
+    else:
+        # X fixo: uma pseudo-inversa resolve todas as reamostras (B × n)·(n × p)
+        ajustado = X @ beta
+        residuos = (y - ajustado) * np.sqrt(n / (n - p))  # resíduos reescalados
+        residuos = residuos - residuos.mean()
+        y_reamostrado = ajustado + residuos[indices]
+        reamostras = y_reamostrado @ np.linalg.pinv(X).T
+
+    return {
+        'coeficientes': beta,
+        'erro_padrao': reamostras.std(axis=0, ddof=1),
+        'ic': intervalo_percentil(reamostras, nivel_confianca),
+        'reamostras': reamostras,
+        'n_validas': reamostras.shape[0],
+    }
+
+
+def bootstrap_estatistica(amostras, estatistica, metodo='pares', n_reamostras=5000,
+                          semente=42, nivel_confianca=0.95, tamanho_bloco=None):
+    """
+    Intervalo bootstrap de uma estatística de uma ou mais amostras
+
+    Cada amostra é reamostrada de forma independente ('pares' = sorteio
+    simples; 'bloco' = blocos móveis dentro da amostra) e a estatística é
+    avaliada em todas as reamostras de uma vez.
+
+    Parâmetros:
+    -----------
+    amostras : list de arrays 1-D - P.ex. [variações 2012-2019, variações 2020-2024]
+    estatistica : callable - Recebe um array (B × n_i) por amostra, na mesma
+                  ordem, e devolve (B,); também é chamada com os arrays
+                  originais (n_i,) para a estimativa pontual
+    metodo : str - 'pares' ou 'bloco'
+
+    Retorna:
+    --------
+    dict - 'estimativa', 'erro_padrao', 'ic' (inferior, superior), 'reamostras'
+
+    Exemplo:
+        razao_vol = lambda a, b: np.std(b, axis=-1) / np.std(a, axis=-1)
+        bootstrap_estatistica([var_1, var_2], razao_vol, metodo='bloco')
+    """
+    if metodo not in ('pares', 'bloco'):
+        raise ValueError("Para estatísticas, use metodo='pares' ou 'bloco'")
+    rng = np.random.default_rng(semente)
+    amostras = [np.asarray(a, dtype=np.float64) for a in amostras]
+
+    reamostradas = [a[indices_reamostragem(a.size, n_reamostras, rng, metodo, tamanho_bloco)]
+                    for a in amostras]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reamostras = np.asarray(estatistica(*reamostradas), dtype=np.float64)
+    reamostras = reamostras[np.isfinite(reamostras)]
+
+    return {
+        'estimativa': float(estatistica(*amostras)),
+        'erro_padrao': float(reamostras.std(ddof=1)),
+        'ic': tuple(float(v) for v in intervalo_percentil(reamostras, nivel_confianca)),
+        'reamostras': reamostras,
+    }
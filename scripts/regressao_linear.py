@@ -0,0 +1,190 @@
+"""
+================================================================================
+REGRESSÃO LINEAR - MÍNIMOS QUADRADOS EM LOTE
+Coeficientes + Erros padrão + t + p-valores + Intervalos de predição
+================================================================================
+
+Os ajustes do projeto são pequenos (3 a 13 anos, 1 regressor) e numerosos
+(períodos, subconjuntos de anos, séries). Em vez de um LinearRegression por
+ajuste e erros padrão recalculados à mão, todos os problemas são empilhados
+e resolvidos por uma única SVD em lote, que já fornece (XᵀX)⁻¹ para a
+inferência.
+
+Formas de empilhar:
+- várias respostas para o mesmo X: y com formato (m, n)
+- vários subconjuntos de linhas: mascara booleana (m, n); as linhas fora do
+  subconjunto têm peso zero e não entram nos graus de liberdade
+
+Uso:
+    from regressao_linear import ajustar_mqo, prever_mqo
+    ajuste = ajustar_mqo(anos, p50, mascara=[anos <= 2021, anos >= 2022])
+    ajuste['coeficientes'][:, 1]            # tendência de cada período
+    prever_mqo(ajuste, [2025, 2026])        # previsão + intervalo de predição
+================================================================================
+"""
+
+import numpy as np
+from scipy import stats
+
+# ============================================================================
+# SOLUÇÃO EM LOTE
+# ============================================================================
+
+def desenho(x, intercepto=True):
+    """Matriz de desenho (n × p) a partir de x (n,) ou (n × k)"""
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[:, None]
+    if intercepto:
+        x = np.concatenate([np.ones((x.shape[0], 1)), x], axis=1)
+    return x
+
+
+def _svd_lote(X):
+    # SVD reduzida de cada problema + indicador de posto completo
+    u, s, vt = np.linalg.svd(X, full_matrices=False)
+    tolerancia = s[..., :1] * max(X.shape[-2:]) * np.finfo(np.float64).eps
+    posto_completo = np.all(s > tolerancia, axis=-1)
+    return u, s, vt, posto_completo
+
+
+def mqo_lote(X, y):
+    """
+    Mínimos quadrados de uma pilha de problemas em uma única chamada
+
+    Parâmetros:
+    -----------
+    X : array (..., n, p) - Matrizes de desenho
+    y : array (..., n) - Respostas
+
+    Retorna:
+    --------
+    (beta, posto_completo) - beta (..., p); posto_completo (...,) indica os
+                             problemas identificados (os demais têm beta NaN)
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    u, s, vt, posto_completo = _svd_lote(X)
+
+    # beta = V · diag(1/s) · Uᵀ y
+    with np.errstate(divide='ignore', invalid='ignore'):
+        uty = np.einsum('...np,...n->...p', u, y) / s
+    beta = np.einsum('...pq,...p->...q', vt, uty)
+    beta[~posto_completo] = np.nan
+    return beta, posto_completo
+
+# ============================================================================
+# AJUSTE COM INFERÊNCIA
+# ============================================================================
+
+def ajustar_mqo(x, y, intercepto=True, mascara=None):
+    """
+    Ajusta uma ou várias regressões lineares com a inferência clássica
+
+    Parâmetros:
+    -----------
+    x : array (n,) ou (n × k) - Regressores (comuns a todos os problemas)
+    y : array (n,) ou (m, n) - Uma resposta ou m respostas empilhadas
+    intercepto : bool - Inclui a constante (primeiro coeficiente)
+    mascara : array bool (n,) ou (m, n) opcional - Linhas usadas em cada
+              problema (p.ex. [anos <= 2021, anos >= 2022])
+
+    Retorna:
+    --------
+    dict - 'coeficientes', 'erro_padrao', 't', 'p_valor' (..., p);
+           'r2', 'rmse', 'sigma', 'gl' (...,); 'ajustados', 'residuos'
+           (..., n; NaN fora da máscara); e o necessário para prever_mqo.
+           Problemas sem posto completo têm coeficientes NaN.
+    """
+    X = desenho(x, intercepto)
+    y = np.asarray(y, dtype=np.float64)
+    n, p = X.shape
+    if y.shape[-1] != n:
+        raise ValueError(f"y tem {y.shape[-1]} observações, x tem {n}")
+    if mascara is None:
+        mascara = np.ones(y.shape, dtype=bool)
+    mascara = np.asarray(mascara, dtype=bool)
+    y, mascara = np.broadcast_arrays(y, mascara)
+    peso = mascara.astype(np.float64)
+
+    # Linhas fora da máscara zeradas: não afetam a solução nem os resíduos
+    Xm = X * peso[..., None]
+    ym = np.where(mascara, y, 0.0)
+    u, s, vt, posto_completo = _svd_lote(Xm)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = np.einsum('...pq,...p->...q', vt, np.einsum('...np,...n->...p', u, ym) / s)
+        # (XᵀX)⁻¹ = V · diag(1/s²) · Vᵀ
+        xtx_inv = np.einsum('...pi,...p,...pj->...ij', vt, 1 / s**2, vt)
+    beta[~posto_completo] = np.nan
+    xtx_inv[~posto_completo] = np.nan
+
+    ajustados = np.einsum('np,...p->...n', X, beta)
+    residuos = np.where(mascara, y - ajustados, np.nan)
+    n_obs = peso.sum(axis=-1)
+    gl = n_obs - p
+    sqr = np.nansum(residuos**2, axis=-1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media = np.sum(ym, axis=-1) / n_obs
+        rmse = np.sqrt(sqr / n_obs)
+        sigma2 = np.where(gl > 0, sqr / gl, np.nan)
+        erro_padrao = np.sqrt(sigma2[..., None] * np.diagonal(xtx_inv, axis1=-2, axis2=-1))
+        t = beta / erro_padrao
+        sqt = np.sum(peso * (y - media[..., None])**2, axis=-1)
+        r2 = 1 - sqr / sqt
+    p_valor = 2 * stats.t.sf(np.abs(t), gl[..., None])
+
+    return {
+        'coeficientes': beta,
+        'erro_padrao': erro_padrao,
+        't': t,
+        'p_valor': p_valor,
+        'r2': r2,
+        'rmse': rmse,
+        'sigma': np.sqrt(sigma2),
+        'gl': gl,
+        'ajustados': np.where(mascara, ajustados, np.nan),
+        'residuos': residuos,
+        'xtx_inv': xtx_inv,
+        'intercepto': intercepto,
+    }
+
+
+def intervalo_coeficientes(ajuste, nivel_confianca=0.95):
+    """Limites (inferior, superior) t de Student dos coeficientes; formato (2, ..., p)"""
+    t_crit = stats.t.ppf((1 + nivel_confianca) / 2, ajuste['gl'])[..., None]
+    margem = t_crit * ajuste['erro_padrao']
+    return np.stack([ajuste['coeficientes'] - margem, ajuste['coeficientes'] + margem])
+
+
+def prever_mqo(ajuste, x_novo, nivel_confianca=0.95, tipo='predicao'):
+    """
+    Previsões com intervalo para novos valores dos regressores
+
+    Parâmetros:
+    -----------
+    ajuste : dict - Resultado de ajustar_mqo
+    x_novo : array (h,) ou (h × k) - Novos regressores
+    nivel_confianca : float - Nível do intervalo
+    tipo : str - 'predicao' (nova observação) ou 'media' (valor esperado)
+
+    Retorna:
+    --------
+    dict - 'previsao', 'inferior', 'superior' (..., h)
+    """
+    if tipo not in ('predicao', 'media'):
+        raise ValueError("tipo deve ser 'predicao' ou 'media'")
+    Xn = desenho(x_novo, ajuste['intercepto'])
+    previsao = np.einsum('hp,...p->...h', Xn, ajuste['coeficientes'])
+
+    # Alavancagem x₀ᵀ (XᵀX)⁻¹ x₀ de cada ponto novo
+    alavancagem = np.einsum('hi,...ij,hj->...h', Xn, ajuste['xtx_inv'], Xn)
+    variancia = alavancagem + 1 if tipo == 'predicao' else alavancagem
+    t_crit = stats.t.ppf((1 + nivel_confianca) / 2, ajuste['gl'])[..., None]
+    margem = t_crit * ajuste['sigma'][..., None] * np.sqrt(variancia)
+
+    return {
+        'previsao': previsao,
+        'inferior': previsao - margem,
+        'superior': previsao + margem,
+    }
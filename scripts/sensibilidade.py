@@ -0,0 +1,211 @@
+"""
+================================================================================
+SENSIBILIDADE - GRADE FATORIAL COMPLETA DOS DRIVERS
+Um único cálculo vetorizado (broadcast, em blocos) → qualquer fatia 1-D/2-D
+================================================================================
+
+Em vez de variar um fator por vez ou preencher matrizes com laços, o modelo é
+avaliado em todas as combinações de uma grade N-dimensional (p.ex. 100^4
+pontos). Curvas de sensibilidade e heatmaps saem como fatias do mesmo tensor,
+sem recalcular nada.
+
+Uso:
+    from sensibilidade import GradeFatorial
+    grade = GradeFatorial({'desemprego': np.linspace(5, 15, 100),
+                           'pib': np.linspace(-2, 5, 100),
+                           'inflacao': np.linspace(2, 10, 100),
+                           'sm_real': np.linspace(0, 5, 100)})
+    curva = grade.fatia(desemprego=np.linspace(5, 15, 100), pib=2.0,
+                        inflacao=5.5, sm_real=2.0)
+    matriz = grade.fatia_2d('inflacao', 'desemprego', pib=2.0, sm_real=2.0)
+================================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+from modelo_salarial import DRIVERS, MODELO_PADRAO
+
+# Elementos por bloco de cálculo (saída + buffer auxiliar ≈ 2 × 8 × 2^22 = 64 MB)
+TAMANHO_BLOCO_PADRAO = 2**22
+
+
+class GradeFatorial:
+    """
+    Tensor de resultados do modelo em todas as combinações dos eixos
+
+    Parâmetros:
+    -----------
+    eixos : dict - nome do driver → valores (1-D); a ordem define os eixos
+            do tensor (padrão do modelo: desemprego, pib, inflacao, sm_real)
+    funcao : callable - Modelo vetorizado f(**drivers, out=...); cada eixo é
+             passado pelo nome, então a ordem dos eixos é livre (padrão
+             modelo_salarial.MODELO_PADRAO)
+    tamanho_bloco : int - Máximo de pontos calculados por vez; limita a
+                    memória dos temporários
+    arquivo : str opcional - Grava o tensor em um .npy mapeado em memória
+              (para grades que não cabem na RAM)
+
+    Atributos:
+    ----------
+    eixos : dict - Valores ordenados e únicos de cada eixo
+    valores : ndarray - Tensor com formato (len(eixo_1), ..., len(eixo_N))
+    """
+
+    def __init__(self, eixos, funcao=MODELO_PADRAO,
+                 tamanho_bloco=TAMANHO_BLOCO_PADRAO, arquivo=None):
+        if not eixos:
+            raise ValueError("Informe ao menos um eixo")
+        self.eixos = {}
+        for nome, valores in eixos.items():
+            valores = np.unique(np.asarray(valores, dtype=np.float64))
+            if valores.ndim != 1 or valores.size == 0:
+                raise ValueError(f"Eixo '{nome}' deve ser 1-D e não vazio")
+            self.eixos[nome] = valores
+
+        forma = tuple(len(v) for v in self.eixos.values())
+        if arquivo is None:
+            self.valores = np.empty(forma, dtype=np.float64)
+        else:
+            self.valores = np.lib.format.open_memmap(arquivo, mode='w+',
+                                                     dtype=np.float64, shape=forma)
+
+        # Blocos ao longo do primeiro eixo: cada bloco é um broadcast das
+        # fatias dos eixos, escrito direto na região correspondente do tensor
+        pontos_por_linha = int(np.prod(forma[1:], dtype=np.int64))
+        linhas_por_bloco = max(1, tamanho_bloco // max(pontos_por_linha, 1))
+        primeiro, *demais = self.eixos.values()
+        for inicio in range(0, forma[0], linhas_por_bloco):
+            fim = min(inicio + linhas_por_bloco, forma[0])
+            grade = np.ix_(primeiro[inicio:fim], *demais)
+            funcao(**dict(zip(self.eixos, grade)), out=self.valores[inicio:fim])
+
+        if arquivo is not None:
+            self.valores.flush()
+
+    @classmethod
+    def uniforme(cls, limites, n_pontos=100, **kwargs):
+        """
+        Grade com `n_pontos` igualmente espaçados em cada eixo
+
+        Parâmetros:
+        -----------
+        limites : dict - nome → (mínimo, máximo)
+        n_pontos : int - Pontos por eixo (100 → 100^4 = 10^8 pontos com 4 drivers)
+        """
+        return cls({nome: np.linspace(minimo, maximo, n_pontos)
+                    for nome, (minimo, maximo) in limites.items()}, **kwargs)
+
+    @property
+    def nomes(self):
+        return list(self.eixos)
+
+    def indices(self, nome, valores):
+        """Posições de `valores` no eixo `nome` (precisam estar na grade)"""
+        if nome not in self.eixos:
+            raise KeyError(f"Eixo desconhecido: '{nome}' (eixos: {self.nomes})")
+        eixo = self.eixos[nome]
+        valores = np.asarray(valores, dtype=np.float64)
+        posicoes = np.clip(np.searchsorted(eixo, valores), 0, len(eixo) - 1)
+        # O vizinho da esquerda pode ser o mais próximo
+        esquerda = np.clip(posicoes - 1, 0, len(eixo) - 1)
+        posicoes = np.where(np.abs(eixo[esquerda] - valores) < np.abs(eixo[posicoes] - valores),
+                            esquerda, posicoes)
+        fora = ~np.isclose(eixo[posicoes], valores, rtol=1e-12, atol=1e-12)
+        if np.any(fora):
+            raise ValueError(f"Valores fora da grade do eixo '{nome}': "
+                             f"{np.atleast_1d(valores)[np.atleast_1d(fora)]}")
+        return posicoes
+
+    def fatia(self, **selecao):
+        """
+        Sub-tensor sem recálculo
+
+        Cada eixo pode receber um escalar (eixo fixado e removido), uma lista
+        de valores (eixo mantido só nesses pontos, na ordem dada) ou ficar de
+        fora (eixo inteiro).
+
+        Retorna:
+        --------
+        ndarray - Eixos restantes na ordem da grade
+        """
+        desconhecidos = set(selecao) - set(self.eixos)
+        if desconhecidos:
+            raise KeyError(f"Eixos desconhecidos: {sorted(desconhecidos)} (eixos: {self.nomes})")
+
+        # Escalares e eixos inteiros por indexação básica; listas depois com
+        # np.take, eixo a eixo (produto cartesiano, não pares de índices)
+        indexador, listas = [], {}
+        for nome in self.eixos:
+            if nome in selecao and np.ndim(selecao[nome]) == 0:
+                indexador.append(int(self.indices(nome, selecao[nome])))
+            else:
+                indexador.append(slice(None))
+                if nome in selecao:
+                    listas[nome] = self.indices(nome, selecao[nome])
+
+        resultado = self.valores[tuple(indexador)]
+        eixo = 0
+        for nome, ind in zip(self.eixos, indexador):
+            if isinstance(ind, int):
+                continue
+            if nome in listas:
+                resultado = np.take(resultado, listas[nome], axis=eixo)
+            eixo += 1
+        return np.array(resultado)
+
+    def fatia_2d(self, linhas, colunas, **selecao):
+        """
+        Tabela 2-D (p.ex. um heatmap) com os demais eixos fixados
+
+        Parâmetros:
+        -----------
+        linhas, colunas : str - Eixos da tabela
+        selecao : Valores dos demais eixos (escalares) e, opcionalmente,
+                  listas de pontos para `linhas`/`colunas`
+
+        Retorna:
+        --------
+        DataFrame - índice = valores de `linhas`, colunas = valores de `colunas`
+        """
+        livres = [n for n in self.eixos if n not in selecao or n in (linhas, colunas)]
+        if (sorted(livres) != sorted([linhas, colunas]) or linhas == colunas
+                or any(np.ndim(selecao.get(n, [])) == 0 for n in (linhas, colunas))):
+            raise ValueError(f"Fixe todos os eixos exceto '{linhas}' e '{colunas}' "
+                             f"(livres agora: {livres})")
+
+        tabela = self.fatia(**selecao)
+        if self.nomes.index(linhas) > self.nomes.index(colunas):
+            tabela = tabela.T
+        valores_linhas = np.asarray(selecao.get(linhas, self.eixos[linhas]), dtype=np.float64)
+        valores_colunas = np.asarray(selecao.get(colunas, self.eixos[colunas]), dtype=np.float64)
+        return pd.DataFrame(tabela,
+                            index=pd.Index(valores_linhas, name=linhas),
+                            columns=pd.Index(valores_colunas, name=colunas))
+
+
+def eixos_do_modelo(*listas_de_eixos):
+    """
+    União, eixo a eixo, de vários conjuntos de pontos dos drivers do modelo
+
+    Útil para montar uma única grade que contém as varreduras 1-D, os pontos
+    de um heatmap e o cenário base.
+
+    Parâmetros:
+    -----------
+    listas_de_eixos : dicts - nome do driver → valores (escalar ou lista)
+
+    Retorna:
+    --------
+    dict - Driver → valores únicos ordenados, na ordem de DRIVERS
+    """
+    eixos = {nome: np.empty(0) for nome in DRIVERS}
+    for pontos in listas_de_eixos:
+        for nome, valores in pontos.items():
+            if nome not in eixos:
+                raise KeyError(f"Driver desconhecido: '{nome}' (drivers: {DRIVERS})")
+            eixos[nome] = np.union1d(eixos[nome], np.atleast_1d(valores).astype(np.float64))
+    vazios = [nome for nome, valores in eixos.items() if valores.size == 0]
+    if vazios:
+        raise ValueError(f"Sem valores para os drivers: {vazios}")
+    return eixos
@@ -5,66 +5,34 @@ Análise de Sensibilidade + Monte Carlo + Stress Testing
 ================================================================================
 """
 
+import os
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
+from modelo_salarial import MODELO_PADRAO
+from monte_carlo import TAMANHO_BLOCO_PADRAO, executar_monte_carlo_adaptativo
+from sensibilidade import GradeFatorial, eixos_do_modelo
+from indices_sobol import indices_sobol
+from armazenamento_monte_carlo import caminho_saida, carregar_monte_carlo, gravar_monte_carlo
+from teste_estresse import avaliar_biblioteca, biblioteca_estresse, estresse_reverso
 import warnings
 warnings.filterwarnings('ignore')
 
 # Configuração
-np.random.seed(42)
+SEMENTE = 42
 plt.style.use('seaborn-v0_8-whitegrid')
+QUEDAS_ESTRESSE = [5, 10, 15, 20]  # Estresse reverso: quedas (%) do salário real
 
 # ============================================================================
-# PARÂMETROS DO MODELO
+# PARÂMETROS DO MODELO (ver modelo_salarial.py)
 # ============================================================================
 
 print("="*80)
 print("SIMULADOR AVANÇADO: ANÁLISE DE SENSIBILIDADE")
 print("="*80)
 
-# Base
-salario_base_2024 = 930
-
-# Elasticidades (baseadas na análise de regressão)
-ELASTICIDADE_DESEMPREGO = -2.0  # Cada 1pp desemprego → -2% salário
-ELASTICIDADE_PIB = 0.3          # Cada 1% PIB → +0.3% salário
-ELASTICIDADE_SM = 0.4           # SM explica 40% do movimento de P50
-ELASTICIDADE_INFLACAO = -0.5    # Inflação acima meta corrói ganhos
-
-# ============================================================================
-# FUNÇÃO: SIMULAR SALÁRIO 2026
-# ============================================================================
-
-def simular_salario_2026(desemprego, pib, inflacao, sm_real, base=salario_base_2024):
-    """
-    Simula salário 2026 baseado em drivers macroeconômicos
-    
-    Parâmetros:
-    -----------
-    desemprego : float - Taxa de desemprego (%)
-    pib : float - Crescimento PIB (%)
-    inflacao : float - Inflação anual (%)
-    sm_real : float - Ganho real salário mínimo (%)
-    base : float - Salário base 2024
-    
-    Retorna:
-    --------
-    float - Salário projetado 2026
-    """
-    
-    # Impactos
-    impacto_desemp = ELASTICIDADE_DESEMPREGO * (desemprego - 6.6)
-    impacto_pib = ELASTICIDADE_PIB * pib
-    impacto_sm = ELASTICIDADE_SM * sm_real
-    impacto_inflacao = ELASTICIDADE_INFLACAO * (inflacao - 3.0)
-    
-    # Total
-    impacto_total = impacto_desemp + impacto_pib + impacto_sm + impacto_inflacao
-    
-    return base * (1 + impacto_total/100)
+# Modelo compartilhado com o dashboard e as previsões
+modelo = MODELO_PADRAO
+salario_base_2024 = modelo.base
 
 # ============================================================================
 # 1. ANÁLISE DE SENSIBILIDADE: UM FATOR POR VEZ
@@ -79,25 +47,30 @@ pib_base = 2.0
 infl_base = 5.5
 sm_base = 2.0
 
-# Testar desemprego
+# Varreduras de um fator (50 pontos cada)
 desemp_range = np.linspace(5, 12, 50)
-salarios_desemp = [simular_salario_2026(d, pib_base, infl_base, sm_base) 
-                   for d in desemp_range]
-
-# Testar PIB
 pib_range = np.linspace(-1, 4, 50)
-salarios_pib = [simular_salario_2026(desemp_base, p, infl_base, sm_base) 
-                for p in pib_range]
-
-# Testar inflação
 infl_range = np.linspace(3, 8, 50)
-salarios_infl = [simular_salario_2026(desemp_base, pib_base, i, sm_base) 
-                 for i in infl_range]
-
-# Testar SM
 sm_range = np.linspace(0, 4, 50)
-salarios_sm = [simular_salario_2026(desemp_base, pib_base, infl_base, s) 
-               for s in sm_range]
+
+# Pontos da matriz de cenários (seção 4)
+desemp_grid = [6, 7, 8, 9, 10]
+infl_grid = [4, 5, 6, 7, 8]
+
+# Grade fatorial completa: todas as combinações dos pontos acima, calculadas
+# de uma vez; as curvas e a matriz são fatias dela (ver sensibilidade.py)
+cenario_base = {'desemprego': desemp_base, 'pib': pib_base,
+                'inflacao': infl_base, 'sm_real': sm_base}
+grade = GradeFatorial(eixos_do_modelo(
+    cenario_base,
+    {'desemprego': desemp_range, 'pib': pib_range, 'inflacao': infl_range, 'sm_real': sm_range},
+    {'desemprego': desemp_grid, 'inflacao': infl_grid},
+), funcao=modelo)
+
+salarios_desemp = grade.fatia(**{**cenario_base, 'desemprego': desemp_range})
+salarios_pib = grade.fatia(**{**cenario_base, 'pib': pib_range})
+salarios_infl = grade.fatia(**{**cenario_base, 'inflacao': infl_range})
+salarios_sm = grade.fatia(**{**cenario_base, 'sm_real': sm_range})
 
 # Gráfico de sensibilidade
 fig, axes = plt.subplots(2, 2, figsize=(14, 10))
@@ -148,53 +121,79 @@ print(f"  PIB: Variação de -1% → +4% causa R${salarios_pib[-1] - salarios_pi
 print(f"  Inflação: Variação de 3% → 8% causa R${salarios_infl[-1] - salarios_infl[0]:.0f} de perda")
 print(f"  SM: Variação de 0% → 4% causa R${salarios_sm[-1] - salarios_sm[0]:.0f} de ganho")
 
+# Sensibilidade global: fração da variância do salário 2026 devida a cada
+# driver (S1) e incluindo interações (ST), com as distribuições do Monte Carlo
+df_sobol = indices_sobol(modelo, n_base=2**14, n_bootstrap=500, semente=SEMENTE)
+
+print("\nÍndices de Sobol (IC 95% bootstrap):")
+for _, linha in df_sobol.iterrows():
+    print(f"  {linha['fator']:<11} S1 = {linha['S1']:.3f} [{linha['S1_inf']:.3f}, {linha['S1_sup']:.3f}]"
+          f" | ST = {linha['ST']:.3f} [{linha['ST_inf']:.3f}, {linha['ST_sup']:.3f}]")
+
 # ============================================================================
 # 2. SIMULAÇÃO MONTE CARLO: 10.000 CENÁRIOS
 # ============================================================================
 
+n_simulacoes = 10000
+MC_ADAPTATIVO = False  # True: lotes até os ICs atingirem TOLERANCIAS_MC (n_simulacoes vira resultado)
+TOLERANCIAS_MC = {'P5': 2.0, 'P95': 2.0, 'Prob. Queda >5%': 0.25}  # meia-largura IC 95% (R$ / pp)
+PERCENTIS_MC = []  # percentis extras do modo adaptativo (p.ex. [1] → tolerância em 'P1')
+QUEDAS_MC = []     # quedas extras, % (p.ex. [10] → tolerância em 'Prob. Queda >10%')
+N_WORKERS = None  # None = todos os núcleos (blocos e sementes independem disso)
+FORMATO_SAIDA_MC = 'csv'  # 'csv' | 'npy' (memory-mapped) | 'parquet' (comprimido)
+DESTINO_MC = '../dados/monte_carlo_10k'
+TAMANHO_LOTE_MC = 10_000  # draws por lote do modo adaptativo
+AMOSTRADOR_MC = 'normal'  # 'normal' | 'sobol' | 'halton' | 'lhs' (ver monte_carlo.py)
+
 print("\n" + "="*80)
-print("2. SIMULAÇÃO MONTE CARLO (10.000 Cenários)")
+print(f"2. SIMULAÇÃO MONTE CARLO ({'Adaptativa' if MC_ADAPTATIVO else f'{n_simulacoes:,} Cenários'.replace(',', '.')})")
 print("="*80)
 
-n_simulacoes = 10000
-
-# Distribuições dos parâmetros (baseado em ranges plausíveis)
-desemp_sim = np.random.normal(7.5, 1.5, n_simulacoes)  # média 7.5%, sd 1.5%
-pib_sim = np.random.normal(2.0, 1.0, n_simulacoes)     # média 2%, sd 1%
-infl_sim = np.random.normal(5.5, 1.0, n_simulacoes)    # média 5.5%, sd 1%
-sm_sim = np.random.normal(2.0, 0.8, n_simulacoes)      # média 2%, sd 0.8%
-
-# Truncar valores irrealistas
-desemp_sim = np.clip(desemp_sim, 5, 15)
-pib_sim = np.clip(pib_sim, -2, 5)
-infl_sim = np.clip(infl_sim, 3, 10)
-sm_sim = np.clip(sm_sim, 0, 5)
-
-# Simular salários
-salarios_simulados = []
-for i in range(n_simulacoes):
-    sal = simular_salario_2026(desemp_sim[i], pib_sim[i], infl_sim[i], sm_sim[i])
-    salarios_simulados.append(sal)
-
-salarios_simulados = np.array(salarios_simulados)
-
-# Estatísticas
-media = np.mean(salarios_simulados)
-mediana = np.median(salarios_simulados)
-std = np.std(salarios_simulados)
-p5 = np.percentile(salarios_simulados, 5)
-p95 = np.percentile(salarios_simulados, 95)
-
-print(f"\nDistribuição de Resultados (10.000 simulações):")
+# Distribuições dos parâmetros em monte_carlo.DISTRIBUICOES
+# (normais truncadas em ranges plausíveis, uma semente por bloco)
+if MC_ADAPTATIVO:
+    # Só o resumo em memória; os n draws usados são regravados em blocos abaixo
+    adaptativo = executar_monte_carlo_adaptativo(TOLERANCIAS_MC, tamanho_lote=TAMANHO_LOTE_MC,
+                                                 semente=SEMENTE, n_workers=N_WORKERS,
+                                                 amostrador=AMOSTRADOR_MC,
+                                                 percentis=PERCENTIS_MC, quedas=QUEDAS_MC)
+    n_simulacoes = adaptativo['n_simulacoes']
+
+    print(f"\nModo adaptativo: {n_simulacoes:,} simulações".replace(',', '.')
+          + ("" if adaptativo['convergiu'] else " (⚠️ limite atingido sem a precisão pedida)"))
+    for _, linha in adaptativo['precisao'].iterrows():
+        print(f"  {linha['estatistica']}: {linha['valor']:.2f} ± {linha['meia_largura']:.2f}"
+              f" (tolerância {linha['tolerancia']})")
+
+# Draws gravados bloco a bloco (com o resumo na mesma passada) e lidos de
+# volta do disco: com FORMATO_SAIDA_MC = 'npy' a leitura é zero-cópia.
+# No modo adaptativo os blocos são os lotes (mesmos draws usados na parada)
+acumulador_mc = gravar_monte_carlo(DESTINO_MC, n_simulacoes, FORMATO_SAIDA_MC, semente=SEMENTE,
+                                   tamanho_bloco=TAMANHO_LOTE_MC if MC_ADAPTATIVO else TAMANHO_BLOCO_PADRAO,
+                                   n_workers=N_WORKERS, amostrador=AMOSTRADOR_MC)
+draws_mc = carregar_monte_carlo(DESTINO_MC, FORMATO_SAIDA_MC, colunas=['salario_2026'])
+salarios_simulados = np.asarray(draws_mc['salario_2026'])
+
+rotulo_n = f'{n_simulacoes:,}'.replace(',', '.')
+
+# Estatísticas (acumuladores streaming, mescláveis entre blocos)
+resumo_mc = acumulador_mc.resumo()
+media = resumo_mc['Média']
+mediana = resumo_mc['Mediana']
+std = resumo_mc['Desvio Padrão']
+p5 = resumo_mc['P5']
+p95 = resumo_mc['P95']
+
+print(f"\nDistribuição de Resultados ({rotulo_n} simulações):")
 print(f"  Média: R${media:.0f}")
 print(f"  Mediana: R${mediana:.0f}")
 print(f"  Desvio Padrão: R${std:.0f}")
 print(f"  Intervalo 90% (P5-P95): R${p5:.0f} - R${p95:.0f}")
 
 # Probabilidades
-prob_queda = (salarios_simulados < salario_base_2024).sum() / n_simulacoes * 100
-prob_ganho = (salarios_simulados > salario_base_2024).sum() / n_simulacoes * 100
-prob_queda_forte = (salarios_simulados < salario_base_2024 * 0.95).sum() / n_simulacoes * 100
+prob_queda = resumo_mc['Prob. Queda']
+prob_ganho = resumo_mc['Prob. Ganho']
+prob_queda_forte = resumo_mc['Prob. Queda >5%']
 
 print(f"\nProbabilidades:")
 print(f"  Queda vs 2024: {prob_queda:.1f}%")
@@ -213,7 +212,7 @@ ax.axvline(salario_base_2024, color='green', linestyle='-', linewidth=2,
 
 ax.set_xlabel('Salário Real 2026 (R$)', fontweight='bold', fontsize=12)
 ax.set_ylabel('Frequência', fontweight='bold', fontsize=12)
-ax.set_title('Distribuição de Resultados - Monte Carlo (10.000 Simulações)', 
+ax.set_title(f'Distribuição de Resultados - Monte Carlo ({rotulo_n} Simulações)', 
              fontweight='bold', fontsize=14)
 ax.legend(fontsize=10)
 ax.grid(True, alpha=0.3)
@@ -233,62 +232,52 @@ print("\n" + "="*80)
 print("3. STRESS TEST: Cenários Extremos")
 print("="*80)
 
-stress_scenarios = {
-    'Crise Severa': {
-        'desemprego': 12.0,
-        'pib': -2.0,
-        'inflacao': 8.0,
-        'sm_real': 0.0
-    },
-    'Estagflação': {
-        'desemprego': 10.0,
-        'pib': 0.0,
-        'inflacao': 7.0,
-        'sm_real': 1.0
-    },
-    'Boom Insustentável': {
-        'desemprego': 5.0,
-        'pib': 4.0,
-        'inflacao': 6.0,
-        'sm_real': 3.0
-    },
-    'Ajuste Recessivo': {
-        'desemprego': 9.0,
-        'pib': 0.5,
-        'inflacao': 5.0,
-        'sm_real': 1.5
-    }
-}
+# Biblioteca: os 4 cenários clássicos + todas as combinações de níveis
+# nomeados dos drivers, avaliados em uma única chamada (ver teste_estresse.py)
+biblioteca = avaliar_biblioteca(biblioteca_estresse(), modelo)
+classicos = biblioteca[biblioteca['familia'] == 'classico']
 
 print("\nResultados Stress Test:")
-stress_results = []
-
-for nome, params in stress_scenarios.items():
-    sal = simular_salario_2026(
-        params['desemprego'],
-        params['pib'],
-        params['inflacao'],
-        params['sm_real']
-    )
-    var = ((sal / salario_base_2024) - 1) * 100
-    
-    stress_results.append({
-        'Cenário': nome,
-        'Salário': sal,
-        'Variação (%)': var,
-        'Desemprego': params['desemprego'],
-        'PIB': params['pib'],
-        'Inflação': params['inflacao']
-    })
-    
-    print(f"\n  {nome}:")
-    print(f"    Salário 2026: R${sal:.0f} ({var:+.1f}%)")
-    print(f"    Premissas: Desemp {params['desemprego']}% | PIB {params['pib']:+.1f}% | " 
-          f"Infl {params['inflacao']}%")
-
-df_stress = pd.DataFrame(stress_results)
+for _, linha in classicos.iterrows():
+    print(f"\n  {linha['cenario']}:")
+    print(f"    Salário 2026: R${linha['salario']:.0f} ({linha['variacao']:+.1f}%)")
+    print(f"    Premissas: Desemp {linha['desemprego']}% | PIB {linha['pib']:+.1f}% | "
+          f"Infl {linha['inflacao']}%")
+
+print(f"\nBiblioteca: {len(biblioteca)} cenários | queda >10% em "
+      f"{(biblioteca['variacao'] <= -10).sum()} | pior: R${biblioteca['salario'].min():.0f}")
+print("  Mais plausíveis com queda >10%:")
+for _, linha in (biblioteca[biblioteca['variacao'] <= -10]
+                 .nsmallest(5, 'distancia').iterrows()):
+    print(f"    {linha['cenario']}: {linha['variacao']:+.1f}% "
+          f"({linha['distancia']:.1f}σ, plausibilidade {linha['plausibilidade']:.1%})")
+
+df_stress = biblioteca.rename(columns={
+    'cenario': 'Cenário', 'salario': 'Salário', 'variacao': 'Variação (%)',
+    'desemprego': 'Desemprego', 'pib': 'PIB', 'inflacao': 'Inflação', 'sm_real': 'SM Real',
+    'familia': 'Família', 'distancia': 'Distância (σ)', 'plausibilidade': 'Plausibilidade',
+    'dentro_limites': 'Dentro dos Limites MC',
+})[['Cenário', 'Salário', 'Variação (%)', 'Desemprego', 'PIB', 'Inflação', 'SM Real',
+    'Família', 'Distância (σ)', 'Plausibilidade', 'Dentro dos Limites MC']]
 df_stress.to_csv('../dados/stress_test_resultados.csv', index=False)
 
+# Estresse reverso: a combinação de drivers mais plausível (menor distância
+# às médias do Monte Carlo, em desvios padrão) que produz cada queda
+print("\nEstresse Reverso: cenário mais plausível para cada queda")
+estresse = estresse_reverso(QUEDAS_ESTRESSE, modelo, semente=SEMENTE)
+estresse['prob_monte_carlo'] = [np.mean(salarios_simulados <= salario_base_2024 * (1 - q / 100)) * 100
+                                for q in estresse['queda']]
+for _, linha in estresse.iterrows():
+    if not linha['viavel']:
+        print(f"\n  Queda {linha['queda']:.0f}%: inatingível dentro dos limites do Monte Carlo")
+        continue
+    print(f"\n  Queda {linha['queda']:.0f}% (R${linha['salario']:.0f}): "
+          f"{linha['distancia']:.2f}σ das médias | plausibilidade {linha['plausibilidade']:.2%}"
+          f" | Monte Carlo: {linha['prob_monte_carlo']:.1f}% dos cenários")
+    print(f"    Drivers: Desemp {linha['desemprego']:.1f}% | PIB {linha['pib']:+.1f}% | "
+          f"Infl {linha['inflacao']:.1f}% | SM {linha['sm_real']:+.1f}%")
+estresse.to_csv('../dados/estresse_reverso.csv', index=False)
+
 # ============================================================================
 # 4. MATRIZ DE CENÁRIOS: DESEMPREGO vs INFLAÇÃO
 # ============================================================================
@@ -297,15 +286,9 @@ print("\n" + "="*80)
 print("4. MATRIZ DE CENÁRIOS: Desemprego vs Inflação")
 print("="*80)
 
-# Grid
-desemp_grid = [6, 7, 8, 9, 10]
-infl_grid = [4, 5, 6, 7, 8]
-
-matriz = np.zeros((len(infl_grid), len(desemp_grid)))
-
-for i, infl in enumerate(infl_grid):
-    for j, desemp in enumerate(desemp_grid):
-        matriz[i, j] = simular_salario_2026(desemp, pib_base, infl, sm_base)
+# Fatia 2-D da grade fatorial da seção 1 (sem recálculo)
+matriz = grade.fatia_2d('inflacao', 'desemprego', inflacao=infl_grid, desemprego=desemp_grid,
+                        pib=pib_base, sm_real=sm_base).to_numpy()
 
 # Heatmap
 fig, ax = plt.subplots(figsize=(10, 8))
@@ -344,27 +327,15 @@ print("\n✅ Matriz de cenários gerada: 14_matriz_cenarios.png")
 # SALVAR RESULTADOS
 # ============================================================================
 
-# Salvar simulação Monte Carlo
-df_monte_carlo = pd.DataFrame({
-    'desemprego': desemp_sim,
-    'pib': pib_sim,
-    'inflacao': infl_sim,
-    'sm_real': sm_sim,
-    'salario_2026': salarios_simulados
-})
-
-df_monte_carlo.to_csv('../dados/monte_carlo_10k.csv', index=False)
+# Simulação Monte Carlo: gravada em blocos na seção 2 (ver armazenamento_monte_carlo.py)
 
 # Resumo estatístico
-resumo = {
-    'estatistica': ['Média', 'Mediana', 'Desvio Padrão', 'P5', 'P95', 
-                    'Prob. Queda', 'Prob. Ganho', 'Prob. Queda >5%'],
-    'valor': [media, mediana, std, p5, p95, prob_queda, prob_ganho, prob_queda_forte]
-}
-
-df_resumo = pd.DataFrame(resumo)
+df_resumo = acumulador_mc.para_dataframe()
 df_resumo.to_csv('../dados/monte_carlo_resumo.csv', index=False)
 
+# Índices de Sobol
+df_sobol.to_csv('../dados/indices_sobol.csv', index=False)
+
 print("\n" + "="*80)
 print("✅ SIMULAÇÃO COMPLETA!")
 print("="*80)
@@ -372,7 +343,9 @@ print("\nArquivos gerados:")
 print("  - 12_analise_sensibilidade.png")
 print("  - 13_monte_carlo.png")
 print("  - 14_matriz_cenarios.png")
-print("  - monte_carlo_10k.csv")
+print(f"  - {os.path.basename(caminho_saida('monte_carlo_10k', FORMATO_SAIDA_MC))}")
 print("  - monte_carlo_resumo.csv")
+print("  - indices_sobol.csv")
 print("  - stress_test_resultados.csv")
+print("  - estresse_reverso.csv")
 
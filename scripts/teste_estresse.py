@@ -0,0 +1,210 @@
+"""
+================================================================================
+TESTE DE ESTRESSE - BIBLIOTECA DE CENÁRIOS + ESTRESSE REVERSO
+Centenas de cenários nomeados em lote | Drivers mais plausíveis para uma queda
+================================================================================
+
+Estresse direto: a biblioteca combina níveis nomeados de cada driver
+(p.ex. "Desemprego severo + Recessão + Inflação alta + SM congelado") com
+os cenários clássicos do simulador, e todos são avaliados em uma única
+chamada do modelo vetorizado.
+
+Estresse reverso: dada uma queda do salário real (p.ex. 10%), qual a
+combinação de drivers MAIS PLAUSÍVEL que a produz? Plausibilidade vem das
+distribuições do Monte Carlo (monte_carlo.DISTRIBUICOES): com os drivers
+padronizados z = (x - média) / desvio, a distância d = ||z|| mede quão
+extremo é o cenário (d² ~ χ² com 4 g.l. sem o truncamento) e o mais
+plausível é o de menor d dentro dos limites e com a queda pedida.
+
+A busca é em lote: pontos Sobol cobrem a caixa dos limites, os viáveis de
+menor distância viram o centro de uma caixa menor, e assim por diante. Só
+usa avaliações do modelo (vale para qualquer modelo vetorizado, não só o
+linear), e várias quedas são resolvidas nas mesmas avaliações.
+
+Uso:
+    from teste_estresse import avaliar_biblioteca, biblioteca_estresse, estresse_reverso
+    resultados = avaliar_biblioteca(biblioteca_estresse())
+    estresse_reverso(quedas=[10])
+================================================================================
+"""
+
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.stats import qmc
+
+from modelo_salarial import DRIVERS, MODELO_PADRAO
+from monte_carlo import DISTRIBUICOES
+
+# Cenários históricos do simulador (mantidos no início da biblioteca)
+CENARIOS_CLASSICOS = {
+    'Crise Severa': {'desemprego': 12.0, 'pib': -2.0, 'inflacao': 8.0, 'sm_real': 0.0},
+    'Estagflação': {'desemprego': 10.0, 'pib': 0.0, 'inflacao': 7.0, 'sm_real': 1.0},
+    'Boom Insustentável': {'desemprego': 5.0, 'pib': 4.0, 'inflacao': 6.0, 'sm_real': 3.0},
+    'Ajuste Recessivo': {'desemprego': 9.0, 'pib': 0.5, 'inflacao': 5.0, 'sm_real': 1.5},
+}
+
+# Níveis nomeados de cada driver; a biblioteca é o produto de todos
+NIVEIS_ESTRESSE = {
+    'desemprego': {'Desemprego baixo': 5.5, 'Desemprego moderado': 7.5, 'Desemprego alto': 9.5,
+                   'Desemprego severo': 12.0, 'Desemprego extremo': 15.0},
+    'pib': {'Depressão': -2.0, 'Recessão': -0.5, 'Estagnação': 0.5, 'PIB moderado': 2.0,
+            'PIB forte': 4.0},
+    'inflacao': {'Inflação na meta': 3.5, 'Inflação elevada': 6.0, 'Inflação alta': 8.0,
+                 'Inflação descontrolada': 10.0},
+    'sm_real': {'SM congelado': 0.0, 'SM moderado': 1.5, 'SM forte': 3.0},
+}
+
+QUEDAS_PADRAO = (5, 10, 15, 20)  # % abaixo do salário base
+
+# ============================================================================
+# PLAUSIBILIDADE
+# ============================================================================
+
+def _parametros(distribuicoes):
+    return (np.array([distribuicoes[d][i] for d in DRIVERS]) for i in range(4))
+
+
+def plausibilidade(drivers, distribuicoes=DISTRIBUICOES):
+    """
+    Distância e plausibilidade de cenários segundo as distribuições do Monte Carlo
+
+    Parâmetros:
+    -----------
+    drivers : array (..., 4) - Drivers na ordem de DRIVERS
+    distribuicoes : dict - (média, desvio, mínimo, máximo) de cada driver
+
+    Retorna:
+    --------
+    dict - 'distancia' (desvios padrão, ||z||), 'plausibilidade' (P de um
+           cenário ao menos tão distante: χ² com 4 g.l.) e 'dentro' (todos
+           os drivers nos limites do Monte Carlo)
+    """
+    media, desvio, minimo, maximo = _parametros(distribuicoes)
+    drivers = np.asarray(drivers, dtype=np.float64)
+    distancia = np.sqrt(np.sum(((drivers - media) / desvio) ** 2, axis=-1))
+    return {
+        'distancia': distancia,
+        'plausibilidade': stats.chi2.sf(distancia ** 2, len(DRIVERS)),
+        'dentro': np.all((drivers >= minimo) & (drivers <= maximo), axis=-1),
+    }
+
+
+def _avaliar(drivers, modelo, base):
+    return modelo(*(drivers[..., i] for i in range(len(DRIVERS))), base=base)
+
+# ============================================================================
+# BIBLIOTECA DE CENÁRIOS
+# ============================================================================
+
+def biblioteca_estresse(niveis=NIVEIS_ESTRESSE, classicos=CENARIOS_CLASSICOS):
+    """
+    Cenários nomeados: os clássicos + todas as combinações dos níveis
+
+    Retorna:
+    --------
+    DataFrame - cenario, familia ('classico' ou 'combinacao') e os drivers
+    """
+    linhas = [{'cenario': nome, 'familia': 'classico', **drivers}
+              for nome, drivers in classicos.items()]
+    for combinacao in product(*(niveis[d].items() for d in DRIVERS)):
+        linhas.append({'cenario': ' + '.join(nome for nome, _ in combinacao),
+                       'familia': 'combinacao',
+                       **{d: valor for d, (_, valor) in zip(DRIVERS, combinacao)}})
+    return pd.DataFrame(linhas)
+
+
+def avaliar_biblioteca(biblioteca, modelo=MODELO_PADRAO, base=MODELO_PADRAO.base,
+                       distribuicoes=DISTRIBUICOES):
+    """
+    Salário, variação e plausibilidade de todos os cenários em uma passada
+
+    Retorna:
+    --------
+    DataFrame - A biblioteca + salario, variacao (%), distancia (σ),
+                plausibilidade e dentro_limites
+    """
+    drivers = biblioteca[DRIVERS].to_numpy(dtype=np.float64)
+    salario = _avaliar(drivers, modelo, base)
+    medida = plausibilidade(drivers, distribuicoes)
+    return biblioteca.assign(salario=salario, variacao=(salario / base - 1) * 100,
+                             distancia=medida['distancia'],
+                             plausibilidade=medida['plausibilidade'],
+                             dentro_limites=medida['dentro'])
+
+# ============================================================================
+# ESTRESSE REVERSO
+# ============================================================================
+
+def estresse_reverso(quedas=QUEDAS_PADRAO, modelo=MODELO_PADRAO,
+                     base=MODELO_PADRAO.base, distribuicoes=DISTRIBUICOES,
+                     n_candidatos=2**13, n_iteracoes=30, contracao=0.7, semente=42):
+    """
+    Drivers mais plausíveis que levam o salário a cair ao menos `queda`%
+
+    Parâmetros:
+    -----------
+    quedas : list - Quedas em % do salário base (resolvidas juntas)
+    modelo : callable - Modelo vetorizado (desemprego, pib, inflacao,
+             sm_real, base=) → salário
+    base : float - Salário base
+    distribuicoes : dict - Distribuições do Monte Carlo (média, desvio e
+                    limites da busca)
+    n_candidatos : int - Pontos Sobol por iteração e por queda
+    n_iteracoes : int - Refinamentos da caixa de busca
+    contracao : float - Fator de redução da caixa a cada iteração
+    semente : int - Semente do embaralhamento Sobol
+
+    Retorna:
+    --------
+    DataFrame - Uma linha por queda: drivers, salario, variacao (%),
+                distancia (σ), plausibilidade e viavel (False se nenhum
+                ponto nos limites atinge a queda)
+    """
+    quedas = np.atleast_1d(np.asarray(quedas, dtype=np.float64))
+    media, desvio, minimo, maximo = _parametros(distribuicoes)
+    limiar = base * (1 - quedas / 100)
+    n_quedas, n_drivers = len(quedas), len(DRIVERS)
+    motor = qmc.Sobol(d=n_drivers, scramble=True, seed=semente)
+
+    # Caixa de busca de cada queda, começando pelos limites do Monte Carlo
+    inferior = np.repeat(minimo[None, :], n_quedas, axis=0)
+    superior = np.repeat(maximo[None, :], n_quedas, axis=0)
+    melhor = np.full((n_quedas, n_drivers), np.nan)
+    melhor_distancia = np.full(n_quedas, np.inf)
+
+    for _ in range(n_iteracoes):
+        # (quedas × candidatos × drivers), avaliados em uma única chamada
+        pontos = motor.random(n_candidatos)
+        candidatos = inferior[:, None, :] + pontos[None, :, :] * (superior - inferior)[:, None, :]
+        # Inclui o melhor atual: a distância nunca piora entre iterações
+        candidatos[:, 0] = np.where(np.isnan(melhor), candidatos[:, 0], melhor)
+        salario = _avaliar(candidatos, modelo, base)
+        distancia = np.sqrt(np.sum(((candidatos - media) / desvio) ** 2, axis=-1))
+        distancia = np.where(salario <= limiar[:, None], distancia, np.inf)
+
+        indice = np.argmin(distancia, axis=1)
+        distancia_iteracao = distancia[np.arange(n_quedas), indice]
+        melhorou = distancia_iteracao < melhor_distancia
+        melhor[melhorou] = candidatos[melhorou, indice[melhorou]]
+        melhor_distancia[melhorou] = distancia_iteracao[melhorou]
+
+        # Caixa menor ao redor do melhor (quedas ainda sem ponto viável
+        # mantêm a caixa inteira)
+        meia_largura = (superior - inferior) * contracao / 2
+        centro = np.where(np.isnan(melhor), (inferior + superior) / 2, melhor)
+        inferior = np.clip(centro - meia_largura, minimo, maximo)
+        superior = np.clip(centro + meia_largura, minimo, maximo)
+
+    viavel = np.isfinite(melhor_distancia)
+    salario = np.where(viavel, _avaliar(np.nan_to_num(melhor), modelo, base), np.nan)
+    resultado = pd.DataFrame(melhor, columns=DRIVERS)
+    resultado.insert(0, 'queda', quedas)
+    resultado['salario'] = salario
+    resultado['variacao'] = (salario / base - 1) * 100
+    resultado['distancia'] = np.where(viavel, melhor_distancia, np.nan)
+    resultado['plausibilidade'] = stats.chi2.sf(resultado['distancia'] ** 2, n_drivers)
+    resultado['viavel'] = viavel
+    return resultado
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os módulos do projeto são scripts em scripts/ (importados pelo nome)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
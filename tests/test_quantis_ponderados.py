@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantis_ponderados import quantis_ponderados_por_grupo
+
+
+def _quantil_ingenuo(valores, pesos, p):
+    # Menor valor cuja fração acumulada de peso atinge p
+    ordem = np.argsort(valores, kind='stable')
+    acumulado = np.cumsum(pesos[ordem])
+    indice = np.searchsorted(acumulado, p * acumulado[-1], side='left')
+    return valores[ordem][min(indice, len(valores) - 1)]
+
+
+def test_chave_de_grupo_ausente_levanta_value_error():
+    dados = pd.DataFrame({'g': [1, 1, np.nan, 2], 'x': [1.0, 2.0, 3.0, 4.0],
+                          'w': [1.0, 1.0, 1.0, 1.0]})
+    with pytest.raises(ValueError, match="ausentes"):
+        quantis_ponderados_por_grupo(dados, 'x', 'w', ['g'])
+
+
+def test_igual_ao_calculo_por_grupo():
+    rng = np.random.default_rng(0)
+    n = 2000
+    dados = pd.DataFrame({
+        'uf': rng.integers(0, 5, n),
+        'sexo': rng.choice(['H', 'M'], n),
+        'x': rng.lognormal(7, 0.8, n),
+        'w': rng.uniform(0.5, 3.0, n),
+    })
+    percentis = [5, 10, 25, 50, 75, 90, 99]
+    resultado = quantis_ponderados_por_grupo(dados, 'x', 'w', ['uf', 'sexo'], percentis)
+
+    assert len(resultado) == dados.groupby(['uf', 'sexo']).ngroups
+    for _, linha in resultado.iterrows():
+        grupo = dados[(dados['uf'] == linha['uf']) & (dados['sexo'] == linha['sexo'])]
+        valores, pesos = grupo['x'].to_numpy(), grupo['w'].to_numpy()
+        for p in percentis:
+            assert linha[f'p{p}'] == _quantil_ingenuo(valores, pesos, p / 100)
+
+
+def test_pesos_iguais_igual_a_np_quantile():
+    # Com pesos iguais a definição é a de np.quantile(method='inverted_cdf')
+    rng = np.random.default_rng(1)
+    dados = pd.DataFrame({'g': rng.integers(0, 4, 500), 'x': rng.normal(size=500), 'w': 1.0})
+    percentis = [1, 10, 50, 90, 99]
+    resultado = quantis_ponderados_por_grupo(dados, 'x', 'w', ['g'], percentis)
+    for _, linha in resultado.iterrows():
+        valores = dados.loc[dados['g'] == linha['g'], 'x'].to_numpy()
+        esperado = np.quantile(valores, np.array(percentis) / 100, method='inverted_cdf')
+        np.testing.assert_array_equal(linha[[f'p{p}' for p in percentis]].to_numpy(dtype=float),
+                                      esperado)